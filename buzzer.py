@@ -5,95 +5,104 @@
 import RPi.GPIO as GPIO
 import time
 import logging
+import threading
+import queue
+
+from tone_mixer import ToneMixer, MELODY_DEFINITIONS, MELODY_LIBRARY, MelodyLibrary, compile_melody, note_to_frequency # 相容舊的匯入路徑
 
 # 建議將日誌記錄器命名與主程式一致或相關
 logger = logging.getLogger(__name__) # 或者使用 'game_console.buzzer' 等
 
-class BuzzerControl:
-    def __init__(self, pin, initial_volume=50): # initial_volume 作為佔空比 (0-100)
+class BuzzerControl(ToneMixer):
+    def __init__(self, pin, initial_volume=50, melody_library=None): # initial_volume 作為佔空比 (0-100)
+        super().__init__(initial_volume, melody_library)
         self.pin = pin
-        self.pwm = None
-        self.volume = initial_volume # 預設音量 (佔空比)
+        self.pwm = None # 由音序器執行緒建立並獨佔使用
         self.is_playing = False
 
+        # 音序器: 遊戲執行緒只負責把工作放進佇列，實際的 PWM 控制與等待都在背景執行緒完成
+        # 每個工作是一組 (頻率 Hz, 發聲時間 秒, 之後的靜音時間 秒) 音符
+        self._job_queue = queue.Queue()
+        self._sequencer_thread = None
+        self._stop_sequencer = threading.Event()
+
         GPIO.setmode(GPIO.BCM) # 確保 GPIO 模式已設定
         GPIO.setup(self.pin, GPIO.OUT)
         GPIO.output(self.pin, GPIO.LOW) # 預設不發聲
 
-        # 預定義音效 (頻率 Hz, 持續時間 秒)
-        self.sounds = {
-            "select": (1000, 0.05),
-            "navigate": (800, 0.05),
-            "game_start": (1200, 0.1),
-            "game_over": (500, 0.3),
-            "back": (600, 0.05),
-            "error": (300, 0.5),
-        }
         logger.info(f"BuzzerControl 初始化於 GPIO {self.pin}")
-
-    def _play(self, frequency, duration):
-        if frequency <= 0 or duration <= 0:
-            logger.warning(f"無效的頻率 ({frequency}) 或持續時間 ({duration})")
-            return
-        if self.is_playing: # 避免同時播放多個音效導致衝突
-            self.stop()
-
-        self.is_playing = True
+        self.start_sequencer()
+
+    def start_sequencer(self):
+        """啟動背景音序器執行緒 (初始化時自動呼叫)"""
+        if self._sequencer_thread is None or not self._sequencer_thread.is_alive():
+            self._stop_sequencer.clear()
+            self._sequencer_thread = threading.Thread(target=self._sequencer_loop, daemon=True)
+            self._sequencer_thread.start()
+            logger.info(f"蜂鳴器音序器已啟動 (GPIO {self.pin})")
+
+    def _sequencer_loop(self):
+        job = None
+        while not self._stop_sequencer.is_set():
+            if job is None:
+                try: job = self._job_queue.get(timeout=0.1)
+                except queue.Empty: continue
+            try:
+                job = self._run_job(job)
+            except Exception as e:
+                logger.error(f"音序器播放時發生未知錯誤: {e}", exc_info=True)
+                job = None
+        self._pwm_off()
+
+    def _run_job(self, notes):
+        """
+        依序播放一個工作的所有音符。
+        等待期間若佇列中出現新工作，立即中斷目前的播放並回傳新工作 (新音效優先，與舊版 _play 先 stop 的行為一致)。
+        """
+        for frequency, duration, gap in notes:
+            self._pwm_on(frequency)
+            next_job = self._wait_for_job(duration)
+            self._pwm_off()
+            if next_job is not None:
+                return next_job
+            if gap > 0:
+                next_job = self._wait_for_job(gap)
+                if next_job is not None:
+                    return next_job
+        return None
+
+    def _wait_for_job(self, timeout):
+        try: return self._job_queue.get(timeout=timeout)
+        except queue.Empty: return None
+
+    def _pwm_on(self, frequency):
         try:
-            self.pwm = GPIO.PWM(self.pin, frequency)
-            self.pwm.start(self.volume) # 使用設定的音量 (佔空比)
-            time.sleep(duration)
+            if self.pwm is None:
+                self.pwm = GPIO.PWM(self.pin, frequency)
+                self.pwm.start(self.volume) # 使用設定的音量 (佔空比)
+            else:
+                # 重複使用同一個 PWM 物件，避免每個音效都重新建立/銷毀
+                self.pwm.ChangeFrequency(frequency)
+                self.pwm.ChangeDutyCycle(self.volume)
+            self.is_playing = True
         except RuntimeError as e:
             # PWM 可能已經被使用或未正確清理
             logger.error(f"播放音效時發生 RuntimeError: {e}. 嘗試重新設定 PWM。")
-            # 可以嘗試 GPIO.cleanup(self.pin) 後重新 setup，但需謹慎
+            self.pwm = None
         except Exception as e:
             logger.error(f"播放音效時發生未知錯誤: {e}")
-        finally:
-            self.stop() # 確保音效播放完畢後停止
 
-    def play_tone(self, sound_name=None, frequency=None, duration=None):
-        """
-        播放預定義音效或指定頻率和持續時間的音效。
-        :param sound_name: 預定義音效的名稱 (如 "select", "game_over")
-        :param frequency: 自訂頻率 (Hz)
-        :param duration: 自訂持續時間 (秒)
-        """
-        if sound_name and sound_name in self.sounds:
-            freq, dur = self.sounds[sound_name]
-            logger.debug(f"播放預定義音效: {sound_name} (Freq: {freq}Hz, Dur: {dur}s)")
-            self._play(freq, dur)
-        elif frequency and duration:
-            logger.debug(f"播放自訂音效 (Freq: {frequency}Hz, Dur: {duration}s)")
-            self._play(frequency, duration)
-        else:
-            logger.warning("未指定有效的音效名稱或頻率/持續時間")
-
-    def play_startup_melody(self):
-        """播放開機音效"""
-        logger.info("播放開機音效")
-        melody = [
-            (262, 0.15), (330, 0.15), (392, 0.15), (523, 0.3) # C4, E4, G4, C5
-        ]
-        for freq, dur in melody:
-            if not self.is_playing: # 確保不會打斷自己
-                self._play(freq, dur)
-                time.sleep(0.05) # 音符間短暫停頓
-            else:
-                break
-
-    def play_shutdown_melody(self):
-        """播放關機音效 (如果需要)"""
-        logger.info("播放關機音效")
-        melody = [
-            (523, 0.3), (392, 0.15), (330, 0.15), (262, 0.15) # C5, G4, E4, C4
-        ]
-        for freq, dur in melody:
-            if not self.is_playing:
-                self._play(freq, dur)
-                time.sleep(0.05)
-            else:
-                break
+    def _pwm_off(self):
+        try:
+            if self.pwm:
+                self.pwm.ChangeDutyCycle(0) # 佔空比 0 即靜音，PWM 物件保留給下一個音效
+        except Exception as e:
+            logger.error(f"停止 PWM 時發生錯誤: {e}")
+        self.is_playing = False
+
+    def _enqueue(self, notes):
+        """把工作交給音序器，立即返回"""
+        self._job_queue.put(tuple(notes))
 
     def set_volume(self, volume_percent):
         """
@@ -110,19 +119,30 @@ class BuzzerControl:
 
 
     def stop(self):
-        """停止當前播放的音效"""
-        if self.pwm:
-            self.pwm.stop()
-            # self.pwm = None # 釋放 PWM 資源，但注意 RPi.GPIO 的 PWM 物件管理
-        GPIO.output(self.pin, GPIO.LOW) # 確保引腳為低電平
-        self.is_playing = False
+        """停止當前播放的音效 (送出空工作中斷音序器，非阻塞，不經過混音層)"""
+        self._clear_active_job()
+        self._enqueue(())
         # logger.debug("蜂鳴器已停止")
 
+    def stop_sequencer(self):
+        logger.info(f"蜂鳴器音序器停止 (GPIO {self.pin})")
+        self._stop_sequencer.set()
+        self._job_queue.put(()) # 喚醒正在等待的音序器
+        if self._sequencer_thread and self._sequencer_thread.is_alive():
+            self._sequencer_thread.join(timeout=1.0)
+        self._sequencer_thread = None
+
 
     def cleanup(self):
         """清理 GPIO 資源"""
         logger.info(f"清理蜂鳴器 GPIO {self.pin}")
-        self.stop()
+        logger.info(f"蜂鳴器混音統計: {self.get_mixer_stats()}")
+        self.stop_sequencer()
+        if self.pwm:
+            self.pwm.stop()
+            self.pwm = None
+        GPIO.output(self.pin, GPIO.LOW) # 確保引腳為低電平
+        self.is_playing = False
         # GPIO.cleanup(self.pin) # 注意：如果在多處使用 GPIO，單獨清理特定引腳可能導致問題。
                                # 通常在主程式結束時執行一次 GPIO.cleanup()。
                                # 如果 BuzzerControl 是唯一使用此 pin 的，則可以清理。
@@ -6,9 +6,109 @@ import pygame
 import time
 import logging
 import sys # 用於在測試時清除行
+import os
+import select
+import struct
+import threading
+from collections import deque
 
 logger = logging.getLogger(__name__)
 
+class InputState:
+    """
+    控制器輸入狀態。由 XboxController 預先配置並在每幀重複使用，不會產生新的物件。
+    按鈕以 bitmask 表示 (buttons: 目前按住, pressed/released: 本幀新按下/新放開)，
+    新程式可直接讀取屬性，例如 `state.pressed & InputState.A`；
+    舊遊戲使用的 `controller_input.get("a_pressed")` 透過 get() 相容。
+    注意：get_input 每幀回傳同一個物件，需要保存時請自行複製數值。
+    """
+    A = 1 << 0
+    B = 1 << 1
+    X = 1 << 2
+    Y = 1 << 3
+    LB = 1 << 4
+    RB = 1 << 5
+    BACK = 1 << 6
+    START = 1 << 7
+    LS = 1 << 8
+    RS = 1 << 9
+    UP = 1 << 10
+    DOWN = 1 << 11
+    LEFT = 1 << 12
+    RIGHT = 1 << 13
+    LT = 1 << 14 # 扳機超過閾值時視為按下
+    RT = 1 << 15
+
+    AXIS_FIELDS = ("left_stick_x", "left_stick_y", "right_stick_x", "right_stick_y", "lt_value", "rt_value")
+
+    __slots__ = ("buttons", "pressed", "released", "dpad_raw") + AXIS_FIELDS
+
+    def __init__(self):
+        self.buttons = 0
+        self.pressed = 0
+        self.released = 0
+        self.dpad_raw = (0, 0)
+        self.left_stick_x = 0.0
+        self.left_stick_y = 0.0
+        self.right_stick_x = 0.0
+        self.right_stick_y = 0.0
+        self.lt_value = 0.0
+        self.rt_value = 0.0
+
+    def is_down(self, mask):
+        return bool(self.buttons & mask)
+
+    def was_pressed(self, mask):
+        return bool(self.pressed & mask)
+
+    def was_released(self, mask):
+        return bool(self.released & mask)
+
+    def get(self, name, default=None):
+        """相容舊版輸入字典的讀取方式，例如 get("a_pressed")、get("left_stick_x", 0.0)"""
+        field = _INPUT_FIELDS.get(name)
+        if field is None:
+            return default
+        slot, mask = field
+        if mask:
+            return bool(getattr(self, slot) & mask)
+        return getattr(self, slot)
+
+    def __getitem__(self, name):
+        field = _INPUT_FIELDS.get(name)
+        if field is None:
+            raise KeyError(name)
+        return self.get(name)
+
+    def __contains__(self, name):
+        return name in _INPUT_FIELDS
+
+    def __repr__(self):
+        return (f"InputState(buttons={self.buttons:#06x}, pressed={self.pressed:#06x}, released={self.released:#06x}, "
+                f"left=({self.left_stick_x:.2f},{self.left_stick_y:.2f}), right=({self.right_stick_x:.2f},{self.right_stick_y:.2f}))")
+
+
+# 按鈕名稱與 InputState 位元的對應 (方向鍵、扳機也視為按鈕)
+BUTTON_NAMES = (
+    ("a", InputState.A), ("b", InputState.B), ("x", InputState.X), ("y", InputState.Y),
+    ("lb", InputState.LB), ("rb", InputState.RB), ("back", InputState.BACK), ("start", InputState.START),
+    ("ls", InputState.LS), ("rs", InputState.RS),
+    ("up", InputState.UP), ("down", InputState.DOWN), ("left", InputState.LEFT), ("right", InputState.RIGHT),
+    ("lt", InputState.LT), ("rt", InputState.RT),
+)
+
+# 舊版輸入字典的鍵名 -> (InputState 屬性, 位元)；位元為 0 表示直接回傳屬性值
+_INPUT_FIELDS = {name: (name, 0) for name in InputState.AXIS_FIELDS + ("dpad_raw",)}
+for _name, _bit in BUTTON_NAMES[:10]:
+    _INPUT_FIELDS[_name + "_down"] = ("buttons", _bit)
+    _INPUT_FIELDS[_name + "_pressed"] = ("pressed", _bit)
+for _name, _bit in BUTTON_NAMES[10:14]:
+    _INPUT_FIELDS["dpad_" + _name] = ("buttons", _bit)
+    _INPUT_FIELDS[_name + "_pressed"] = ("pressed", _bit)
+_INPUT_FIELDS["lt_pressed"] = ("buttons", InputState.LT)
+_INPUT_FIELDS["rt_pressed"] = ("buttons", InputState.RT)
+
+
 class XboxController:
     # ==============================================================================
     # << 請根據您的手把測試結果修改以下按鈕和軸的索引 >>
@@ -45,6 +145,13 @@ class XboxController:
     STICK_DEADZONE = 0.25
     TRIGGER_THRESHOLD = 0.5 # 扳機被視為「按下」的閾值 (標準化後的 0-1 值)
 
+    # 按鈕索引與 InputState 位元的對應
+    BUTTON_BITS = {
+        BUTTON_A: InputState.A, BUTTON_B: InputState.B, BUTTON_X: InputState.X, BUTTON_Y: InputState.Y,
+        BUTTON_LB: InputState.LB, BUTTON_RB: InputState.RB, BUTTON_BACK: InputState.BACK,
+        BUTTON_START: InputState.START, BUTTON_LS: InputState.LS, BUTTON_RS: InputState.RS,
+    }
+
     def __init__(self, joystick_id=0):
         self.joystick_id = joystick_id
         self.controller = None
@@ -52,14 +159,23 @@ class XboxController:
         self.last_input_time = 0
         self.input_cooldown = 0.03 # 輸入處理的最小間隔，防止過於頻繁
 
-        self.button_states = {} 
-        self.prev_button_states = {}
+        # 控制器狀態由 handle_event 依 pygame 搖桿事件增量更新，get_input 不再逐一查詢硬體
+        self.instance_id = None
+        self.buttons = 0 # 目前按住的按鈕 (InputState 位元，含方向鍵與扳機)
         self.dpad_state = (0,0)
-        self.prev_dpad_state = (0,0)
+        self.axes = []
+        # 自上次 get_input 以來發生的按下/放開邊緣；按下又放開都在同一幀內的快速點擊也會保留
+        self._pressed = 0
+        self._released = 0
+        self.state = InputState() # get_input 每幀重複使用的輸出物件
 
         if not pygame.joystick.get_init():
             logger.warning("Pygame joystick 模組未初始化。請在主程式中調用 pygame.joystick.init()")
 
+        self._connect()
+
+    def _connect(self):
+        joystick_id = self.joystick_id
         if pygame.joystick.get_count() > joystick_id:
             try:
                 self.controller = pygame.joystick.Joystick(joystick_id)
@@ -70,9 +186,17 @@ class XboxController:
                 logger.info(f"  軸數量: {self.controller.get_numaxes()}")
                 logger.info(f"  方向鍵(Hats)數量: {self.controller.get_numhats()}")
 
-                for i in range(self.controller.get_numbuttons()):
-                    self.button_states[i] = False
-                    self.prev_button_states[i] = False
+                self.instance_id = self.controller.get_instance_id() if hasattr(self.controller, 'get_instance_id') else self.controller.get_id()
+                # 以目前硬體狀態作為初始值 (扳機的靜止值因手把而異，不能假設為 0)
+                self.buttons = 0
+                for i, bit in self.BUTTON_BITS.items():
+                    if i < self.controller.get_numbuttons() and self.controller.get_button(i):
+                        self.buttons |= bit
+                self.axes = [self.controller.get_axis(i) for i in range(self.controller.get_numaxes())]
+                self.buttons |= self._trigger_bits()
+                if self.controller.get_numhats() > self.HAT_INDEX:
+                    self.dpad_state = self.controller.get_hat(self.HAT_INDEX)
+                    self.buttons |= self._dpad_bits(self.dpad_state)
             except pygame.error as e:
                 logger.error(f"初始化控制器 ID {joystick_id} 失敗: {e}")
                 self.controller = None; self.is_connected = False
@@ -82,81 +206,104 @@ class XboxController:
     def check_connection(self): # Pygame 通常透過事件處理插拔
         return self.is_connected
 
+    def handle_event(self, event):
+        """
+        處理主迴圈轉送來的 pygame 事件 (JOYBUTTONDOWN/UP, JOYAXISMOTION, JOYHATMOTION, 插拔)。
+        返回 True 表示事件屬於此控制器並已處理。
+        """
+        etype = event.type
+        if etype == pygame.JOYDEVICEADDED:
+            if not self.is_connected and event.device_index == self.joystick_id:
+                logger.info(f"控制器 (ID: {self.joystick_id}) 重新連接，重新初始化...")
+                self._connect()
+                return True
+            return False
+        if etype not in (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYAXISMOTION,
+                         pygame.JOYHATMOTION, pygame.JOYDEVICEREMOVED):
+            return False
+        if not self.is_connected or event.instance_id != self.instance_id:
+            return False
+
+        if etype == pygame.JOYBUTTONDOWN:
+            self._set_buttons(self.buttons | self.BUTTON_BITS.get(event.button, 0))
+        elif etype == pygame.JOYBUTTONUP:
+            self._set_buttons(self.buttons & ~self.BUTTON_BITS.get(event.button, 0))
+        elif etype == pygame.JOYAXISMOTION:
+            if event.axis < len(self.axes):
+                self.axes[event.axis] = event.value
+                if event.axis == self.AXIS_LT or event.axis == self.AXIS_RT:
+                    self._set_buttons((self.buttons & ~(InputState.LT | InputState.RT)) | self._trigger_bits())
+        elif etype == pygame.JOYHATMOTION:
+            if event.hat == self.HAT_INDEX:
+                self.dpad_state = event.value
+                dpad_mask = InputState.UP | InputState.DOWN | InputState.LEFT | InputState.RIGHT
+                self._set_buttons((self.buttons & ~dpad_mask) | self._dpad_bits(event.value))
+        else: # JOYDEVICEREMOVED
+            logger.warning(f"控制器 (ID: {self.joystick_id}) 已移除")
+            self.is_connected = False
+            self.clear()
+            self.buttons = 0
+            self.dpad_state = (0,0)
+        return True
+
+    def _set_buttons(self, buttons):
+        """更新按住的按鈕，並以 XOR 累積按下/放開邊緣"""
+        changed = self.buttons ^ buttons
+        self._pressed |= changed & buttons
+        self._released |= changed & self.buttons
+        self.buttons = buttons
+
+    @staticmethod
+    def _dpad_bits(value):
+        x, y = value
+        bits = 0
+        if y == 1: bits |= InputState.UP
+        elif y == -1: bits |= InputState.DOWN
+        if x == -1: bits |= InputState.LEFT
+        elif x == 1: bits |= InputState.RIGHT
+        return bits
+
+    def _trigger_bits(self):
+        bits = 0
+        if (self._axis(self.AXIS_LT, -1.0) + 1.0) / 2.0 > self.TRIGGER_THRESHOLD: bits |= InputState.LT
+        if (self._axis(self.AXIS_RT, -1.0) + 1.0) / 2.0 > self.TRIGGER_THRESHOLD: bits |= InputState.RT
+        return bits
+
+    def clear(self):
+        """丟棄尚未被 get_input 取走的按下/放開邊緣 (例如切換畫面時)"""
+        self._pressed = 0
+        self._released = 0
+
+    def _axis(self, index, default):
+        return self.axes[index] if index < len(self.axes) else default
+
     def get_input(self):
+        """
+        將事件累積的狀態寫入預先配置的 InputState 並回傳 (每次都是同一個物件)，同時清除這段期間的邊緣。
+        需由主迴圈把搖桿事件交給 handle_event；這裡不會 pump 事件或查詢硬體。
+        """
         if not self.is_connected or not self.controller:
             return None
 
-        pygame.event.pump() 
-
-        self.prev_button_states = self.button_states.copy()
-        for i in range(self.controller.get_numbuttons()):
-            self.button_states[i] = self.controller.get_button(i)
-        
-        self.prev_dpad_state = self.dpad_state
-        if self.controller.get_numhats() > 0:
-            self.dpad_state = self.controller.get_hat(self.HAT_INDEX)
-        else:
-            self.dpad_state = (0,0)
-
-        # 處理軸
-        num_axes = self.controller.get_numaxes()
-        left_stick_x = self.controller.get_axis(self.AXIS_LEFT_STICK_X) if num_axes > self.AXIS_LEFT_STICK_X else 0.0
-        left_stick_y = self.controller.get_axis(self.AXIS_LEFT_STICK_Y) if num_axes > self.AXIS_LEFT_STICK_Y else 0.0
-        right_stick_x = self.controller.get_axis(self.AXIS_RIGHT_STICK_X) if num_axes > self.AXIS_RIGHT_STICK_X else 0.0
-        right_stick_y = self.controller.get_axis(self.AXIS_RIGHT_STICK_Y) if num_axes > self.AXIS_RIGHT_STICK_Y else 0.0
-        
-        # 扳機值 (Pygame 原始值通常是 -1.0 到 1.0)
-        raw_lt_value = self.controller.get_axis(self.AXIS_LT) if num_axes > self.AXIS_LT else -1.0
-        raw_rt_value = self.controller.get_axis(self.AXIS_RT) if num_axes > self.AXIS_RT else -1.0
-        
-        # 標準化扳機值到 0.0 (未按) 到 1.0 (全按)
-        lt_value_normalized = (raw_lt_value + 1.0) / 2.0
-        rt_value_normalized = (raw_rt_value + 1.0) / 2.0
-
-        # 應用死區
-        if abs(left_stick_x) < self.STICK_DEADZONE: left_stick_x = 0.0
-        if abs(left_stick_y) < self.STICK_DEADZONE: left_stick_y = 0.0
-        if abs(right_stick_x) < self.STICK_DEADZONE: right_stick_x = 0.0
-        if abs(right_stick_y) < self.STICK_DEADZONE: right_stick_y = 0.0
-
-        input_map = {
-            "left_stick_x": left_stick_x, "left_stick_y": left_stick_y,
-            "right_stick_x": right_stick_x, "right_stick_y": right_stick_y,
-            "lt_pressed": lt_value_normalized > self.TRIGGER_THRESHOLD,
-            "rt_pressed": rt_value_normalized > self.TRIGGER_THRESHOLD,
-            "lt_value": lt_value_normalized, "rt_value": rt_value_normalized,
-
-            "a_down": self.button_states.get(self.BUTTON_A, False),
-            "b_down": self.button_states.get(self.BUTTON_B, False),
-            "x_down": self.button_states.get(self.BUTTON_X, False),
-            "y_down": self.button_states.get(self.BUTTON_Y, False),
-            "lb_down": self.button_states.get(self.BUTTON_LB, False),
-            "rb_down": self.button_states.get(self.BUTTON_RB, False),
-            "back_down": self.button_states.get(self.BUTTON_BACK, False),
-            "start_down": self.button_states.get(self.BUTTON_START, False),
-            "ls_down": self.button_states.get(self.BUTTON_LS, False),
-            "rs_down": self.button_states.get(self.BUTTON_RS, False),
-
-            "a_pressed": self.button_states.get(self.BUTTON_A, False) and not self.prev_button_states.get(self.BUTTON_A, False),
-            "b_pressed": self.button_states.get(self.BUTTON_B, False) and not self.prev_button_states.get(self.BUTTON_B, False),
-            "x_pressed": self.button_states.get(self.BUTTON_X, False) and not self.prev_button_states.get(self.BUTTON_X, False),
-            "y_pressed": self.button_states.get(self.BUTTON_Y, False) and not self.prev_button_states.get(self.BUTTON_Y, False),
-            "lb_pressed": self.button_states.get(self.BUTTON_LB, False) and not self.prev_button_states.get(self.BUTTON_LB, False),
-            "rb_pressed": self.button_states.get(self.BUTTON_RB, False) and not self.prev_button_states.get(self.BUTTON_RB, False),
-            "back_pressed": self.button_states.get(self.BUTTON_BACK, False) and not self.prev_button_states.get(self.BUTTON_BACK, False),
-            "start_pressed": self.button_states.get(self.BUTTON_START, False) and not self.prev_button_states.get(self.BUTTON_START, False),
-            "ls_pressed": self.button_states.get(self.BUTTON_LS, False) and not self.prev_button_states.get(self.BUTTON_LS, False),
-            "rs_pressed": self.button_states.get(self.BUTTON_RS, False) and not self.prev_button_states.get(self.BUTTON_RS, False),
-
-            "dpad_up": self.dpad_state[1] == 1, "dpad_down": self.dpad_state[1] == -1,
-            "dpad_left": self.dpad_state[0] == -1, "dpad_right": self.dpad_state[0] == 1,
-            "up_pressed": self.dpad_state[1] == 1 and self.prev_dpad_state[1] != 1,
-            "down_pressed": self.dpad_state[1] == -1 and self.prev_dpad_state[1] != -1,
-            "left_pressed": self.dpad_state[0] == -1 and self.prev_dpad_state[0] != -1,
-            "right_pressed": self.dpad_state[0] == 1 and self.prev_dpad_state[0] != 1,
-            "dpad_raw": self.dpad_state
-        }
-        return input_map
+        state = self.state
+        state.buttons = self.buttons
+        state.pressed = self._pressed
+        state.released = self._released
+        state.dpad_raw = self.dpad_state
+        self._pressed = 0
+        self._released = 0
+
+        # 處理軸並應用死區
+        deadzone = self.STICK_DEADZONE
+        value = self._axis(self.AXIS_LEFT_STICK_X, 0.0); state.left_stick_x = value if abs(value) >= deadzone else 0.0
+        value = self._axis(self.AXIS_LEFT_STICK_Y, 0.0); state.left_stick_y = value if abs(value) >= deadzone else 0.0
+        value = self._axis(self.AXIS_RIGHT_STICK_X, 0.0); state.right_stick_x = value if abs(value) >= deadzone else 0.0
+        value = self._axis(self.AXIS_RIGHT_STICK_Y, 0.0); state.right_stick_y = value if abs(value) >= deadzone else 0.0
+
+        # 扳機值 (Pygame 原始值通常是 -1.0 到 1.0)，標準化到 0.0 (未按) 到 1.0 (全按)
+        state.lt_value = (self._axis(self.AXIS_LT, -1.0) + 1.0) / 2.0
+        state.rt_value = (self._axis(self.AXIS_RT, -1.0) + 1.0) / 2.0
+        return state
 
     def rumble(self, low_frequency_rumble, high_frequency_rumble, duration_ms):
         if self.is_connected and self.controller and hasattr(self.controller, 'rumble'):
@@ -185,6 +332,93 @@ class XboxController:
         logger.info(f"控制器 (ID: {self.joystick_id}) 資源已清理。")
 
 
+class JoystickDeviceSampler:
+    """
+    在專用執行緒直接讀取 Linux 搖桿裝置 (/dev/input/jsN)，按鈕一按下就以 time.perf_counter_ns() 蓋上時間戳。
+    不經過 pygame 事件佇列與主迴圈，時間精度不受幀率限制，適合反應時間測量等場合。
+    執行緒以 select 等待裝置資料，逾時 POLL_INTERVAL (1ms) 後檢查停止旗標，取樣頻率至少 1kHz。
+    """
+    JS_EVENT_FORMAT = "IhBB" # struct js_event: time(ms), value, type, number
+    JS_EVENT_SIZE = struct.calcsize(JS_EVENT_FORMAT)
+    JS_EVENT_BUTTON = 0x01
+    JS_EVENT_INIT = 0x80 # 開啟裝置時核心送出的初始狀態，不是真正的按下
+    POLL_INTERVAL = 0.001
+    PRESS_QUEUE_SIZE = 64
+    DEVICE_PATH_FORMAT = "/dev/input/js{}"
+
+    def __init__(self, device_path=None, buttons=None, joystick_id=0):
+        """
+        :param device_path: 搖桿裝置路徑，未指定時依 joystick_id 使用 /dev/input/jsN
+        :param buttons: 要記錄的按鈕索引 (None 表示全部)
+        :param joystick_id: 控制器 ID (與 XboxController 的 joystick_id 相同)
+        """
+        self.device_path = device_path or self.DEVICE_PATH_FORMAT.format(joystick_id)
+        self.buttons = set(buttons) if buttons is not None else None
+        self._presses = deque(maxlen=self.PRESS_QUEUE_SIZE) # (按鈕索引, perf_counter_ns)
+        self._fd = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self):
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self):
+        """開啟裝置並啟動取樣執行緒，裝置無法開啟時返回 False"""
+        if self.running:
+            return True
+        try:
+            self._fd = os.open(self.device_path, os.O_RDONLY | os.O_NONBLOCK)
+        except OSError as e:
+            logger.warning(f"無法開啟搖桿裝置 {self.device_path}: {e}. 高精度取樣停用，改用逐幀取樣。")
+            self._fd = None
+            return False
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._sample_loop, daemon=True)
+        self._thread.start()
+        logger.info(f"高精度取樣已啟動，讀取搖桿裝置 {self.device_path}")
+        return True
+
+    def _sample_loop(self):
+        size = self.JS_EVENT_SIZE
+        while not self._stop.is_set():
+            try:
+                readable, _, _ = select.select([self._fd], [], [], self.POLL_INTERVAL)
+                if not readable:
+                    continue
+                data = os.read(self._fd, size * 32)
+                now = time.perf_counter_ns() # 同一次讀取到的事件共用讀取當下的時間
+            except BlockingIOError:
+                continue
+            except OSError as e:
+                logger.warning(f"讀取搖桿裝置 {self.device_path} 失敗: {e}")
+                break
+            for offset in range(0, len(data) - size + 1, size):
+                _, value, event_type, number = struct.unpack_from(self.JS_EVENT_FORMAT, data, offset)
+                if event_type != self.JS_EVENT_BUTTON or value != 1:
+                    continue # 忽略軸、放開與 JS_EVENT_INIT 初始狀態
+                if self.buttons is None or number in self.buttons:
+                    self._presses.append((number, now))
+
+    def get_presses(self):
+        """取出所有待處理的按下事件 [(按鈕索引, perf_counter_ns)]"""
+        presses = []
+        while True:
+            try: presses.append(self._presses.popleft())
+            except IndexError: break
+        return presses
+
+    def stop(self):
+        self._stop.set()
+        if self._thread and self._thread.is_alive():
+            self._thread.join(timeout=1.0)
+        self._thread = None
+        if self._fd is not None:
+            try: os.close(self._fd)
+            except OSError: pass
+            self._fd = None
+
+
 if __name__ == '__main__':
     pygame.init()
     pygame.joystick.init()
@@ -215,6 +449,7 @@ if __name__ == '__main__':
                     running = False
                 if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE: 
                     running = False
+                controller.handle_event(event) # 控制器狀態由事件更新
                 
                 # 打印詳細的 Pygame 搖桿事件
                 if event.type == pygame.JOYAXISMOTION:
@@ -228,15 +463,10 @@ if __name__ == '__main__':
                 elif event.type == pygame.JOYHATMOTION: # 方向鍵
                     print(f"  Pygame Event: JOYHATMOTION - Joystick ID: {event.instance_id}, Hat Index: {event.hat}, Value: {event.value}")
                 elif event.type == pygame.JOYDEVICEADDED:
+                    # 斷線重連由 handle_event 處理
                     logger.info(f"偵測到新搖桿: Pygame Device Index={event.device_index}. Instance ID={event.instance_id if hasattr(event, 'instance_id') else 'N/A'}")
-                    # 如果是我們正在使用的控制器斷開後重連，可能需要重新初始化
-                    if not controller.is_connected and event.device_index == controller.joystick_id: # 假設 device_index 對應 joystick_id
-                        logger.info("嘗試重新初始化控制器...")
-                        controller = XboxController(joystick_id=controller.joystick_id) # 重新實例化
                 elif event.type == pygame.JOYDEVICEREMOVED:
                     logger.warning(f"搖桿已移除: Pygame Instance ID={event.instance_id}")
-                    if event.instance_id == controller.joystick_id:
-                        controller.is_connected = False # 更新狀態
 
             if not controller.is_connected:
                 print("控制器已斷開，請重新連接或結束測試...", end="\r")
@@ -0,0 +1,109 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# entity_store.py - Struct-of-arrays entity storage backed by NumPy
+
+import numpy as np
+
+
+class EntityStore:
+    """Fixed-capacity struct-of-arrays entity storage
+
+    Every component is one contiguous NumPy array of `capacity` slots, exposed
+    as an attribute (store.x, store.health, ...). Live entities occupy slots
+    [0, count); slicing a component with view() gives the array a vectorized
+    update works on. kill() only clears the alive flag, so indices handed out
+    during a tick stay valid until compact() swap-removes the dead slots.
+    """
+
+    def __init__(self, capacity, **components):
+        """components maps name -> dtype, or name -> (dtype, width) for vector components"""
+        self.capacity = capacity
+        self.count = 0
+        self.components = []
+        for name, spec in components.items():
+            if isinstance(spec, tuple):
+                dtype, width = spec
+                array = np.zeros((capacity, width), dtype=dtype)
+            else:
+                array = np.zeros(capacity, dtype=spec)
+            setattr(self, name, array)
+            self.components.append(name)
+        self.alive = np.zeros(capacity, dtype=bool)
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def full(self):
+        return self.count >= self.capacity
+
+    def view(self, name):
+        """Component array over the occupied slots"""
+        return getattr(self, name)[:self.count]
+
+    def add(self, **values):
+        """Append one entity; returns its index, or -1 when the store is full"""
+        if self.count >= self.capacity:
+            return -1
+        index = self.count
+        for name in self.components:
+            array = getattr(self, name)
+            array[index] = values.get(name, 0)
+        self.alive[index] = True
+        self.count += 1
+        return index
+
+    def add_many(self, amount, **values):
+        """Append up to `amount` entities at once; values may be scalars or arrays
+
+        Returns the slice of new slots (shorter than requested when the store fills up).
+        """
+        amount = min(amount, self.capacity - self.count)
+        start = self.count
+        end = start + amount
+        if amount > 0:
+            for name in self.components:
+                array = getattr(self, name)
+                value = values.get(name, 0)
+                if np.ndim(value) == array.ndim:
+                    # One value per entity (rather than one broadcast to all)
+                    value = np.asarray(value)[:amount]
+                array[start:end] = value
+            self.alive[start:end] = True
+            self.count = end
+        return slice(start, end)
+
+    def kill(self, index):
+        self.alive[index] = False
+
+    def kill_mask(self, mask):
+        """Kill every occupied slot where mask (length count) is True"""
+        self.alive[:self.count] &= ~mask
+
+    def is_alive(self, index):
+        return bool(self.alive[index])
+
+    def compact(self):
+        """Swap-remove dead slots: live entities from the tail fill the holes below the new count
+
+        Only the entities that actually move are copied, so cost is proportional
+        to the number of deaths rather than the number of entities.
+        """
+        count = self.count
+        alive = self.alive[:count]
+        live = int(np.count_nonzero(alive))
+        if live == count:
+            return
+        holes = np.flatnonzero(~alive[:live])
+        movers = np.flatnonzero(alive[live:]) + live
+        if len(holes):
+            for name in self.components:
+                array = getattr(self, name)
+                array[holes] = array[movers]
+        self.alive[:live] = True
+        self.alive[live:count] = False
+        self.count = live
+
+    def clear(self):
+        self.alive[:self.count] = False
+        self.count = 0
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# flow_field.py - Tile obstacle layer and BFS flow field toward a single target
+
+from collections import deque
+
+import numpy as np
+
+# Neighbour offsets (dx, dy): orthogonal first so they win ties against diagonals
+NEIGHBOURS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, 1), (1, -1), (-1, 1), (-1, -1))
+UNREACHABLE = np.iinfo(np.int32).max
+
+
+class FlowField:
+    """
+    Obstacle grid plus a flow field that leads every free cell toward one target.
+
+    The field is a breadth-first distance map from the target cell; each cell
+    then stores a unit vector toward its lowest-distance neighbour (diagonals
+    only when both adjacent orthogonal cells are free, so paths never cut
+    corners). It is recomputed only when the target moves into another cell,
+    after which any number of agents steer with one array lookup each.
+    """
+
+    def __init__(self, width, height, cell_size=40):
+        self.cell_size = cell_size
+        self.cols = int(np.ceil(width / cell_size))
+        self.rows = int(np.ceil(height / cell_size))
+        self.blocked = np.zeros((self.rows, self.cols), dtype=bool)
+        self.distance = np.full((self.rows, self.cols), UNREACHABLE, dtype=np.int32)
+        self.dir_x = np.zeros((self.rows, self.cols), dtype=np.float32)
+        self.dir_y = np.zeros((self.rows, self.cols), dtype=np.float32)
+        self.target_cell = None
+
+    def cell_of(self, x, y):
+        return (min(self.cols - 1, max(0, int(x // self.cell_size))),
+                min(self.rows - 1, max(0, int(y // self.cell_size))))
+
+    def cells_of(self, xs, ys):
+        """Vectorized cell_of for arrays of positions"""
+        cols = np.clip((xs // self.cell_size).astype(np.int32), 0, self.cols - 1)
+        rows = np.clip((ys // self.cell_size).astype(np.int32), 0, self.rows - 1)
+        return cols, rows
+
+    def set_blocked(self, blocked):
+        """Replace the obstacle layer (bool array of shape (rows, cols))"""
+        self.blocked[:] = blocked
+        self.target_cell = None  # Force a recompute on the next update()
+
+    def blocked_at(self, x, y):
+        col, row = self.cell_of(x, y)
+        return bool(self.blocked[row, col])
+
+    def blocked_mask(self, xs, ys):
+        cols, rows = self.cells_of(xs, ys)
+        return self.blocked[rows, cols]
+
+    def update(self, x, y):
+        """Retarget at world position (x, y); recomputes only when it lands in a new cell"""
+        cell = self.cell_of(x, y)
+        if cell == self.target_cell:
+            return False
+        self.target_cell = cell
+        self._compute_distance(cell)
+        self._compute_directions()
+        return True
+
+    def _compute_distance(self, target):
+        # Plain lists over flat cell indices: per-element NumPy access is far slower in a BFS
+        cols = self.cols
+        size = self.rows * cols
+        blocked = self.blocked.ravel().tolist()
+        distance = [UNREACHABLE] * size
+        col, row = target
+        start = row * cols + col
+        if not blocked[start]:
+            distance[start] = 0
+            queue = deque([start])
+            while queue:
+                index = queue.popleft()
+                next_distance = distance[index] + 1
+                col = index % cols
+                for neighbour, valid in ((index - 1, col > 0), (index + 1, col < cols - 1),
+                                         (index - cols, index >= cols), (index + cols, index + cols < size)):
+                    if valid and not blocked[neighbour] and distance[neighbour] == UNREACHABLE:
+                        distance[neighbour] = next_distance
+                        queue.append(neighbour)
+        self.distance[:] = np.array(distance, dtype=np.int32).reshape(self.rows, cols)
+
+    def _compute_directions(self):
+        rows, cols = self.rows, self.cols
+        cost = np.pad(self.distance.astype(np.int64), 1, constant_values=UNREACHABLE)
+        free = np.pad(~self.blocked, 1, constant_values=False)
+        best = self.distance.astype(np.int64)
+        step_x = np.zeros((rows, cols), dtype=np.int8)
+        step_y = np.zeros((rows, cols), dtype=np.int8)
+        for dx, dy in NEIGHBOURS:
+            neighbour = cost[1 + dy:1 + dy + rows, 1 + dx:1 + dx + cols]
+            better = neighbour < best
+            if dx and dy:
+                better &= free[1:1 + rows, 1 + dx:1 + dx + cols] & free[1 + dy:1 + dy + rows, 1:1 + cols]
+            best = np.where(better, neighbour, best)
+            step_x[better] = dx
+            step_y[better] = dy
+        length = np.hypot(step_x, step_y, dtype=np.float32)  # int8 inputs would give float16
+        length[length == 0] = 1
+        self.dir_x[:] = step_x / length
+        self.dir_y[:] = step_y / length
+
+    def lookup(self, xs, ys):
+        """
+        Steering for arrays of positions: (dir_x, dir_y, has_flow).
+        has_flow is False in the target cell and on cells that cannot reach it.
+        """
+        cols, rows = self.cells_of(xs, ys)
+        dir_x = self.dir_x[rows, cols]
+        dir_y = self.dir_y[rows, cols]
+        return dir_x, dir_y, (dir_x != 0) | (dir_y != 0)
@@ -3,11 +3,15 @@
 # game1.py - Enhanced Snake Game Implementation
 
 import random
+from collections import deque
+
 import pygame
 import time
 import math
 from pygame.locals import *
 
+from particles import ParticleSystem
+
 class EnhancedSnakeGame:
     """Enhanced Snake Game Class"""
 
@@ -31,12 +35,17 @@ class EnhancedSnakeGame:
         self.PURPLE = (255, 0, 255)
         self.CYAN = (0, 255, 255)
         self.ORANGE = (255, 165, 0)
+        self.GRAY = (128, 128, 128)
 
         # Special food colors
         self.GOLDEN_FOOD = (255, 215, 0)
         self.SPEED_FOOD = (255, 100, 100)
         self.MULTI_FOOD = (100, 255, 100)
         self.BONUS_FOOD = (255, 20, 147) # Deep Pink
+        self.food_color_map = {
+            'normal': self.RED, 'golden': self.GOLDEN_FOOD, 'speed': self.SPEED_FOOD,
+            'multi': self.MULTI_FOOD, 'bonus': self.BONUS_FOOD, 'phase': self.PURPLE
+        }
 
         # Game speed related
         self.clock = pygame.time.Clock()
@@ -53,7 +62,13 @@ class EnhancedSnakeGame:
         }
 
         # Particle effect system
-        self.particles = []
+        self.particles = ParticleSystem(capacity=128)
+
+        # Persistent board layer (background, food and snake). Each move only redraws the cells
+        # that changed; render() then hands back dirty rects for pygame.display.update()
+        self.board = pygame.Surface((self.width, self.height))
+        self.font = pygame.font.Font(None, 36)
+        self.font_small = pygame.font.Font(None, 28)
 
         # Sound enhancement / Combo system
         self.combo_count = 0
@@ -66,8 +81,29 @@ class EnhancedSnakeGame:
 
     def reset_game(self):
         """Reset game state"""
-        # Snake's initial position
-        self.snake = [(self.grid_width // 2, self.grid_height // 2)]
+        # Board layer bookkeeping
+        self.board_valid = False # False forces a full redraw of the board and screen
+        self.board_style = None # Snake look (invincible flash, wall phase) the board was drawn with
+        self.dirty_cells = set()
+        self.drawn_direction = None
+        self.drawn_head = None # Head cell as last drawn on the board
+        self.drawn_flashing = set() # Food cells drawn in their flash color
+        self.overlay_rects = [] # Screen areas covered by particles and UI last frame
+
+        # Snake's initial position. The body is a deque (head at index 0) mirrored by a per-cell
+        # occupancy counter, so moving, growing and self-collision checks are O(1) at any length.
+        # Counters rather than flags because growth stacks copies of the tail on one cell.
+        cell_count = self.grid_width * self.grid_height
+        self.snake = deque()
+        self.occupancy = [0] * cell_count
+        self.food_cells = [0] * cell_count # Foods per cell
+
+        # Indexed set of cells with neither snake nor food: a dense list plus each cell's
+        # position in it (-1 when taken), with swap-remove, so food spawns in O(1)
+        self.free_cells = list(range(cell_count))
+        self.free_positions = list(range(cell_count))
+
+        self.push_head((self.grid_width // 2, self.grid_height // 2))
         self.direction = (1, 0) # Moving right initially
 
         # Food system
@@ -106,43 +142,97 @@ class EnhancedSnakeGame:
         self.move_interval = 1.0 / self.base_speed
         self._last_update_time = time.time() # Initialize for delta_time calculation
 
+    def update_free_cell(self, index):
+        """Add or remove a cell in the free-cell index after its snake or food count changed"""
+        position = self.free_positions[index]
+        if self.occupancy[index] == 0 and self.food_cells[index] == 0:
+            if position < 0:
+                self.free_positions[index] = len(self.free_cells)
+                self.free_cells.append(index)
+        elif position >= 0:
+            last = self.free_cells.pop()
+            if last != index:
+                self.free_cells[position] = last
+                self.free_positions[last] = position
+            self.free_positions[index] = -1
+
+    def push_head(self, pos):
+        """Add a segment at the head"""
+        if self.snake:
+            self.dirty_cells.add(self.snake[0]) # Old head becomes a body segment
+        self.dirty_cells.add(pos)
+        self.snake.appendleft(pos)
+        index = pos[1] * self.grid_width + pos[0]
+        self.occupancy[index] += 1
+        self.update_free_cell(index)
+
+    def pop_tail(self):
+        """Remove the tail segment"""
+        x, y = self.snake.pop()
+        self.dirty_cells.add((x, y))
+        index = y * self.grid_width + x
+        self.occupancy[index] -= 1
+        self.update_free_cell(index)
+
+    def grow_tail(self):
+        """Stack a copy of the tail segment; it unfolds as the snake moves on"""
+        x, y = self.snake[-1]
+        self.snake.append((x, y))
+        self.occupancy[y * self.grid_width + x] += 1
+
+    def is_occupied(self, pos):
+        """Whether any snake segment covers grid cell pos"""
+        return self.occupancy[pos[1] * self.grid_width + pos[0]] > 0
+
+    def remove_food(self, food_item):
+        """Take a food off the board"""
+        self.foods.remove(food_item)
+        self.dirty_cells.add(food_item['pos'])
+        x, y = food_item['pos']
+        index = y * self.grid_width + x
+        self.food_cells[index] -= 1
+        self.update_free_cell(index)
+
     def generate_food(self, food_type='normal'):
-        """Generate food"""
-        while True:
-            pos = (random.randint(0, self.grid_width - 1),
-                   random.randint(0, self.grid_height - 1))
-
-            # Ensure not on snake body or other food
-            if pos not in self.snake and not any(food_item['pos'] == pos for food_item in self.foods):
-                food = {
-                    'pos': pos,
-                    'type': food_type,
-                    'spawn_time': time.time(),
-                    'lifetime': 15.0 if food_type != 'normal' else float('inf')
-                }
-
-                # Special food attributes
-                if food_type == 'golden':
-                    food['points'] = 5
-                    food['growth'] = 2
-                elif food_type == 'speed': # This activates 'speed_boost' powerup
-                    food['points'] = 3
-                    food['powerup'] = 'speed_boost'
-                elif food_type == 'multi': # This activates 'score_multiplier' powerup
-                    food['points'] = 2
-                    food['powerup'] = 'score_multiplier'
-                elif food_type == 'bonus': # This activates 'invincible' powerup
-                    food['points'] = 10
-                    food['powerup'] = 'invincible'
-                elif food_type == 'phase': # This activates 'wall_phase' powerup
-                    food['points'] = 4
-                    food['powerup'] = 'wall_phase'
-                else:  # normal
-                    food['points'] = 1
-                    food['growth'] = 1
-
-                self.foods.append(food)
-                break
+        """Generate food on a random free cell; returns None when the board is full"""
+        if not self.free_cells:
+            return None
+
+        # Any free cell is off the snake body and other food
+        index = random.choice(self.free_cells)
+        pos = (index % self.grid_width, index // self.grid_width)
+        food = {
+            'pos': pos,
+            'type': food_type,
+            'spawn_time': time.time(),
+            'lifetime': 15.0 if food_type != 'normal' else float('inf')
+        }
+
+        # Special food attributes
+        if food_type == 'golden':
+            food['points'] = 5
+            food['growth'] = 2
+        elif food_type == 'speed': # This activates 'speed_boost' powerup
+            food['points'] = 3
+            food['powerup'] = 'speed_boost'
+        elif food_type == 'multi': # This activates 'score_multiplier' powerup
+            food['points'] = 2
+            food['powerup'] = 'score_multiplier'
+        elif food_type == 'bonus': # This activates 'invincible' powerup
+            food['points'] = 10
+            food['powerup'] = 'invincible'
+        elif food_type == 'phase': # This activates 'wall_phase' powerup
+            food['points'] = 4
+            food['powerup'] = 'wall_phase'
+        else:  # normal
+            food['points'] = 1
+            food['growth'] = 1
+
+        self.foods.append(food)
+        self.dirty_cells.add(pos)
+        self.food_cells[index] += 1
+        self.update_free_cell(index)
+        return food
 
     def update_special_foods(self):
         """Update special food generation"""
@@ -166,9 +256,10 @@ class EnhancedSnakeGame:
             self.special_food_interval = max(5.0, 10.0 - self.level * 0.5)
 
         # Remove expired special foods
-        self.foods = [food for food in self.foods
-                      if food['type'] == 'normal' or
-                      (current_time - food['spawn_time']) < food['lifetime']]
+        for food in [food for food in self.foods
+                     if food['type'] != 'normal' and
+                     (current_time - food['spawn_time']) >= food['lifetime']]:
+            self.remove_food(food)
 
     def update_powerups(self, delta_time):
         """Update power-up effects"""
@@ -218,42 +309,15 @@ class EnhancedSnakeGame:
                 self.buzzer.play_tone(frequency=800, duration=0.3)
 
     def create_particles(self, pos, color, count=5, effect_type='eat'):
-        """Create particle effects"""
-        for _ in range(count):
-            if effect_type == 'eat':
-                vx_range = (-50, 50)
-                vy_range = (-50, 50)
-                life_mult = 1.0
-                gravity = 100
-            elif effect_type == 'boost': # Example for a different particle effect
-                vx_range = (-20, 20)
-                vy_range = (-100, -50) # Upwards
-                life_mult = 0.5
-                gravity = 50
-                
-            particle = {
-                'x': pos[0] * self.block_size + self.block_size // 2,
-                'y': pos[1] * self.block_size + self.block_size // 2,
-                'vx': random.uniform(*vx_range),
-                'vy': random.uniform(*vy_range),
-                'life': 1.0 * life_mult,
-                'color': color,
-                'size': random.uniform(2, 6)
-            }
-            self.particles.append(particle)
+        """Create particle effects (effect_type selects the 'snake_<type>' preset)"""
+        self.particles.emit('snake_' + effect_type,
+                            pos[0] * self.block_size + self.block_size // 2,
+                            pos[1] * self.block_size + self.block_size // 2,
+                            color, count)
 
     def update_particles(self, delta_time):
         """Update particle effects"""
-        active_particles = []
-        for particle in self.particles:
-            particle['x'] += particle['vx'] * delta_time
-            particle['y'] += particle['vy'] * delta_time
-            particle['life'] -= delta_time * 2 # Life drains twice as fast
-            particle['vy'] += 100 * delta_time  # Gravity effect
-
-            if particle['life'] > 0:
-                active_particles.append(particle)
-        self.particles = active_particles
+        self.particles.update(delta_time)
 
 
     def update(self, controller_input=None):
@@ -339,7 +403,7 @@ class EnhancedSnakeGame:
                  if not hasattr(self, 'start_handled_time') or current_time - self.start_handled_time > 0.5:
                     self.paused = not self.paused
                     self.start_handled_time = current_time
-                    if self.buzzer: self.buzzer.play_tone(frequency=500, duration=0.1)
+                    if self.buzzer: self.buzzer.play_tone(frequency=500, duration=0.1, category="ui")
                     # Return immediately after pausing to prevent further game logic this frame
                     return {"game_over": self.game_over, "score": self.score, "paused": self.paused}
         
@@ -374,26 +438,28 @@ class EnhancedSnakeGame:
                     new_head[1] < 0 or new_head[1] >= self.grid_height):
                 self.game_over = True
                 if self.buzzer:
-                    self.buzzer.play_tone(frequency=200, duration=1.0) # Game over sound
+                    self.buzzer.play_tone(frequency=200, duration=1.0, category="game_over") # Game over sound
                 return {"game_over": True, "score": self.score, "paused": self.paused}
 
         # Check collision with self
         # Invincible powerup allows passing through self
-        if not self.powerups['invincible']['active'] and new_head in self.snake[1:]: # Don't check head against itself
+        # new_head is never the current head, so any occupied cell is a body segment (the tail included,
+        # as it has not moved yet)
+        if not self.powerups['invincible']['active'] and self.is_occupied(new_head):
             self.game_over = True
             if self.buzzer:
-                self.buzzer.play_tone(frequency=200, duration=1.0) # Game over sound
+                self.buzzer.play_tone(frequency=200, duration=1.0, category="game_over") # Game over sound
             return {"game_over": True, "score": self.score, "paused": self.paused}
 
         # Add new head
-        self.snake.insert(0, new_head)
+        self.push_head(new_head)
 
         # Check if food is eaten
         eaten_food_item = None
         for food_item in self.foods[:]: # Iterate over a copy for safe removal
             if new_head == food_item['pos']:
                 eaten_food_item = food_item
-                self.foods.remove(food_item)
+                self.remove_food(food_item)
                 break
         
         if eaten_food_item:
@@ -424,7 +490,7 @@ class EnhancedSnakeGame:
 
             for _ in range(growth_amount -1): # Already grew by 1 (head added, tail not popped)
                  if self.snake: # Should always be true
-                    self.snake.append(self.snake[-1]) # Append a copy of the last segment
+                    self.grow_tail() # Append a copy of the last segment
 
 
             # Activate power-up if any
@@ -432,12 +498,8 @@ class EnhancedSnakeGame:
                 self.activate_powerup(eaten_food_item['powerup'])
 
             # Create particle effects
-            food_color_map = {
-                'normal': self.RED, 'golden': self.GOLDEN_FOOD, 'speed': self.SPEED_FOOD,
-                'multi': self.MULTI_FOOD, 'bonus': self.BONUS_FOOD, 'phase': self.PURPLE
-            }
             self.create_particles(eaten_food_item['pos'],
-                                  food_color_map.get(eaten_food_item['type'], self.RED),
+                                  self.food_color_map.get(eaten_food_item['type'], self.RED),
                                   count=10 if eaten_food_item['type'] != 'normal' else 5)
 
             # Play sound effect
@@ -447,9 +509,7 @@ class EnhancedSnakeGame:
                     self.buzzer.play_tone(frequency=freq, duration=0.15)
                 else:
                     # Special food sound
-                    self.buzzer.play_tone(frequency=1000, duration=0.1)
-                    pygame.time.wait(50) # Short pause for distinct sound
-                    self.buzzer.play_tone(frequency=1200, duration=0.1)
+                    self.buzzer.play_tone("special_food")
             
             # Generate new normal food if a normal food was eaten or if no normal food exists
             if eaten_food_item['type'] == 'normal' or not any(f['type'] == 'normal' for f in self.foods):
@@ -463,10 +523,10 @@ class EnhancedSnakeGame:
                 if not self.powerups['speed_boost']['active'] and not self.boosting:
                     self.current_speed = self.base_speed
                 if self.buzzer:
-                    self.buzzer.play_tone(frequency=1500, duration=0.5) # Level up sound
+                    self.buzzer.play_tone(frequency=1500, duration=0.5, category="level_up") # Level up sound
         else:
             # No food eaten, remove tail segment
-            if self.snake: self.snake.pop()
+            if self.snake: self.pop_tail()
 
         # Ensure at least one normal food on the map if others were special and expired
         if not any(f['type'] == 'normal' for f in self.foods):
@@ -474,115 +534,172 @@ class EnhancedSnakeGame:
             
         return {"game_over": self.game_over, "score": self.score, "paused": self.paused}
 
-    def render(self, screen):
-        """Render the game screen"""
-        # Clear screen
-        screen.fill(self.BLACK)
-
-        # Draw food
+    def invalidate_screen(self):
+        """Redraw the whole screen on the next render (e.g. after something else drew over it)"""
+        self.board_valid = False
+
+    def food_flashing(self, food_item, current_time):
+        """Whether a special food is in the bright phase of its expiry flash"""
+        if food_item['type'] == 'normal':
+            return False
+        remaining_time = food_item['lifetime'] - (current_time - food_item['spawn_time'])
+        return remaining_time < 3.0 and int(current_time * 6) % 2 == 1 # 3Hz flash in the last 3 seconds
+
+    def draw_food(self, surface, food_item, flashing):
+        """Draw one food tile"""
+        color = self.food_color_map.get(food_item['type'], self.RED)
+        if flashing:
+            # Make color brighter for flash
+            color = tuple(min(255, c + 60) for c in color)
+
+        food_rect = pygame.Rect(
+            food_item['pos'][0] * self.block_size,
+            food_item['pos'][1] * self.block_size,
+            self.block_size,
+            self.block_size
+        )
+        pygame.draw.rect(surface, color, food_rect)
+        # Special food marker (e.g., a small white circle)
+        if food_item['type'] != 'normal':
+            pygame.draw.circle(surface, self.WHITE, food_rect.center, self.block_size // 6)
+
+    def draw_segment(self, surface, segment, is_head):
+        """Draw one snake segment (with eyes for the head) in the current board style"""
+        invincible_flash, wall_phase = self.board_style
+
+        # Base color: blue for head, green for body
+        seg_color = self.BLUE if is_head else self.GREEN
+
+        # Invincible power-up flash effect
+        if invincible_flash:
+            seg_color = self.YELLOW # Flash to yellow, for example
+
+        # Wall phase power-up visual: lighter head
+        if wall_phase and is_head:
+            seg_color = tuple(min(255, c + 50) for c in seg_color)
+
+        segment_rect = pygame.Rect(
+            segment[0] * self.block_size,
+            segment[1] * self.block_size,
+            self.block_size,
+            self.block_size
+        )
+        pygame.draw.rect(surface, seg_color, segment_rect)
+
+        # Snake head decoration (e.g., eyes)
+        if is_head:
+            eye_radius = self.block_size // 8
+            offset_x1, offset_y1 = 0,0
+            offset_x2, offset_y2 = 0,0
+
+            if self.direction == (1,0): # Right
+                offset_x1, offset_y1 = self.block_size // 2, -self.block_size // 4
+                offset_x2, offset_y2 = self.block_size // 2, self.block_size // 4
+            elif self.direction == (-1,0): # Left
+                offset_x1, offset_y1 = -self.block_size // 2, -self.block_size // 4
+                offset_x2, offset_y2 = -self.block_size // 2, self.block_size // 4
+            elif self.direction == (0,1): # Down
+                offset_x1, offset_y1 = -self.block_size // 4, self.block_size // 2
+                offset_x2, offset_y2 = self.block_size // 4, self.block_size // 2
+            elif self.direction == (0,-1): # Up
+                offset_x1, offset_y1 = -self.block_size // 4, -self.block_size // 2
+                offset_x2, offset_y2 = self.block_size // 4, -self.block_size // 2
+
+            eye1_pos = (segment_rect.centerx + offset_x1, segment_rect.centery + offset_y1)
+            eye2_pos = (segment_rect.centerx + offset_x2, segment_rect.centery + offset_y2)
+            pygame.draw.circle(surface, self.WHITE, eye1_pos, eye_radius)
+            pygame.draw.circle(surface, self.WHITE, eye2_pos, eye_radius)
+
+    def redraw_board(self):
+        """Draw the whole board layer from scratch"""
+        self.board.fill(self.BLACK)
         for food_item in self.foods:
-            food_color_map = {
-                'normal': self.RED, 'golden': self.GOLDEN_FOOD, 'speed': self.SPEED_FOOD,
-                'multi': self.MULTI_FOOD, 'bonus': self.BONUS_FOOD, 'phase': self.PURPLE
-            }
-            color = food_color_map.get(food_item['type'], self.RED)
-
-            food_rect = pygame.Rect(
-                food_item['pos'][0] * self.block_size,
-                food_item['pos'][1] * self.block_size,
-                self.block_size,
-                self.block_size
-            )
-
-            # Special food flashing effect
-            if food_item['type'] != 'normal':
-                current_time = time.time()
-                remaining_time = food_item['lifetime'] - (current_time - food_item['spawn_time'])
-                if remaining_time < 3.0:  # Flash in the last 3 seconds
-                    if int(current_time * 6) % 2:  # 3Hz flash (6 changes per sec)
-                        # Make color brighter for flash
-                        color = tuple(min(255, c + 60) for c in color)
-            
-            pygame.draw.rect(screen, color, food_rect)
-            # Special food marker (e.g., a small white circle)
-            if food_item['type'] != 'normal':
-                pygame.draw.circle(screen, self.WHITE, food_rect.center, self.block_size // 6)
-
-
-        # Draw snake
+            self.draw_food(self.board, food_item, food_item['pos'] in self.drawn_flashing)
         for i, segment in enumerate(self.snake):
-            # Base color: blue for head, green for body
-            seg_color = self.BLUE if i == 0 else self.GREEN 
-            
-            # Invincible power-up flash effect
-            if self.powerups['invincible']['active']:
-                if int(time.time() * 10) % 2: # Faster flash for invincibility
-                     seg_color = self.YELLOW # Flash to yellow, for example
-            
-            # Wall phase power-up visual (e.g., semi-transparent or different color)
-            if self.powerups['wall_phase']['active'] and i == 0: # Only head maybe
-                # Example: make head slightly transparent or a different hue
-                 # For simplicity, let's make it lighter
-                seg_color = tuple(min(255, c + 50) for c in seg_color)
-
-
-            segment_rect = pygame.Rect(
-                segment[0] * self.block_size,
-                segment[1] * self.block_size,
-                self.block_size,
-                self.block_size
-            )
-            pygame.draw.rect(screen, seg_color, segment_rect)
-            
-            # Snake head decoration (e.g., eyes)
-            if i == 0:
-                eye_radius = self.block_size // 8
-                offset_x1, offset_y1 = 0,0
-                offset_x2, offset_y2 = 0,0
-
-                if self.direction == (1,0): # Right
-                    offset_x1, offset_y1 = self.block_size // 2, -self.block_size // 4
-                    offset_x2, offset_y2 = self.block_size // 2, self.block_size // 4
-                elif self.direction == (-1,0): # Left
-                    offset_x1, offset_y1 = -self.block_size // 2, -self.block_size // 4
-                    offset_x2, offset_y2 = -self.block_size // 2, self.block_size // 4
-                elif self.direction == (0,1): # Down
-                    offset_x1, offset_y1 = -self.block_size // 4, self.block_size // 2
-                    offset_x2, offset_y2 = self.block_size // 4, self.block_size // 2
-                elif self.direction == (0,-1): # Up
-                    offset_x1, offset_y1 = -self.block_size // 4, -self.block_size // 2
-                    offset_x2, offset_y2 = self.block_size // 4, -self.block_size // 2
-                
-                eye1_pos = (segment_rect.centerx + offset_x1, segment_rect.centery + offset_y1)
-                eye2_pos = (segment_rect.centerx + offset_x2, segment_rect.centery + offset_y2)
-                pygame.draw.circle(screen, self.WHITE, eye1_pos, eye_radius)
-                pygame.draw.circle(screen, self.WHITE, eye2_pos, eye_radius)
-
-
-        # Draw particles
-        for particle in self.particles:
-            # Particle life affects alpha and size
-            alpha = max(0, min(255, int(particle['life'] * 255)))
-            size = max(1, int(particle['size'] * particle['life'])) # Size shrinks with life
-            
-            if alpha > 0 and size > 0:
-                # Create a surface for each particle to handle alpha correctly
-                particle_surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                # Draw circle on this temp surface
-                pygame.draw.circle(particle_surf, (*particle['color'][:3], alpha), (size, size), size)
-                # Blit the temp surface onto the main screen
-                screen.blit(particle_surf, (int(particle['x'] - size), int(particle['y'] - size)))
+            if i > 0:
+                self.draw_segment(self.board, segment, False)
+        # Head last: its eyes reach into the neighbouring cells
+        if self.snake:
+            self.draw_segment(self.board, self.snake[0], True)
+        self.drawn_head = self.snake[0] if self.snake else None
+
+    def redraw_cell(self, pos):
+        """Redraw one grid cell of the board layer; returns its screen rect"""
+        cell_rect = pygame.Rect(pos[0] * self.block_size, pos[1] * self.block_size,
+                                self.block_size, self.block_size)
+        self.board.fill(self.BLACK, cell_rect)
+        for food_item in self.foods:
+            if food_item['pos'] == pos:
+                self.draw_food(self.board, food_item, pos in self.drawn_flashing)
+        if self.is_occupied(pos) and pos != self.snake[0]:
+            self.draw_segment(self.board, pos, False) # The head is drawn last by render()
+        return cell_rect
 
+    def render(self, screen):
+        """
+        Render the game screen.
+        Returns the list of changed screen rects for pygame.display.update(),
+        or None when the whole screen must be presented.
+        """
+        current_time = time.time()
+
+        # A change in the snake's look touches every segment: redraw the board
+        style = (self.powerups['invincible']['active'] and int(current_time * 10) % 2 == 1, # Faster flash for invincibility
+                 self.powerups['wall_phase']['active'])
+        if style != self.board_style:
+            self.board_style = style
+            self.board_valid = False
+
+        # Special foods entering or leaving their flash phase, and the head turning
+        flashing = {food_item['pos'] for food_item in self.foods if self.food_flashing(food_item, current_time)}
+        self.dirty_cells |= flashing ^ self.drawn_flashing
+        self.drawn_flashing = flashing
+        if self.direction != self.drawn_direction and self.snake:
+            self.dirty_cells.add(self.snake[0])
+            self.drawn_direction = self.direction
+
+        full_redraw = not self.board_valid
+        if full_redraw:
+            self.redraw_board()
+            self.board_valid = True
+            screen.blit(self.board, (0, 0))
+            dirty_rects = []
+        else:
+            # Only the cells that changed since the last frame, plus last frame's particles and UI
+            if self.dirty_cells:
+                # The head's eyes reach into the neighbouring cells: clear around the old and the
+                # new head, then draw the head on top
+                for head in (self.drawn_head, self.snake[0]):
+                    if head is not None:
+                        for dx, dy in ((1, 0), (-1, 0), (0, 1), (0, -1)):
+                            x, y = head[0] + dx, head[1] + dy
+                            if 0 <= x < self.grid_width and 0 <= y < self.grid_height:
+                                self.dirty_cells.add((x, y))
+            dirty_rects = [self.redraw_cell(pos) for pos in self.dirty_cells]
+            if dirty_rects:
+                head = self.snake[0]
+                self.draw_segment(self.board, head, True)
+                self.drawn_head = head
+            dirty_rects.extend(self.overlay_rects)
+            for rect in dirty_rects:
+                screen.blit(self.board, rect, rect)
+        self.dirty_cells.clear()
+
+        # Particles and UI are drawn straight onto the screen and erased from the board next frame
+        overlay_rects = []
+        particle_rect = self.particles.draw(screen)
+        if particle_rect:
+            overlay_rects.append(particle_rect)
 
         # Draw UI
-        font = pygame.font.Font(None, 36) # Default font, size 36
+        font = self.font # Default font, size 36
 
         # Basic info
         score_text_surf = font.render(f"Score: {self.score}", True, self.WHITE)
-        screen.blit(score_text_surf, (10, 10))
+        overlay_rects.append(screen.blit(score_text_surf, (10, 10)))
 
         level_text_surf = font.render(f"Level: {self.level}", True, self.WHITE)
-        screen.blit(level_text_surf, (10, 50))
+        overlay_rects.append(screen.blit(level_text_surf, (10, 50)))
 
         current_speed_display = self.current_speed
         if self.powerups['speed_boost']['active']:
@@ -591,17 +708,17 @@ class EnhancedSnakeGame:
             current_speed_display = self.speed_boost_value
 
         speed_text_surf = font.render(f"Speed: {current_speed_display:.1f}", True, self.WHITE)
-        screen.blit(speed_text_surf, (10, 90))
+        overlay_rects.append(screen.blit(speed_text_surf, (10, 90)))
 
         # Combo display
         if self.combo_count > 1:
             combo_text_surf = font.render(f"Combo x{self.combo_count}!", True, self.YELLOW)
             # Position combo text dynamically or at a fixed nice spot
-            screen.blit(combo_text_surf, (self.width - combo_text_surf.get_width() - 10, 10))
+            overlay_rects.append(screen.blit(combo_text_surf, (self.width - combo_text_surf.get_width() - 10, 10)))
 
         # Power-up status display
         y_offset = 130
-        font_small = pygame.font.Font(None, 28) # Slightly smaller font for status
+        font_small = self.font_small # Slightly smaller font for status
         
         powerup_display_names = {
             'invincible': 'Invincible',
@@ -616,19 +733,29 @@ class EnhancedSnakeGame:
                 active_powerup_count +=1
                 remaining_time = powerup_data['timer']
                 text_surf = font_small.render(f"{powerup_display_names[name]}: {remaining_time:.1f}s", True, self.CYAN)
-                screen.blit(text_surf, (10, y_offset))
+                overlay_rects.append(screen.blit(text_surf, (10, y_offset)))
                 y_offset += 30
         
         if active_powerup_count == 0 and self.level > 1: # Show a tip if no powerups active after level 1
             tip_text = font_small.render("Eat special food for power-ups!", True, self.GRAY)
-            screen.blit(tip_text, (10, y_offset))
+            overlay_rects.append(screen.blit(tip_text, (10, y_offset)))
+
 
+        # Game Over / Paused screen: full-screen overlays, so present everything and
+        # rebuild from the board once the overlay goes away
+        if self.game_over or self.paused:
+            if self.game_over:
+                self.draw_game_over_screen(screen) # Renamed for clarity
+            else:
+                self.draw_pause_screen(screen) # Renamed for clarity
+            self.board_valid = False
+            self.overlay_rects = []
+            return None
 
-        # Game Over / Paused screen
-        if self.game_over:
-            self.draw_game_over_screen(screen) # Renamed for clarity
-        elif self.paused:
-            self.draw_pause_screen(screen) # Renamed for clarity
+        self.overlay_rects = overlay_rects
+        if full_redraw:
+            return None
+        return dirty_rects + overlay_rects
 
     def draw_game_over_screen(self, screen): # Renamed
         """Draw the Game Over screen"""
@@ -732,9 +859,12 @@ if __name__ == "__main__":
             # Update game
             game_instance.update(current_inputs)
 
-            # Render game
-            game_instance.render(main_screen)
-            pygame.display.flip() # Update the full display
+            # Render game: present only the changed areas when the game reports them
+            dirty_rects = game_instance.render(main_screen)
+            if dirty_rects is None:
+                pygame.display.flip() # Update the full display
+            else:
+                pygame.display.update(dirty_rects)
 
             # Control frame rate
             game_clock.tick(60) # Target 60 FPS
@@ -6,8 +6,16 @@ import random
 import pygame
 import time
 import math
+import numpy as np
 from pygame.locals import *
 
+from crowd import separation
+from entity_store import EntityStore
+from flow_field import FlowField
+from particles import ParticleSystem
+from spatial_grid import SpatialGrid
+from sprite_atlas import SpriteAtlas
+
 class VampireSurvivorsGame:
     """Vampire Survivors-like Game Class"""
     
@@ -37,6 +45,28 @@ class VampireSurvivorsGame:
         self.enemy_base_speed = 1.5
         self.projectile_speed = 8
         self.experience_orb_size = 8
+        self.orb_magnet_radius = 30
+        self.orb_pickup_radius = 15
+        
+        # World larger than the screen; the camera follows the player
+        self.world_width = width * 3
+        self.world_height = height * 3
+        self.camera_x = 0
+        self.camera_y = 0
+        self.chunk_size = 200  # Enemies spawn in world chunks just outside the viewport
+        self.view_margin = 64  # Entities further outside the view than this are not drawn
+        self.sim_margin = 240  # Enemies further outside the view than this are simulated less often
+        self.far_sim_interval = 4  # Far enemies move every N ticks (staggered) with an N-tick step
+        self.frame_count = 0
+        
+        # Optional obstacle layer (pillars and walls); enemies path around it with a flow field
+        self.obstacles_enabled = True
+        self.obstacle_count = 40
+        self.flow_field = FlowField(self.world_width, self.world_height, cell_size=60)
+        self.obstacle_rects = []
+        
+        # Crowd separation: overlapping enemies are pushed apart by this fraction of the overlap per tick
+        self.separation_strength = 0.5
         
         # Game state
         self.game_over = False
@@ -49,8 +79,8 @@ class VampireSurvivorsGame:
         self.survival_time = 0
         
         # Player
-        self.player_x = width // 2
-        self.player_y = height // 2
+        self.player_x = self.world_width // 2
+        self.player_y = self.world_height // 2
         self.player_health = 100
         self.player_max_health = 100
         self.player_regen = 0.1
@@ -123,12 +153,6 @@ class VampireSurvivorsGame:
             }
         }
         
-        # Enemies and projectiles
-        self.enemies = []
-        self.projectiles = []
-        self.experience_orbs = []
-        self.particles = []
-        
         # Enemy types
         self.enemy_types = {
             'zombie': {
@@ -176,9 +200,56 @@ class VampireSurvivorsGame:
         self.level_up_choice_index = 0
         
         # Performance optimization
-        self.max_enemies = 50  # Limit for Raspberry Pi
-        self.max_projectiles = 30
-        self.max_particles = 100
+        # Frame time grows roughly linearly with live enemies (separation, grid rebuild and
+        # drawing dominate): about 6.5 ms at 500, 13 ms at 1,000 and 24 ms at 2,000 on a desktop
+        # CPU, several times that on a Pi 4. 500 keeps a full wave inside the 60 fps budget;
+        # with projectiles, orbs and particles the stores have room for 2,600 entities.
+        self.max_enemies = 500  # Collision and targeting go through the spatial grid
+        self.max_projectiles = 100
+        self.max_experience_orbs = 1000
+        self.max_particles = 1000
+        
+        # Enemies, projectiles and orbs live in struct-of-arrays stores
+        # (one NumPy array per component) so per-frame updates are vectorized.
+        # Entities are referred to by their slot index within a tick.
+        self.enemy_type_names = list(self.enemy_types)
+        self.projectile_type_names = list(self.weapons) + ['manual_normal']
+        self.projectile_colors = [self.WHITE, self.ORANGE, self.CYAN, self.YELLOW, self.BLUE]  # Render color per type
+        self.hit_colors = [self.WHITE, self.ORANGE, self.WHITE, self.YELLOW, self.BLUE]  # Hit particle color per type
+        self.enemies = EntityStore(
+            self.max_enemies,
+            x=np.float32, y=np.float32, type=np.int8,
+            health=np.float32, max_health=np.float32, speed=np.float32,
+            damage=np.int16, exp_value=np.int16, size=np.int16, color=(np.uint8, 3),
+            last_damage_time=np.float64, frozen_until=np.float64
+        )
+        self.projectiles = EntityStore(
+            self.max_projectiles,
+            x=np.float32, y=np.float32, vx=np.float32, vy=np.float32,
+            damage=np.int32, weapon=np.int8, lifetime=np.float32, size=np.int16
+        )
+        self.experience_orbs = EntityStore(
+            self.max_experience_orbs,
+            x=np.float32, y=np.float32, value=np.int32, lifetime=np.float32
+        )
+        self.particles = ParticleSystem(capacity=self.max_particles)
+        
+        # Spatial index over enemies, rebuilt once per tick after they move.
+        # Grid query results are enemy slot indices, valid until the end-of-tick compaction.
+        self.enemy_grid = SpatialGrid(cell_size=64)
+        self.nearest_enemy = None
+        
+        # Orbs are indexed too, rebuilt only after orbs are added, moved or removed.
+        # Past orb_merge_threshold, nearby orbs merge into larger ones carrying their total value.
+        self.orb_grid = SpatialGrid(cell_size=32)
+        self.orb_grid_dirty = True
+        self.orb_merge_threshold = 150
+        self.orb_merge_radius = 48
+        
+        # Enemy, projectile, orb and player shapes pre-rendered once; render() batches them into one blits()
+        self.health_bar_height = 4
+        self.max_orb_radius = int(math.ceil(self.experience_orb_size * 1.3 * 2.5))
+        self.sprite_atlas = self.build_sprite_atlas()
         
         # Fonts
         try:
@@ -204,9 +275,11 @@ class VampireSurvivorsGame:
         self.kill_count = 0
         self.survival_time = 0
         
-        self.player_x = self.width // 2
-        self.player_y = self.height // 2
+        self.player_x = self.world_width // 2
+        self.player_y = self.world_height // 2
         self.player_health = self.player_max_health
+        self.update_camera()
+        self.generate_obstacles()
         
         # Reset manual attack timers
         self.manual_attack_last_time = 0
@@ -220,13 +293,109 @@ class VampireSurvivorsGame:
         self.enemies.clear()
         self.projectiles.clear()
         self.experience_orbs.clear()
+        self.orb_grid_dirty = True
         self.particles.clear()
+        self.rebuild_enemy_grid()
         
         self.enemy_spawn_timer = 0
         self.wave_intensity = 1.0
         self.showing_level_up = False
         self.level_up_choices.clear()
 
+    def update_camera(self):
+        """Center the camera on the player, clamped to the world edges"""
+        self.camera_x = max(0, min(self.world_width - self.width, self.player_x - self.width / 2))
+        self.camera_y = max(0, min(self.world_height - self.height, self.player_y - self.height / 2))
+    
+    def in_view(self, x, y, margin):
+        """Mask of world positions within `margin` pixels of the viewport"""
+        return ((x >= self.camera_x - margin) & (x <= self.camera_x + self.width + margin) &
+                (y >= self.camera_y - margin) & (y <= self.camera_y + self.height + margin))
+    
+    def build_sprite_atlas(self):
+        """Pre-render every entity shape into the sprite atlas"""
+        def circle_sprite(color, radius, outline, outline_width):
+            sprite = pygame.Surface((radius * 2 + 2, radius * 2 + 2), pygame.SRCALPHA)
+            center = (radius + 1, radius + 1)
+            pygame.draw.circle(sprite, color, center, radius)
+            pygame.draw.circle(sprite, outline, center, radius, outline_width)
+            return sprite
+        
+        sprites = {}
+        for type_index, enemy_data in enumerate(self.enemy_types.values()):
+            size = enemy_data['size']
+            sprites[('enemy', type_index, False)] = circle_sprite(enemy_data['color'], size, self.WHITE, 2)
+            sprites[('enemy', type_index, True)] = circle_sprite(self.CYAN, size, self.WHITE, 2)
+            
+            # Health bar strip: green then red, each bar_width long. A bar_width window starting
+            # (bar_width - filled) pixels in shows `filled` green pixels followed by red.
+            bar_width = size * 2
+            strip = pygame.Surface((bar_width * 2, self.health_bar_height), pygame.SRCALPHA)
+            strip.fill(self.GREEN, (0, 0, bar_width, self.health_bar_height))
+            strip.fill(self.RED, (bar_width, 0, bar_width, self.health_bar_height))
+            sprites[('bar', bar_width)] = strip
+        
+        for type_index, color in enumerate(self.projectile_colors):
+            for size in (5, 6):
+                sprite = pygame.Surface((size * 2 + 2, size * 2 + 2), pygame.SRCALPHA)
+                pygame.draw.circle(sprite, color, (size + 1, size + 1), size)
+                sprites[('projectile', type_index, size)] = sprite
+        
+        for radius in range(1, self.max_orb_radius + 1):
+            sprites[('orb', radius)] = circle_sprite(self.YELLOW, radius, self.WHITE, min(2, radius))
+        
+        sprites['player'] = circle_sprite(self.BLUE, self.player_size, self.WHITE, 3)
+        return SpriteAtlas(sprites)
+    
+    def generate_obstacles(self):
+        """Scatter pillars and wall segments over the world, keeping the start area clear"""
+        field = self.flow_field
+        blocked = np.zeros((field.rows, field.cols), dtype=bool)
+        self.obstacle_rects = []
+        if self.obstacles_enabled:
+            center_col, center_row = field.cell_of(self.player_x, self.player_y)
+            for _ in range(self.obstacle_count):
+                if random.random() < 0.5:  # Pillar
+                    cols, rows = 2, 2
+                elif random.random() < 0.5:  # Horizontal wall
+                    cols, rows = random.randint(4, 8), 1
+                else:  # Vertical wall
+                    cols, rows = 1, random.randint(4, 8)
+                col = random.randrange(field.cols - cols + 1)
+                row = random.randrange(field.rows - rows + 1)
+                if abs(col + cols / 2 - center_col) < 6 and abs(row + rows / 2 - center_row) < 5:
+                    continue
+                blocked[row:row + rows, col:col + cols] = True
+                self.obstacle_rects.append(pygame.Rect(col * field.cell_size, row * field.cell_size,
+                                                       cols * field.cell_size, rows * field.cell_size))
+        field.set_blocked(blocked)
+    
+    def player_blocked(self, x, y):
+        """Whether the player circle at (x, y) overlaps an obstacle cell"""
+        if not self.obstacles_enabled:
+            return False
+        reach = self.player_size * 0.7
+        blocked_at = self.flow_field.blocked_at
+        return (blocked_at(x, y) or blocked_at(x - reach, y) or blocked_at(x + reach, y) or
+                blocked_at(x, y - reach) or blocked_at(x, y + reach))
+    
+    def spawn_chunks(self):
+        """World chunks in the ring just outside the chunks the viewport touches"""
+        size = self.chunk_size
+        first_x = int(self.camera_x // size)
+        first_y = int(self.camera_y // size)
+        last_x = int((self.camera_x + self.width) // size)
+        last_y = int((self.camera_y + self.height) // size)
+        max_x = (self.world_width - 1) // size
+        max_y = (self.world_height - 1) // size
+        chunks = []
+        for chunk_x in range(max(0, first_x - 1), min(max_x, last_x + 1) + 1):
+            for chunk_y in range(max(0, first_y - 1), min(max_y, last_y + 1) + 1):
+                if not (first_x <= chunk_x <= last_x and first_y <= chunk_y <= last_y):
+                    chunks.append((chunk_x, chunk_y))
+        # The world is larger than the view, so at least one side of the ring exists
+        return chunks
+    
     def spawn_enemy(self):
         """Spawn a new enemy"""
         if len(self.enemies) >= self.max_enemies:
@@ -240,83 +409,109 @@ class VampireSurvivorsGame:
         else:
             enemy_type = random.choice(['zombie', 'skeleton', 'ghost', 'vampire'])
         
-        # Spawn outside screen
-        side = random.randint(0, 3)
-        if side == 0:  # Top
-            x = random.randint(0, self.width)
-            y = -20
-        elif side == 1:  # Right
-            x = self.width + 20
-            y = random.randint(0, self.height)
-        elif side == 2:  # Bottom
-            x = random.randint(0, self.width)
-            y = self.height + 20
-        else:  # Left
-            x = -20
-            y = random.randint(0, self.height)
-        
-        enemy_data = self.enemy_types[enemy_type].copy()
-        enemy = {
-            'x': x,
-            'y': y,
-            'type': enemy_type,
-            'health': enemy_data['health'] * self.wave_intensity,
-            'max_health': enemy_data['health'] * self.wave_intensity,
-            'speed': enemy_data['speed'] * (1 + self.survival_time / 120),
-            'damage': enemy_data['damage'],
-            'exp_value': enemy_data['exp_value'],
-            'color': enemy_data['color'],
-            'size': enemy_data['size'],
-            'last_damage_time': 0,
-            'frozen_until': 0
-        }
+        # Spawn at a random free point of a world chunk just outside the viewport
+        chunks = self.spawn_chunks()
+        for _ in range(10):
+            chunk_x, chunk_y = random.choice(chunks)
+            x = (chunk_x + random.random()) * self.chunk_size
+            y = (chunk_y + random.random()) * self.chunk_size
+            if not (self.obstacles_enabled and self.flow_field.blocked_at(x, y)):
+                break
+        else:
+            return
         
-        self.enemies.append(enemy)
+        enemy_data = self.enemy_types[enemy_type]
+        self.enemies.add(
+            x=x,
+            y=y,
+            type=self.enemy_type_names.index(enemy_type),
+            health=enemy_data['health'] * self.wave_intensity,
+            max_health=enemy_data['health'] * self.wave_intensity,
+            speed=enemy_data['speed'] * (1 + self.survival_time / 120),
+            damage=enemy_data['damage'],
+            exp_value=enemy_data['exp_value'],
+            color=enemy_data['color'],
+            size=enemy_data['size'],
+            last_damage_time=0,
+            frozen_until=0
+        )
     
     def update_enemies(self, delta_time):
-        """Update enemy positions and behavior"""
+        """Update enemy positions and behavior (one vectorized pass over all enemies)"""
+        enemies = self.enemies
+        if not len(enemies):
+            return
         current_time = time.time()
-        
-        for enemy in self.enemies[:]:
-            # Skip if frozen
-            if current_time < enemy['frozen_until']:
-                continue
-            
-            # Move towards player
-            dx = self.player_x - enemy['x']
-            dy = self.player_y - enemy['y']
-            distance = math.sqrt(dx * dx + dy * dy)
+        x = enemies.view('x')
+        y = enemies.view('y')
+        
+        # Frozen enemies neither move nor damage the player
+        active = enemies.view('alive') & (enemies.view('frozen_until') <= current_time)
+        
+        # Enemies far outside the view move only every far_sim_interval ticks (staggered by slot)
+        # with a correspondingly larger step
+        interval = self.far_sim_interval
+        tick_scale = np.where(self.in_view(x, y, self.sim_margin), 1,
+                              np.where((np.arange(len(enemies)) + self.frame_count) % interval == 0, interval, 0))
+        
+        # Move towards player
+        dx = self.player_x - x
+        dy = self.player_y - y
+        distance = np.hypot(dx, dy)
+        dir_x = dx / np.maximum(distance, 1e-6)
+        dir_y = dy / np.maximum(distance, 1e-6)
+        step = np.where(active & (distance > 0), enemies.view('speed') * 60 * delta_time * tick_scale, 0.0)
+        
+        if self.obstacles_enabled:
+            # Steer along the flow field (one lookup per enemy; it is only recomputed when the
+            # player changes cell). In the player's cell, or when cut off, home in directly.
+            field = self.flow_field
+            field.update(self.player_x, self.player_y)
+            flow_x, flow_y, has_flow = field.lookup(x, y)
+            new_x = x + np.where(has_flow, flow_x, dir_x) * step
+            new_y = y + np.where(has_flow, flow_y, dir_y) * step
+        else:
+            new_x = x + dir_x * step
+            new_y = y + dir_y * step
+        
+        # Local avoidance so hordes spread out instead of stacking on the same pixels.
+        # Frozen enemies still push others away but do not move themselves.
+        # Enemies are drawn with radius `size`, so that is the contact radius.
+        push_x, push_y = separation(new_x, new_y, enemies.view('size'), self.separation_strength)
+        new_x += np.where(active, push_x, 0.0)
+        new_y += np.where(active, push_y, 0.0)
+        
+        if self.obstacles_enabled:
+            # Obstacles stop movement along the blocked axis
+            x[:] = np.where(field.blocked_mask(new_x, y), x, new_x)
+            y[:] = np.where(field.blocked_mask(x, new_y), y, new_y)
+        else:
+            x[:] = new_x
+            y[:] = new_y
+        np.clip(x, 0, self.world_width, out=x)
+        np.clip(y, 0, self.world_height, out=y)
+        
+        # Check collision with player
+        player_distance = np.hypot(x - self.player_x, y - self.player_y)
+        touching = active & (player_distance < (enemies.view('size') + self.player_size) / 2)
+        touching &= current_time - enemies.view('last_damage_time') > 1.0
+        
+        for index in np.flatnonzero(touching):
+            # Damage player
+            self.player_health -= int(enemies.damage[index])
+            enemies.last_damage_time[index] = current_time
             
-            if distance > 0:
-                # Normalize and apply speed
-                move_x = (dx / distance) * enemy['speed'] * 60 * delta_time
-                move_y = (dy / distance) * enemy['speed'] * 60 * delta_time
-                
-                enemy['x'] += move_x
-                enemy['y'] += move_y
+            # Create damage particles
+            self.create_damage_particles(self.player_x, self.player_y, self.RED)
             
-            # Check collision with player
-            player_distance = math.sqrt(
-                (enemy['x'] - self.player_x) ** 2 + 
-                (enemy['y'] - self.player_y) ** 2
-            )
+            if self.buzzer:
+                self.buzzer.play_tone(frequency=200, duration=0.1)
             
-            if player_distance < (enemy['size'] + self.player_size) / 2:
-                # Damage player
-                if current_time - enemy['last_damage_time'] > 1.0:
-                    self.player_health -= enemy['damage']
-                    enemy['last_damage_time'] = current_time
-                    
-                    # Create damage particles
-                    self.create_damage_particles(self.player_x, self.player_y, self.RED)
-                    
-                    if self.buzzer:
-                        self.buzzer.play_tone(frequency=200, duration=0.1)
-                    
-                    if self.player_health <= 0:
-                        self.game_over = True
-                        if self.buzzer:
-                            self.buzzer.play_tone(frequency=150, duration=1.0)
+            if self.player_health <= 0:
+                self.game_over = True
+                if self.buzzer:
+                    self.buzzer.play_tone(frequency=150, duration=1.0, category="game_over")
+                break
     
     def fire_weapons(self):
         """Fire all available weapons"""
@@ -329,30 +524,29 @@ class VampireSurvivorsGame:
             if current_time - weapon['last_shot'] >= weapon['cooldown']:
                 # Find nearest enemy
                 nearest_enemy = self.find_nearest_enemy()
-                if nearest_enemy:
-                    distance = math.sqrt(
-                        (nearest_enemy['x'] - self.player_x) ** 2 + 
-                        (nearest_enemy['y'] - self.player_y) ** 2
-                    )
+                if nearest_enemy is not None:
+                    distance = math.hypot(self.enemies.x[nearest_enemy] - self.player_x,
+                                          self.enemies.y[nearest_enemy] - self.player_y)
                     
                     if distance <= weapon['range']:
                         self.create_projectile(weapon_key, weapon, nearest_enemy)
                         weapon['last_shot'] = current_time
     
+    def rebuild_enemy_grid(self):
+        """Re-index enemy positions for this tick's collision and targeting queries"""
+        self.enemy_grid.rebuild(self.enemies.view('x'), self.enemies.view('y'), self.enemies.view('size') / 2)
+        self.nearest_enemy = None
+    
+    def is_enemy_dead(self, index):
+        return not self.enemies.alive[index]
+    
     def find_nearest_enemy(self):
-        """Find the nearest enemy to the player"""
-        nearest = None
-        min_distance = float('inf')
-        
-        for enemy in self.enemies:
-            distance = math.sqrt(
-                (enemy['x'] - self.player_x) ** 2 + 
-                (enemy['y'] - self.player_y) ** 2
-            )
-            if distance < min_distance:
-                min_distance = distance
-                nearest = enemy
-        
+        """Index of the nearest enemy to the player, or None (cached until it dies or the grid is rebuilt)"""
+        nearest = self.nearest_enemy
+        if nearest is None or not self.enemies.alive[nearest]:
+            found = self.enemy_grid.nearest(self.player_x, self.player_y, skip=self.is_enemy_dead)
+            nearest = found[0][1] if found else None
+            self.nearest_enemy = nearest
         return nearest
     
     def create_projectile(self, weapon_key, weapon, target):
@@ -361,8 +555,8 @@ class VampireSurvivorsGame:
             return
         
         # Calculate direction to target
-        dx = target['x'] - self.player_x
-        dy = target['y'] - self.player_y
+        dx = float(self.enemies.x[target]) - self.player_x
+        dy = float(self.enemies.y[target]) - self.player_y
         distance = math.sqrt(dx * dx + dy * dy)
         
         if distance == 0:
@@ -385,18 +579,16 @@ class VampireSurvivorsGame:
             final_dir_x = dir_x * cos_offset - dir_y * sin_offset
             final_dir_y = dir_x * sin_offset + dir_y * cos_offset
             
-            projectile = {
-                'x': self.player_x,
-                'y': self.player_y,
-                'vx': final_dir_x * self.projectile_speed,
-                'vy': final_dir_y * self.projectile_speed,
-                'damage': weapon['damage'] * weapon['level'],
-                'weapon_type': weapon_key,
-                'lifetime': 3.0,
-                'size': 5
-            }
-            
-            self.projectiles.append(projectile)
+            self.projectiles.add(
+                x=self.player_x,
+                y=self.player_y,
+                vx=final_dir_x * self.projectile_speed,
+                vy=final_dir_y * self.projectile_speed,
+                damage=weapon['damage'] * weapon['level'],
+                weapon=self.projectile_type_names.index(weapon_key),
+                lifetime=3.0,
+                size=5
+            )
         
         # Play sound effect
         if self.buzzer:
@@ -410,17 +602,15 @@ class VampireSurvivorsGame:
         if current_time - self.manual_attack_last_time >= self.manual_attack_cooldown:
             # Find nearest enemy for targeting
             nearest_enemy = self.find_nearest_enemy()
-            if nearest_enemy:
+            if nearest_enemy is not None:
+                # Calculate direction to target
+                dx = float(self.enemies.x[nearest_enemy]) - self.player_x
+                dy = float(self.enemies.y[nearest_enemy]) - self.player_y
+                
                 # Check if enemy is in range
-                distance = math.sqrt(
-                    (nearest_enemy['x'] - self.player_x) ** 2 + 
-                    (nearest_enemy['y'] - self.player_y) ** 2
-                )
+                distance = math.sqrt(dx * dx + dy * dy)
                 
                 if distance <= self.manual_skills['normal_attack']['range']:
-                    # Calculate direction to target
-                    dx = nearest_enemy['x'] - self.player_x
-                    dy = nearest_enemy['y'] - self.player_y
                     
                     if distance > 0:
                         # Normalize direction
@@ -428,18 +618,16 @@ class VampireSurvivorsGame:
                         dir_y = dy / distance
                         
                         # Create projectile
-                        if len(self.projectiles) < self.max_projectiles:
-                            projectile = {
-                                'x': self.player_x,
-                                'y': self.player_y,
-                                'vx': dir_x * self.projectile_speed,
-                                'vy': dir_y * self.projectile_speed,
-                                'damage': self.manual_skills['normal_attack']['damage'],
-                                'weapon_type': 'manual_normal',
-                                'lifetime': 3.0,
-                                'size': 6
-                            }
-                            self.projectiles.append(projectile)
+                        self.projectiles.add(
+                            x=self.player_x,
+                            y=self.player_y,
+                            vx=dir_x * self.projectile_speed,
+                            vy=dir_y * self.projectile_speed,
+                            damage=self.manual_skills['normal_attack']['damage'],
+                            weapon=self.projectile_type_names.index('manual_normal'),
+                            lifetime=3.0,
+                            size=6
+                        )
                         
                         # Update cooldown
                         self.manual_attack_last_time = current_time
@@ -458,43 +646,23 @@ class VampireSurvivorsGame:
             attack_damage = self.manual_skills['special_attack']['damage']
             
             # Damage all enemies in range
+            enemies = self.enemies
             enemies_hit = 0
-            for enemy in self.enemies[:]:
-                distance = math.sqrt(
-                    (enemy['x'] - self.player_x) ** 2 + 
-                    (enemy['y'] - self.player_y) ** 2
-                )
-                
-                if distance <= attack_range:
-                    enemy['health'] -= attack_damage
+            for index in self.enemy_grid.query_radius(self.player_x, self.player_y, attack_range):
+                if enemies.alive[index]:
+                    enemies.health[index] -= attack_damage
                     enemies_hit += 1
                     
                     # Create hit particles
-                    self.create_hit_particles(enemy['x'], enemy['y'], self.ORANGE)
+                    self.create_hit_particles(enemies.x[index], enemies.y[index], self.ORANGE)
                     
                     # Check if enemy is dead
-                    if enemy['health'] <= 0:
-                        self.kill_enemy(enemy)
+                    if enemies.health[index] <= 0:
+                        self.kill_enemy(index)
             
             if enemies_hit > 0:
                 # Create explosion effect around player
-                for _ in range(20):
-                    if len(self.particles) >= self.max_particles:
-                        break
-                    
-                    angle = random.uniform(0, 2 * math.pi)
-                    speed = random.uniform(50, 150)
-                    
-                    particle = {
-                        'x': self.player_x,
-                        'y': self.player_y,
-                        'vx': math.cos(angle) * speed,
-                        'vy': math.sin(angle) * speed,
-                        'color': self.ORANGE,
-                        'lifetime': 1.0,
-                        'size': random.uniform(4, 8)
-                    }
-                    self.particles.append(particle)
+                self.particles.emit('survivor_explosion', self.player_x, self.player_y, self.ORANGE)
                 
                 # Update cooldown
                 self.special_attack_last_time = current_time
@@ -527,137 +695,175 @@ class VampireSurvivorsGame:
 
     def update_projectiles(self, delta_time):
         """Update projectile positions and collisions"""
-        for projectile in self.projectiles[:]:
-            # Move projectile
-            projectile['x'] += projectile['vx'] * delta_time
-            projectile['y'] += projectile['vy'] * delta_time
-            projectile['lifetime'] -= delta_time
-            
-            # Remove if expired or out of bounds
-            if (projectile['lifetime'] <= 0 or 
-                projectile['x'] < -50 or projectile['x'] > self.width + 50 or
-                projectile['y'] < -50 or projectile['y'] > self.height + 50):
-                self.projectiles.remove(projectile)
-                continue
-            
-            # Check collision with enemies
-            for enemy in self.enemies[:]:
-                distance = math.sqrt(
-                    (projectile['x'] - enemy['x']) ** 2 + 
-                    (projectile['y'] - enemy['y']) ** 2
-                )
+        projectiles = self.projectiles
+        if not len(projectiles):
+            return
+        enemies = self.enemies
+        
+        # Move all projectiles
+        x = projectiles.view('x')
+        y = projectiles.view('y')
+        start_x = x.tolist()
+        start_y = y.tolist()
+        x += projectiles.view('vx') * delta_time
+        y += projectiles.view('vy') * delta_time
+        lifetime = projectiles.view('lifetime')
+        lifetime -= delta_time
+        
+        # Remove if expired, out of view or inside an obstacle
+        expired = (lifetime <= 0) | ~self.in_view(x, y, 50)
+        if self.obstacles_enabled:
+            expired |= self.flow_field.blocked_mask(x, y)
+        projectiles.kill_mask(expired)
+        
+        # Sweep each projectile's movement against the enemy grid; hits come back nearest-first
+        end_x = x.tolist()
+        end_y = y.tolist()
+        for index in np.flatnonzero(projectiles.view('alive')):
+            for enemy in self.enemy_grid.query_segment(start_x[index], start_y[index], end_x[index], end_y[index],
+                                                       projectiles.size[index] / 2, include_radius=True):
+                if not enemies.alive[enemy]:
+                    continue
                 
-                if distance < (projectile['size'] + enemy['size']) / 2:
-                    # Deal damage
-                    enemy['health'] -= projectile['damage']
-                    
-                    # Special weapon effects
-                    if projectile['weapon_type'] == 'ice_shard':
-                        enemy['frozen_until'] = time.time() + 1.0
-                    elif projectile['weapon_type'] == 'lightning':
-                        self.chain_lightning(enemy, projectile['damage'] // 2, 2)
-                    
-                    # Create hit particles
-                    hit_color = self.WHITE
-                    if projectile['weapon_type'] == 'manual_normal':
-                        hit_color = self.BLUE
-                    elif projectile['weapon_type'] == 'lightning':
-                        hit_color = self.YELLOW
-                    elif projectile['weapon_type'] == 'fireball':
-                        hit_color = self.ORANGE
-                    
-                    self.create_hit_particles(enemy['x'], enemy['y'], hit_color)
-                    
-                    # Remove projectile
-                    if projectile in self.projectiles:
-                        self.projectiles.remove(projectile)
-                    
-                    # Check if enemy is dead
-                    if enemy['health'] <= 0:
-                        self.kill_enemy(enemy)
-                    
-                    break
+                # Deal damage
+                damage = int(projectiles.damage[index])
+                weapon_type = projectiles.weapon[index]
+                enemies.health[enemy] -= damage
+                
+                # Special weapon effects
+                if self.projectile_type_names[weapon_type] == 'ice_shard':
+                    enemies.frozen_until[enemy] = time.time() + 1.0
+                elif self.projectile_type_names[weapon_type] == 'lightning':
+                    self.chain_lightning(enemy, damage // 2, 2)
+                
+                # Create hit particles
+                self.create_hit_particles(enemies.x[enemy], enemies.y[enemy], self.hit_colors[weapon_type])
+                
+                # Check if enemy is dead
+                if enemies.health[enemy] <= 0:
+                    self.kill_enemy(enemy)
+                
+                projectiles.kill(index)
+                break
+        
+        projectiles.compact()
     
     def chain_lightning(self, origin_enemy, damage, chains_left):
         """Chain lightning effect"""
         if chains_left <= 0:
             return
-        
-        # Find nearby enemies
-        for enemy in self.enemies:
-            if enemy == origin_enemy:
-                continue
-            
-            distance = math.sqrt(
-                (enemy['x'] - origin_enemy['x']) ** 2 + 
-                (enemy['y'] - origin_enemy['y']) ** 2
-            )
+        enemies = self.enemies
+        
+        # Jump to the nearest live enemy within chain range
+        def skip(index):
+            return index == origin_enemy or not enemies.alive[index]
+        
+        found = self.enemy_grid.nearest(float(enemies.x[origin_enemy]), float(enemies.y[origin_enemy]),
+                                        max_distance=80, skip=skip)
+        if found:
+            enemy = found[0][1]
+            enemies.health[enemy] -= damage
+            self.create_hit_particles(enemies.x[enemy], enemies.y[enemy], self.YELLOW)
             
-            if distance < 80:  # Chain range
-                enemy['health'] -= damage
-                self.create_hit_particles(enemy['x'], enemy['y'], self.YELLOW)
-                
-                if enemy['health'] <= 0:
-                    self.kill_enemy(enemy)
-                else:
-                    self.chain_lightning(enemy, damage // 2, chains_left - 1)
-                break
+            if enemies.health[enemy] <= 0:
+                self.kill_enemy(enemy)
+            else:
+                self.chain_lightning(enemy, damage // 2, chains_left - 1)
     
-    def kill_enemy(self, enemy):
+    def kill_enemy(self, index):
         """Handle enemy death"""
+        enemies = self.enemies
+        if not enemies.alive[index]:
+            return
+        # The slot is reclaimed by compact() at the end of the tick so grid indices remain valid
+        enemies.kill(index)
+        
         # Add experience
-        self.experience += enemy['exp_value']
-        self.score += enemy['exp_value'] * 10
+        exp_value = int(enemies.exp_value[index])
+        self.experience += exp_value
+        self.score += exp_value * 10
         self.kill_count += 1
         
         # Create experience orb
-        orb = {
-            'x': enemy['x'],
-            'y': enemy['y'],
-            'value': enemy['exp_value'],
-            'lifetime': 10.0
-        }
-        self.experience_orbs.append(orb)
+        x = float(enemies.x[index])
+        y = float(enemies.y[index])
+        self.experience_orbs.add(x=x, y=y, value=exp_value, lifetime=10.0)
+        self.orb_grid_dirty = True
         
         # Create death particles
-        self.create_death_particles(enemy['x'], enemy['y'], enemy['color'])
-        
-        # Remove enemy
-        if enemy in self.enemies:
-            self.enemies.remove(enemy)
+        self.create_death_particles(x, y, enemies.color[index])
         
         if self.buzzer:
             self.buzzer.play_tone(frequency=400, duration=0.05)
     
+    def coalesce_experience_orbs(self):
+        """Merge orbs sharing a merge cell into one orb at their value-weighted center"""
+        orbs = self.experience_orbs
+        target = self.orb_merge_threshold // 2
+        cell_size = self.orb_merge_radius
+        x = orbs.view('x').astype(np.float64)
+        y = orbs.view('y').astype(np.float64)
+        value = orbs.view('value').astype(np.float64)
+        while True:
+            cols = int(self.world_width // cell_size) + 2
+            keys = (y // cell_size).astype(np.int64) * cols + (x // cell_size).astype(np.int64)
+            cells, group = np.unique(keys, return_inverse=True)
+            # Widen the cells until the merge actually brings the count down
+            if len(cells) <= target or cell_size >= max(self.world_width, self.world_height):
+                break
+            cell_size *= 2
+        
+        total = np.bincount(group, weights=value)
+        merged_x = np.bincount(group, weights=x * value) / total
+        merged_y = np.bincount(group, weights=y * value) / total
+        lifetime = np.zeros(len(cells), dtype=np.float32)
+        np.maximum.at(lifetime, group, orbs.view('lifetime'))
+        
+        orbs.clear()
+        orbs.add_many(len(cells), x=merged_x, y=merged_y, value=total.astype(np.int32), lifetime=lifetime)
+        self.orb_grid_dirty = True
+    
     def update_experience_orbs(self, delta_time):
         """Update experience orbs"""
-        for orb in self.experience_orbs[:]:
-            orb['lifetime'] -= delta_time
-            
-            # Remove expired orbs
-            if orb['lifetime'] <= 0:
-                self.experience_orbs.remove(orb)
-                continue
-            
-            # Check if player is nearby to collect
-            distance = math.sqrt(
-                (orb['x'] - self.player_x) ** 2 + 
-                (orb['y'] - self.player_y) ** 2
-            )
+        orbs = self.experience_orbs
+        if len(orbs) > self.orb_merge_threshold:
+            self.coalesce_experience_orbs()
+        if not len(orbs):
+            return
+        lifetime = orbs.view('lifetime')
+        lifetime -= delta_time
+        expired = lifetime <= 0
+        
+        # Only orbs within the magnet radius are touched, found through the orb grid
+        if self.orb_grid_dirty:
+            self.orb_grid.rebuild(orbs.view('x'), orbs.view('y'))
+            self.orb_grid_dirty = False
+        nearby = np.array(self.orb_grid.query_radius(self.player_x, self.player_y, self.orb_magnet_radius),
+                          dtype=np.int64)
+        collected = np.zeros(len(orbs), dtype=bool)
+        if len(nearby):
+            # Orbs near the player drift towards them
+            dx = self.player_x - orbs.x[nearby]
+            dy = self.player_y - orbs.y[nearby]
+            distance = np.hypot(dx, dy)
+            step = np.where(distance > 0, 200 * delta_time / np.maximum(distance, 1e-6), 0.0)
+            orbs.x[nearby] += dx * step
+            orbs.y[nearby] += dy * step
+            self.orb_grid_dirty = True
             
-            if distance < 30:
-                # Move orb towards player
-                dx = self.player_x - orb['x']
-                dy = self.player_y - orb['y']
-                if distance > 0:
-                    orb['x'] += (dx / distance) * 200 * delta_time
-                    orb['y'] += (dy / distance) * 200 * delta_time
-                
-                # Collect if close enough
-                if distance < 15:
-                    self.experience_orbs.remove(orb)
-                    if self.buzzer:
-                        self.buzzer.play_tone(frequency=600, duration=0.05)
+            # Collect if close enough
+            collected[nearby[distance < self.orb_pickup_radius]] = True
+            collected &= ~expired
+        
+        # Remove collected and expired orbs
+        removed = expired | collected
+        if removed.any():
+            orbs.kill_mask(removed)
+            orbs.compact()
+            self.orb_grid_dirty = True
+        
+        if self.buzzer and collected.any():
+            self.buzzer.play_tone(frequency=600, duration=0.05)
     
     def check_level_up(self):
         """Check if player should level up"""
@@ -671,7 +877,7 @@ class VampireSurvivorsGame:
             self.showing_level_up = True
             
             if self.buzzer:
-                self.buzzer.play_tone(frequency=1000, duration=0.3)
+                self.buzzer.play_tone(frequency=1000, duration=0.3, category="level_up")
     
     def generate_level_up_choices(self):
         """Generate random level up choices"""
@@ -731,65 +937,19 @@ class VampireSurvivorsGame:
 
     def create_hit_particles(self, x, y, color):
         """Create hit effect particles"""
-        for _ in range(5):
-            if len(self.particles) >= self.max_particles:
-                break
-            
-            particle = {
-                'x': x,
-                'y': y,
-                'vx': random.uniform(-50, 50),
-                'vy': random.uniform(-50, 50),
-                'color': color,
-                'lifetime': 0.5,
-                'size': random.uniform(2, 4)
-            }
-            self.particles.append(particle)
+        self.particles.emit('survivor_hit', x, y, color)
     
     def create_death_particles(self, x, y, color):
         """Create death effect particles"""
-        for _ in range(10):
-            if len(self.particles) >= self.max_particles:
-                break
-            
-            particle = {
-                'x': x,
-                'y': y,
-                'vx': random.uniform(-100, 100),
-                'vy': random.uniform(-100, 100),
-                'color': color,
-                'lifetime': 1.0,
-                'size': random.uniform(3, 6)
-            }
-            self.particles.append(particle)
+        self.particles.emit('survivor_death', x, y, color)
     
     def create_damage_particles(self, x, y, color):
         """Create damage effect particles"""
-        for _ in range(8):
-            if len(self.particles) >= self.max_particles:
-                break
-            
-            particle = {
-                'x': x,
-                'y': y,
-                'vx': random.uniform(-80, 80),
-                'vy': random.uniform(-80, 80),
-                'color': color,
-                'lifetime': 0.8,
-                'size': random.uniform(2, 5)
-            }
-            self.particles.append(particle)
+        self.particles.emit('survivor_damage', x, y, color)
     
     def update_particles(self, delta_time):
         """Update particle effects"""
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx'] * delta_time
-            particle['y'] += particle['vy'] * delta_time
-            particle['lifetime'] -= delta_time
-            particle['vy'] += 150 * delta_time  # Gravity
-            
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
+        self.particles.update(delta_time)
     
     def update(self, controller_input=None):
         """Update game state"""
@@ -813,11 +973,11 @@ class VampireSurvivorsGame:
                 if controller_input.get("up_pressed"):
                     self.level_up_choice_index = (self.level_up_choice_index - 1) % len(self.level_up_choices)
                     if self.buzzer:
-                        self.buzzer.play_tone(frequency=300, duration=0.05)
+                        self.buzzer.play_tone(frequency=300, duration=0.05, category="ui")
                 elif controller_input.get("down_pressed"):
                     self.level_up_choice_index = (self.level_up_choice_index + 1) % len(self.level_up_choices)
                     if self.buzzer:
-                        self.buzzer.play_tone(frequency=300, duration=0.05)
+                        self.buzzer.play_tone(frequency=300, duration=0.05, category="ui")
                 elif controller_input.get("a_pressed"):
                     self.apply_level_up_choice(self.level_up_choices[self.level_up_choice_index])
             return {"game_over": False}
@@ -825,14 +985,9 @@ class VampireSurvivorsGame:
         # Update survival time
         self.survival_time += delta_time
         
-        # Handle manual attacks
-        if controller_input:
-            if controller_input.get("a_pressed"):
-                self.manual_normal_attack()
-            if controller_input.get("x_pressed"):
-                self.manual_special_attack()
-        
         # Player movement with analog stick support
+        previous_x = self.player_x
+        previous_y = self.player_y
         if controller_input:
             # Initialize left stick parameters if not exists
             if not hasattr(self, 'stick_threshold'):
@@ -849,8 +1004,8 @@ class VampireSurvivorsGame:
                 move_y = stick_y * self.player_speed * 60 * delta_time
                 
                 # Apply movement with bounds checking
-                new_x = max(self.player_size, min(self.width - self.player_size, self.player_x + move_x))
-                new_y = max(self.player_size, min(self.height - self.player_size, self.player_y + move_y))
+                new_x = max(self.player_size, min(self.world_width - self.player_size, self.player_x + move_x))
+                new_y = max(self.player_size, min(self.world_height - self.player_size, self.player_y + move_y))
                 
                 self.player_x = new_x
                 self.player_y = new_y
@@ -861,20 +1016,33 @@ class VampireSurvivorsGame:
                 self.player_x = max(self.player_size, self.player_x - self.player_speed * 60 * delta_time)
                 moved = True
             elif controller_input.get("right_pressed"):
-                self.player_x = min(self.width - self.player_size, self.player_x + self.player_speed * 60 * delta_time)
+                self.player_x = min(self.world_width - self.player_size, self.player_x + self.player_speed * 60 * delta_time)
                 moved = True
             
             if controller_input.get("up_pressed"):
                 self.player_y = max(self.player_size, self.player_y - self.player_speed * 60 * delta_time)
                 moved = True
             elif controller_input.get("down_pressed"):
-                self.player_y = min(self.height - self.player_size, self.player_y + self.player_speed * 60 * delta_time)
+                self.player_y = min(self.world_height - self.player_size, self.player_y + self.player_speed * 60 * delta_time)
                 moved = True
             
             # Pause
             if controller_input.get("start_pressed"):
                 self.paused = True
         
+        # Obstacles block the player along the blocked axis
+        if self.player_blocked(self.player_x, self.player_y):
+            if not self.player_blocked(self.player_x, previous_y):
+                self.player_y = previous_y
+            elif not self.player_blocked(previous_x, self.player_y):
+                self.player_x = previous_x
+            else:
+                self.player_x = previous_x
+                self.player_y = previous_y
+        
+        self.update_camera()
+        self.frame_count += 1
+        
         # Player regeneration
         if self.player_health < self.player_max_health:
             self.player_health = min(self.player_max_health, 
@@ -885,7 +1053,9 @@ class VampireSurvivorsGame:
         spawn_rate = max(0.5, self.enemy_spawn_interval - self.survival_time / 60)
         
         if self.enemy_spawn_timer >= spawn_rate:
-            self.spawn_enemy()
+            # Waves grow by one enemy per spawn every 30 seconds survived
+            for _ in range(1 + int(self.survival_time // 30)):
+                self.spawn_enemy()
             self.enemy_spawn_timer = 0
         
         # Update wave intensity
@@ -893,11 +1063,23 @@ class VampireSurvivorsGame:
         
         # Update game objects
         self.update_enemies(delta_time)
+        self.rebuild_enemy_grid()
+        
+        # Handle manual attacks (after enemies move so grid queries see current positions)
+        if controller_input:
+            if controller_input.get("a_pressed"):
+                self.manual_normal_attack()
+            if controller_input.get("x_pressed"):
+                self.manual_special_attack()
+        
         self.fire_weapons()
         self.update_projectiles(delta_time)
         self.update_experience_orbs(delta_time)
         self.update_particles(delta_time)
         
+        # Reclaim the slots of enemies killed this tick
+        self.enemies.compact()
+        
         # Check level up
         self.check_level_up()
         
@@ -916,75 +1098,70 @@ class VampireSurvivorsGame:
             self.render_pause(screen)
             return
         
+        # Background grid so movement through the world is visible
+        camera_x = int(self.camera_x)
+        camera_y = int(self.camera_y)
+        for grid_x in range(-(camera_x % 100), self.width, 100):
+            pygame.draw.line(screen, self.DARK_GREEN, (grid_x, 0), (grid_x, self.height))
+        for grid_y in range(-(camera_y % 100), self.height, 100):
+            pygame.draw.line(screen, self.DARK_GREEN, (0, grid_y), (self.width, grid_y))
+        pygame.draw.rect(screen, self.GRAY, (-camera_x, -camera_y, self.world_width, self.world_height), 3)
+        
+        # Obstacles in view
+        view = pygame.Rect(camera_x, camera_y, self.width, self.height)
+        for rect in self.obstacle_rects:
+            if view.colliderect(rect):
+                pygame.draw.rect(screen, self.GRAY, rect.move(-camera_x, -camera_y))
+                pygame.draw.rect(screen, self.LIGHT_GRAY, rect.move(-camera_x, -camera_y), 2)
+        
         # Render particles (background layer)
-        for particle in self.particles:
-            if particle['lifetime'] > 0:
-                alpha = min(255, int(particle['lifetime'] * 255))
-                size = max(1, int(particle['size'] * particle['lifetime']))
-                color = (*particle['color'][:3], alpha)
-                
-                # Create surface for alpha blending
-                particle_surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                pygame.draw.circle(particle_surf, color, (size, size), size)
-                screen.blit(particle_surf, (int(particle['x'] - size), int(particle['y'] - size)))
-        
-        # Render experience orbs
-        for orb in self.experience_orbs:
-            pulse = 1 + 0.3 * math.sin(time.time() * 5)
-            size = int(self.experience_orb_size * pulse)
-            pygame.draw.circle(screen, self.YELLOW, 
-                             (int(orb['x']), int(orb['y'])), size)
-            pygame.draw.circle(screen, self.WHITE, 
-                             (int(orb['x']), int(orb['y'])), size, 2)
-        
-        # Render enemies
-        for enemy in self.enemies:
-            color = enemy['color']
-            
-            # Frozen effect
-            if time.time() < enemy['frozen_until']:
-                color = self.CYAN
-            
-            # Enemy body
-            pygame.draw.circle(screen, color, 
-                             (int(enemy['x']), int(enemy['y'])), enemy['size'])
-            pygame.draw.circle(screen, self.WHITE, 
-                             (int(enemy['x']), int(enemy['y'])), enemy['size'], 2)
-            
-            # Health bar
-            if enemy['health'] < enemy['max_health']:
-                bar_width = enemy['size'] * 2
-                bar_height = 4
-                bar_x = enemy['x'] - bar_width // 2
-                bar_y = enemy['y'] - enemy['size'] - 8
-                
-                health_ratio = enemy['health'] / enemy['max_health']
-                
-                pygame.draw.rect(screen, self.RED, 
-                               (bar_x, bar_y, bar_width, bar_height))
-                pygame.draw.rect(screen, self.GREEN, 
-                               (bar_x, bar_y, bar_width * health_ratio, bar_height))
-        
-        # Render projectiles
-        for projectile in self.projectiles:
-            color = self.WHITE
-            if projectile['weapon_type'] == 'fireball':
-                color = self.ORANGE
-            elif projectile['weapon_type'] == 'ice_shard':
-                color = self.CYAN
-            elif projectile['weapon_type'] == 'lightning':
-                color = self.YELLOW
-            elif projectile['weapon_type'] == 'manual_normal':
-                color = self.BLUE
-            
-            pygame.draw.circle(screen, color, 
-                             (int(projectile['x']), int(projectile['y'])), projectile['size'])
+        self.particles.draw(screen, (camera_x, camera_y))
+        
+        # Entity layer: orbs, enemies, health bars, projectiles and the player are gathered as
+        # atlas blits and submitted together in one screen.blits() call
+        atlas = self.sprite_atlas
+        blits = []
+        
+        # Experience orbs (only those near the viewport); merged orbs grow with their value
+        orbs = self.experience_orbs
+        visible = np.flatnonzero(self.in_view(orbs.view('x'), orbs.view('y'), self.view_margin))
+        pulse = 1 + 0.3 * math.sin(time.time() * 5)
+        sizes = np.clip(self.experience_orb_size * pulse * np.clip(np.sqrt(orbs.value[visible] / 5.0), 1.0, 2.5),
+                        1, self.max_orb_radius).astype(np.int32)
+        for x, y, size in zip((orbs.x[visible] - camera_x).astype(np.int32).tolist(),
+                              (orbs.y[visible] - camera_y).astype(np.int32).tolist(), sizes.tolist()):
+            blits.append(atlas.blit(('orb', size), x, y))
+        
+        # Enemies (only those near the viewport)
+        enemies = self.enemies
+        visible = np.flatnonzero(self.in_view(enemies.view('x'), enemies.view('y'), self.view_margin))
+        frozen = (enemies.frozen_until[visible] > time.time()).tolist()
+        xs = (enemies.x[visible] - camera_x).astype(np.int32).tolist()
+        ys = (enemies.y[visible] - camera_y).astype(np.int32).tolist()
+        for x, y, type_index, is_frozen in zip(xs, ys, enemies.type[visible].tolist(), frozen):
+            blits.append(atlas.blit(('enemy', type_index, is_frozen), x, y))
+        
+        # Health bars of damaged enemies: a window into the cached green/red strip
+        health = enemies.health[visible]
+        max_health = enemies.max_health[visible]
+        bar_height = self.health_bar_height
+        for k in np.flatnonzero(health < max_health).tolist():
+            size = int(enemies.size[visible[k]])
+            bar_width = size * 2
+            filled = max(0, int(bar_width * float(health[k]) / float(max_health[k])))
+            blits.append((atlas[('bar', bar_width)], (xs[k] - bar_width // 2, ys[k] - size - 8),
+                          (bar_width - filled, 0, bar_width, bar_height)))
+        
+        # Projectiles (always near the view: they are culled once they leave it)
+        projectiles = self.projectiles
+        for x, y, weapon_type, size in zip((projectiles.view('x') - camera_x).astype(np.int32).tolist(),
+                                           (projectiles.view('y') - camera_y).astype(np.int32).tolist(),
+                                           projectiles.view('weapon').tolist(), projectiles.view('size').tolist()):
+            blits.append(atlas.blit(('projectile', weapon_type, size), x, y))
         
-        # Render player
-        pygame.draw.circle(screen, self.BLUE, 
-                         (int(self.player_x), int(self.player_y)), self.player_size)
-        pygame.draw.circle(screen, self.WHITE, 
-                         (int(self.player_x), int(self.player_y)), self.player_size, 3)
+        # Player
+        blits.append(atlas.blit('player', int(self.player_x) - camera_x, int(self.player_y) - camera_y))
+        screen.blits(blits, doreturn=False)
         
         # Render UI
         self.render_ui(screen)
@@ -1153,8 +1330,8 @@ if __name__ == "__main__":
         pygame.display.set_caption("Vampire Survivors-like Game Test")
         
         class MockBuzzer:
-            def play_tone(self, frequency=None, duration=None):
-                print(f"Buzzer: freq={frequency}, dur={duration}")
+            def play_tone(self, frequency=None, duration=None, category=None):
+                print(f"Buzzer: freq={frequency}, dur={duration}, category={category}")
         
         game = VampireSurvivorsGame(screen_width, screen_height, buzzer=MockBuzzer())
         
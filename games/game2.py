@@ -7,8 +7,11 @@ import random
 import pygame
 import time
 import math
+import logging
 from pygame.locals import *
 
+logger = logging.getLogger(__name__)
+
 class PowerUp:
     """道具類別"""
     def __init__(self, x, y, type_info, power_type_name, speed=2.5):
@@ -25,8 +28,9 @@ class PowerUp:
         self.active = True
         self.creation_time = time.time() # 用於某些不需要持續時間的道具效果觸發
 
-    def move(self):
-        self.y += self.speed
+    def move(self, frames=1.0):
+        """下落；frames 為經過的時間（以 60fps 的幀為單位）"""
+        self.y += self.speed * frames
         self.rect.y = self.y
 
     def draw(self, screen, font):
@@ -36,6 +40,84 @@ class PowerUp:
         # screen.blit(text_surf, (self.rect.centerx - text_surf.get_width() // 2, self.rect.centery - text_surf.get_height() // 2))
 
 
+def swept_circle_rect(x, y, dx, dy, radius, rect, t_max):
+    """
+    移動中的圓與矩形的連續碰撞檢測 (swept circle)。
+    圓心從 (x, y) 以速度 (dx, dy) 移動 t_max 時間，回傳第一次接觸的 (t, nx, ny)：
+    t 為接觸時間，(nx, ny) 為接觸面的單位法向量（由矩形指向球）。沒有碰撞則回傳 None。
+    做法：圓心對「矩形往外擴張 radius 的圓角矩形」做射線檢測，邊用平板法 (slab)，角用四個圓。
+    """
+    left, top, right, bottom = rect.left, rect.top, rect.right, rect.bottom
+
+    # 起點已經與矩形接觸或重疊（例如浮點誤差）：若正往內移動，立即以最近點的方向反彈
+    closest_x = min(max(x, left), right)
+    closest_y = min(max(y, top), bottom)
+    off_x = x - closest_x
+    off_y = y - closest_y
+    dist_sq = off_x * off_x + off_y * off_y
+    if dist_sq <= radius * radius:
+        if dist_sq > 1e-12:
+            dist = math.sqrt(dist_sq)
+            nx, ny = off_x / dist, off_y / dist
+        else: # 圓心在矩形內：取最近的邊
+            gaps = ((x - left, -1.0, 0.0), (right - x, 1.0, 0.0), (y - top, 0.0, -1.0), (bottom - y, 0.0, 1.0))
+            _, nx, ny = min(gaps)
+        if dx * nx + dy * ny < 0:
+            return 0.0, nx, ny
+        return None
+
+    # 射線對擴張後的矩形 (平板法)
+    t_enter, t_exit = -math.inf, t_max
+    normal = None
+    for origin, velocity, low, high, axis_normal in ((x, dx, left - radius, right + radius, (1.0, 0.0)),
+                                                     (y, dy, top - radius, bottom + radius, (0.0, 1.0))):
+        if abs(velocity) < 1e-12:
+            if origin < low or origin > high:
+                return None
+            continue
+        t0 = (low - origin) / velocity
+        t1 = (high - origin) / velocity
+        sign = -1.0
+        if t0 > t1:
+            t0, t1 = t1, t0
+            sign = 1.0
+        if t0 > t_enter:
+            t_enter = t0
+            normal = (axis_normal[0] * sign, axis_normal[1] * sign)
+        t_exit = min(t_exit, t1)
+        if t_enter > t_exit:
+            return None
+
+    if t_exit < 0: # 矩形在移動方向的後方
+        return None
+    if t_enter < 0:
+        # 起點已在擴張矩形內（但未碰到圓角矩形）時只可能在角落區域
+        t_enter, normal = 0.0, None
+    hit_x = x + dx * t_enter
+    hit_y = y + dy * t_enter
+    # 接觸點落在邊的範圍內：是邊的碰撞
+    if normal is not None and (left <= hit_x <= right or top <= hit_y <= bottom):
+        return t_enter, normal[0], normal[1]
+
+    # 否則是角落：對最近角落的圓做射線檢測
+    corner_x = left if hit_x < left else right
+    corner_y = top if hit_y < top else bottom
+    fx = x - corner_x
+    fy = y - corner_y
+    a = dx * dx + dy * dy
+    b = 2 * (fx * dx + fy * dy)
+    c = fx * fx + fy * fy - radius * radius
+    discriminant = b * b - 4 * a * c
+    if a < 1e-12 or discriminant < 0:
+        return None
+    t = (-b - math.sqrt(discriminant)) / (2 * a)
+    if t < 0 or t > t_max:
+        return None
+    nx = (x + dx * t - corner_x) / radius
+    ny = (y + dy * t - corner_y) / radius
+    return t, nx, ny
+
+
 class BrickBreakerGame:
     """打磚塊遊戲類別 (增強版)"""
 
@@ -73,6 +155,9 @@ class BrickBreakerGame:
         self.initial_ball_speed = 4.5 # 稍微降低初始速度
         self.ball_speed = self.initial_ball_speed # 可變的球速
         self.max_ball_speed = 12 # 球的最大速度
+        # 速度單位為「每 60fps 幀的像素」；實際移動量依真實經過時間換算，與幀率無關
+        self.max_frame_time = 0.25 # 單次更新最多模擬的秒數（避免長時間卡頓後球瞬移太遠）
+        self.max_collision_steps = 16 # 單次更新最多處理的碰撞次數
 
         # 磚塊參數
         self.brick_width = (self.width - 100 - (9*2)) // 10
@@ -161,6 +246,7 @@ class BrickBreakerGame:
         self.game_over = False
         self.paused = False
         self.ball_launched = False
+        self.last_update_time = None # 第一次 update 才開始計時，建立遊戲到第一幀之間的時間不計入
 
         self.power_ups.clear()
         self.active_power_up_effects.clear()
@@ -190,22 +276,123 @@ class BrickBreakerGame:
             self.buzzer.play_tone(frequency=base_freq + freq_variation, duration=0.08)
             self.last_paddle_hit_time = current_time
 
-        self.ball_y = self.paddle_y - self.ball_radius - 0.1
+    def move_ball(self, frames):
+        """
+        以連續碰撞檢測移動球 frames 幀的時間，球掉出底部時回傳 True。
+        每一步找出牆壁、板子與掃過格子內磚塊中最早的接觸時間 (time of impact)，
+        前進到該時間點反彈，再用剩下的時間繼續，直到時間用完。
+        板子頂面的接觸使用依擊中位置決定角度的反彈，側面與角落則和牆壁一樣沿法向量反射。
+        一幀內用完 max_collision_steps 次接觸時 (例如球卡在磚塊夾角來回反彈)，剩下的時間直接捨棄並記錄：
+        不做碰撞檢測就前進可能讓球穿進磚塊或牆壁，而球保留原本的速度，只會少走這一幀剩下的距離。
+        """
+        radius = self.ball_radius
+        remaining = frames
+        current_time = time.time()
+        wall_hit_sound_delay = 0.1
+        for _ in range(self.max_collision_steps):
+            if remaining <= 0:
+                break
+            x, y = self.ball_x, self.ball_y
+            dx, dy = self.ball_dx, self.ball_dy
+            end_x = x + dx * remaining
+            end_y = y + dy * remaining
+            hit_time = remaining
+            hit = None # (種類, 法向量 x, 法向量 y, 磚塊)
+
+            # 牆壁（左、右、上）與底部
+            if dx < 0 and end_x < radius:
+                hit_time, hit = max(0.0, (radius - x) / dx), ('wall', 1.0, 0.0, None)
+            elif dx > 0 and end_x > self.width - radius:
+                hit_time, hit = max(0.0, (self.width - radius - x) / dx), ('wall', -1.0, 0.0, None)
+            if dy < 0 and end_y < radius:
+                t = max(0.0, (radius - y) / dy)
+                if t < hit_time:
+                    hit_time, hit = t, ('wall', 0.0, 1.0, None)
+            elif dy > 0 and end_y > self.height - radius:
+                t = max(0.0, (self.height - radius - y) / dy)
+                if t < hit_time:
+                    hit_time, hit = t, ('floor', 0.0, -1.0, None)
+
+            # 板子：只在球往下時反彈
+            if dy > 0:
+                paddle_rect = pygame.Rect(self.paddle_x, self.paddle_y, self.paddle_width, self.paddle_height)
+                result = swept_circle_rect(x, y, dx, dy, radius, paddle_rect, hit_time)
+                if result is not None and result[0] <= hit_time:
+                    hit_time, hit = result[0], ('paddle', result[1], result[2], None)
+
+            # 磚塊：只查詢這一步掃過範圍重疊的格子
+            for brick in self.brick_cells_in_box(min(x, end_x) - radius, min(y, end_y) - radius,
+                                                 max(x, end_x) + radius, max(y, end_y) + radius):
+                result = swept_circle_rect(x, y, dx, dy, radius, brick['rect'], hit_time)
+                if result is not None and result[0] < hit_time:
+                    hit_time, hit = result[0], ('brick', result[1], result[2], brick)
+
+            # 前進到接觸點（或走完剩下的時間）
+            self.ball_x = x + dx * hit_time
+            self.ball_y = y + dy * hit_time
+            remaining -= hit_time
+            if hit is None:
+                break
 
-    def move_paddle(self, direction):
-        """移動板子"""
+            kind, nx, ny, brick = hit
+            if kind == 'floor':
+                return True
+            if kind == 'paddle' and ny < 0:
+                self.handle_ball_paddle_collision() # 頂面：依擊中位置決定反彈角度
+                continue
+            if kind == 'brick':
+                self.handle_ball_brick_collision(brick)
+            elif self.buzzer and current_time - self.last_wall_hit_time > wall_hit_sound_delay:
+                self.buzzer.play_tone(frequency=250, duration=0.05)
+                self.last_wall_hit_time = current_time
+
+            # 沿接觸面法向量反射速度
+            dot = dx * nx + dy * ny
+            if dot < 0:
+                self.ball_dx = dx - 2 * dot * nx
+                self.ball_dy = dy - 2 * dot * ny
+        if remaining > 0:
+            logger.debug(f"球在一幀內達到 {self.max_collision_steps} 次接觸，捨棄剩下的 {remaining:.3f} 幀移動")
+        return False
+
+    def move_paddle(self, direction, frames=1.0):
+        """移動板子；frames 為經過的時間（以 60fps 的幀為單位）"""
         if direction == "left":
-            self.paddle_x = max(0, self.paddle_x - self.paddle_speed)
+            self.paddle_x = max(0, self.paddle_x - self.paddle_speed * frames)
         elif direction == "right":
             # 檢查是否有寬板道具效果
             current_width = self.paddle_width
             if hasattr(self, 'active_power_up_effects') and 'PADDLE_GROW' in self.active_power_up_effects:
                 current_width = self.paddle_width * self.power_up_definitions['PADDLE_GROW']['value']
-            self.paddle_x = min(self.width - current_width, self.paddle_x + self.paddle_speed)
-
-    def handle_ball_brick_collision(self, brick_idx):
+            self.paddle_x = min(self.width - current_width, self.paddle_x + self.paddle_speed * frames)
+
+    def brick_cells_in_box(self, left, top, right, bottom):
+        """回傳與矩形範圍重疊的格子中所有仍存在的磚塊（只看重疊的 1~4 格，不掃描整面牆）"""
+        pitch_x = self.brick_width + self.brick_gap
+        pitch_y = self.brick_height + self.brick_gap
+        # 多留 1 像素：pygame.Rect 會把浮點座標截成整數
+        col0 = max(0, int(math.floor((left - 1 - self.brick_origin_x) / pitch_x)))
+        col1 = min(self.brick_cols - 1, int(math.floor((right + 1 - self.brick_origin_x) / pitch_x)))
+        row0 = max(0, int(math.floor((top - 1 - self.brick_origin_y) / pitch_y)))
+        row1 = min(self.brick_rows - 1, int(math.floor((bottom + 1 - self.brick_origin_y) / pitch_y)))
+        found = []
+        for row in range(row0, row1 + 1):
+            grid_row = self.brick_grid[row]
+            for col in range(col0, col1 + 1):
+                brick = grid_row[col]
+                if brick is not None:
+                    found.append(brick)
+        return found
+
+    def destroy_brick(self, brick):
+        """移除磚塊：從格子中清除，磚塊清單在該幀結束時才重建"""
+        brick['active'] = False
+        if self.brick_grid[brick['row']][brick['col']] is brick:
+            self.brick_grid[brick['row']][brick['col']] = None
+        self.bricks_changed = True
+
+    def handle_ball_brick_collision(self, brick):
         """處理球與磚塊的碰撞，計算分數和聲音。"""
-        brick = self.bricks[brick_idx]
         current_time = time.time()
 
         score_values = {'red': 50, 'orange': 40, 'yellow': 30, 'green': 20, 'blue': 10, 'gray': 15, 'exploding': 25}
@@ -219,7 +406,7 @@ class BrickBreakerGame:
 
         brick['remaining_hits'] -= 1
         if brick['remaining_hits'] <= 0:
-            brick['active'] = False
+            self.destroy_brick(brick)
 
             # 處理爆炸磚塊
             if brick['type'] == 'exploding':
@@ -244,16 +431,14 @@ class BrickBreakerGame:
 
     def trigger_explosion(self, center_x, center_y):
         """觸發爆炸效果，摧毀範圍內的磚塊"""
-        for i in range(len(self.bricks) -1, -1, -1): # 反向迭代以安全移除
-            brick = self.bricks[i]
-            if not brick['active']:
-                continue
-
+        radius = self.explosion_radius
+        # 只查詢爆炸範圍涵蓋的鄰近格子
+        for brick in self.brick_cells_in_box(center_x - radius, center_y - radius, center_x + radius, center_y + radius):
             dist_sq = (brick['rect'].centerx - center_x)**2 + (brick['rect'].centery - center_y)**2
             if dist_sq <= self.explosion_radius**2:
                 if brick['type'] != 'exploding': # 避免連鎖爆炸視覺/音效過多
                     self.score += 10 # 爆炸摧毀的磚塊給少量分數
-                brick['active'] = False # 標記為非活動，稍後移除
+                self.destroy_brick(brick) # 標記為非活動，稍後移除
 
     def spawn_power_up(self, x, y):
         """在指定位置生成一個隨機道具"""
@@ -307,11 +492,11 @@ class BrickBreakerGame:
                     # 理想情況是基於一個 'base_ball_speed' 調整
                     pass # 新的速度效果會覆蓋舊的
 
-    def update_active_power_ups(self):
-        """更新活動中道具效果的計時器，並在到期時恢復屬性"""
+    def update_active_power_ups(self, frames=1.0):
+        """更新活動中道具效果的計時器（以幀為單位），並在到期時恢復屬性"""
         keys_to_remove = []
         for effect_type, data in self.active_power_up_effects.items():
-            data["timer"] -= 1
+            data["timer"] -= frames
             if data["timer"] <= 0:
                 keys_to_remove.append(effect_type)
                 # 恢復屬性
@@ -336,6 +521,12 @@ class BrickBreakerGame:
     def create_bricks(self):
         """建立磚塊，包含顏色層次、不同耐久度和特殊磚塊。"""
         self.bricks = []
+        # 磚塊排在固定的行列格上：brick_grid[row][col] 指向該格的磚塊（沒有則為 None），
+        # 碰撞與爆炸只需查詢附近的格子
+        self.brick_origin_x = 50
+        self.brick_origin_y = 50
+        self.brick_grid = [[None] * self.brick_cols for _ in range(self.brick_rows)]
+        self.bricks_changed = False
         # (Pygame 顏色, 字串類型, 耐久度, 是否為特殊磚塊)
         # 調整定義，加入爆炸磚塊
         base_brick_definitions = [
@@ -378,8 +569,8 @@ class BrickBreakerGame:
                 brick_color, brick_type, brick_hits = base_brick_definitions[def_idx]
 
 
-            brick_x = 50 + col * (self.brick_width + self.brick_gap)
-            brick_y = 50 + row * (self.brick_height + self.brick_gap)
+            brick_x = self.brick_origin_x + col * (self.brick_width + self.brick_gap)
+            brick_y = self.brick_origin_y + row * (self.brick_height + self.brick_gap)
 
             brick = {
                 'x': brick_x, 'y': brick_y,
@@ -391,28 +582,43 @@ class BrickBreakerGame:
                 'active': True,
                 'total_hits': brick_hits,
                 'remaining_hits': brick_hits,
-                'is_exploding_visual': is_exploding # 用於渲染時的特殊標記
+                'is_exploding_visual': is_exploding, # 用於渲染時的特殊標記
+                'row': row, 'col': col
             }
             self.bricks.append(brick)
+            self.brick_grid[row][col] = brick
 
         # 確保至少有一個磚塊（如果上面邏輯有誤）
         if not self.bricks and self.brick_rows > 0 and self.brick_cols > 0:
              print("Warning: No bricks created, forcing one default brick.") # 開發時的警告
              brick_color, brick_type, brick_hits = base_brick_definitions[0]
-             brick_x = 50 + 0 * (self.brick_width + self.brick_gap)
-             brick_y = 50 + 0 * (self.brick_height + self.brick_gap)
+             brick_x = self.brick_origin_x + 0 * (self.brick_width + self.brick_gap)
+             brick_y = self.brick_origin_y + 0 * (self.brick_height + self.brick_gap)
              self.bricks.append({
                 'x': brick_x, 'y': brick_y,
                 'width': self.brick_width, 'height': self.brick_height,
                 'rect': pygame.Rect(brick_x, brick_y, self.brick_width, self.brick_height),
                 'original_color_tuple': brick_color, 'current_color_tuple': brick_color,
                 'type': brick_type, 'active': True, 'total_hits': brick_hits, 'remaining_hits': brick_hits,
-                'is_exploding_visual': False
+                'is_exploding_visual': False, 'row': 0, 'col': 0
             })
+             self.brick_grid[0][0] = self.bricks[-1]
+
 
+    def on_resume(self):
+        """主程式從暫停恢復時呼叫，暫停期間的時間不計入物理與道具計時。"""
+        self.last_update_time = None
 
     def update(self, controller_input=None):
         """更新遊戲狀態。"""
+        # 以真實經過時間驅動物理，換算成 60fps 的幀數
+        current_time = time.time()
+        if self.last_update_time is None:
+            self.last_update_time = current_time
+        delta_time = min(max(0.0, current_time - self.last_update_time), self.max_frame_time)
+        self.last_update_time = current_time
+        frames = delta_time * self.fps
+
         if self.game_over or self.paused:
             if controller_input and controller_input.get("start_pressed"):
                 if not hasattr(self, 'last_start_press_time') or time.time() - self.last_start_press_time > 0.5:
@@ -424,7 +630,7 @@ class BrickBreakerGame:
             return {"game_over": self.game_over, "score": self.score, "paused": self.paused, "level": self.current_level}
 
         # 更新活動中的道具效果
-        self.update_active_power_ups()
+        self.update_active_power_ups(frames)
 
         # 處理輸入
         if controller_input:
@@ -438,7 +644,7 @@ class BrickBreakerGame:
               # 應用搖桿移動（帶縮放）
             if abs(stick_x) > self.stick_threshold:
                 # 根據搖桿偏移縮放移動量
-                movement_amount = self.paddle_speed * (abs(stick_x) * self.stick_speed_multiplier)
+                movement_amount = self.paddle_speed * (abs(stick_x) * self.stick_speed_multiplier) * frames
                 if stick_x < -self.stick_threshold:  # 向左
                     self.paddle_x = max(0, self.paddle_x - movement_amount)
                 elif stick_x > self.stick_threshold:  # 向右
@@ -450,9 +656,9 @@ class BrickBreakerGame:
 
             # D-pad 輸入（保留原有邏輯，優先級較高）
             if controller_input.get("left_pressed"):
-                self.move_paddle("left")
+                self.move_paddle("left", frames)
             if controller_input.get("right_pressed"):
-                self.move_paddle("right")
+                self.move_paddle("right", frames)
 
             # 發射球
             if controller_input.get("a_pressed"):
@@ -464,141 +670,42 @@ class BrickBreakerGame:
                 if not hasattr(self, 'last_start_press_time') or time.time() - self.last_start_press_time > 0.5:
                     self.paused = not self.paused
                     self.last_start_press_time = time.time()
-                    if self.buzzer: self.buzzer.play_tone(frequency=500, duration=0.1)
+                    if self.buzzer: self.buzzer.play_tone(frequency=500, duration=0.1, category="ui")
                     return {"game_over": self.game_over, "score": self.score, "paused": self.paused, "level": self.current_level}
 
         if not self.ball_launched:
             self.ball_x = self.paddle_x + self.paddle_width // 2
             self.ball_y = self.paddle_y - self.ball_radius - 1
             # 更新道具位置
-            for power_up in self.power_ups: power_up.move()
+            for power_up in self.power_ups: power_up.move(frames)
             self.power_ups = [p for p in self.power_ups if p.active and p.rect.top < self.height]
 
             return {"game_over": self.game_over, "score": self.score, "paused": self.paused, "level": self.current_level}
 
-        ball_prev_x = self.ball_x
-        ball_prev_y = self.ball_y
-
-        self.ball_x += self.ball_dx
-        self.ball_y += self.ball_dy
-
-        # 牆壁碰撞
-        current_time = time.time()
-        wall_hit_sound_delay = 0.1
-        if self.ball_x <= self.ball_radius:
-            self.ball_x = self.ball_radius
-            self.ball_dx = -self.ball_dx
-            if self.buzzer and current_time - self.last_wall_hit_time > wall_hit_sound_delay:
-                self.buzzer.play_tone(frequency=250, duration=0.05)
-                self.last_wall_hit_time = current_time
-        elif self.ball_x >= self.width - self.ball_radius:
-            self.ball_x = self.width - self.ball_radius
-            self.ball_dx = -self.ball_dx
-            if self.buzzer and current_time - self.last_wall_hit_time > wall_hit_sound_delay:
-                self.buzzer.play_tone(frequency=250, duration=0.05)
-                self.last_wall_hit_time = current_time
-
-        if self.ball_y <= self.ball_radius:
-            self.ball_y = self.ball_radius
-            self.ball_dy = -self.ball_dy
-            if self.buzzer and current_time - self.last_wall_hit_time > wall_hit_sound_delay:
-                self.buzzer.play_tone(frequency=250, duration=0.05)
-                self.last_wall_hit_time = current_time
-
-        # 球未接住
-        if self.ball_y >= self.height - self.ball_radius:
+        # 球的移動：以連續碰撞檢測走完這次更新的時間，任何幀率與球速都不會穿透磚塊或板子
+        if self.move_ball(frames):
+            # 球未接住
             self.lives -= 1
             if self.buzzer: self.buzzer.play_tone(frequency=150, duration=0.5)
 
             if self.lives <= 0:
                 self.game_over = True
-                if self.buzzer: self.buzzer.play_tone(frequency=100, duration=1.0)
+                if self.buzzer: self.buzzer.play_tone(frequency=100, duration=1.0, category="game_over")
             else:
                 self.reset_game(new_level=False) # 重置球和板，但不重置關卡和分數
             return {"game_over": self.game_over, "score": self.score, "paused": self.paused, "level": self.current_level}
 
-        # 球與板碰撞
         paddle_rect = pygame.Rect(self.paddle_x, self.paddle_y, self.paddle_width, self.paddle_height)
-        ball_rect = pygame.Rect(self.ball_x - self.ball_radius, self.ball_y - self.ball_radius,
-                                self.ball_radius * 2, self.ball_radius * 2)
-
-        if ball_rect.colliderect(paddle_rect) and self.ball_dy > 0:
-            self.handle_ball_paddle_collision()
-
-        # 球與磚塊碰撞
-        collided_brick_this_frame = False
-        for i in range(len(self.bricks) -1, -1, -1): # 反向迭代以便安全操作（儘管移除在後面）
-            brick = self.bricks[i]
-            if not brick['active'] or collided_brick_this_frame:
-                continue
-
-            if ball_rect.colliderect(brick['rect']):
-                self.handle_ball_brick_collision(i) # 傳遞索引
-                collided_brick_this_frame = True # 每幀只處理一次磚塊碰撞，避免多次反彈
-
-                # --- 改進的磚塊反彈邏輯 ---
-                time_to_coll_x = float('inf')
-                if self.ball_dx > 0:
-                    if ball_prev_x + self.ball_radius <= brick['rect'].left : # 確保是從外部碰撞
-                       time_to_coll_x = (brick['rect'].left - (ball_prev_x + self.ball_radius)) / self.ball_dx if self.ball_dx != 0 else float('inf')
-                elif self.ball_dx < 0:
-                    if ball_prev_x - self.ball_radius >= brick['rect'].right:
-                       time_to_coll_x = (brick['rect'].right - (ball_prev_x - self.ball_radius)) / self.ball_dx if self.ball_dx != 0 else float('inf')
-
-                time_to_coll_y = float('inf')
-                if self.ball_dy > 0:
-                    if ball_prev_y + self.ball_radius <= brick['rect'].top:
-                       time_to_coll_y = (brick['rect'].top - (ball_prev_y + self.ball_radius)) / self.ball_dy if self.ball_dy != 0 else float('inf')
-                elif self.ball_dy < 0:
-                    if ball_prev_y - self.ball_radius >= brick['rect'].bottom:
-                       time_to_coll_y = (brick['rect'].bottom - (ball_prev_y - self.ball_radius)) / self.ball_dy if self.ball_dy != 0 else float('inf')
-
-                time_to_coll_x = max(0, time_to_coll_x if time_to_coll_x is not None else float('inf'))
-                time_to_coll_y = max(0, time_to_coll_y if time_to_coll_y is not None else float('inf'))
-
-                # 檢查碰撞是否發生在當前影格內 (時間 < 1.0)
-                # 且球是朝向磚塊移動的
-                if time_to_coll_x < time_to_coll_y and time_to_coll_x < 1.0 :
-                    original_dx = self.ball_dx
-                    self.ball_dx = -self.ball_dx
-                    if original_dx > 0: # 向右移動，撞到左邊
-                         self.ball_x = brick['rect'].left - self.ball_radius - 0.1
-                    else: # 向左移動，撞到右邊
-                         self.ball_x = brick['rect'].right + self.ball_radius + 0.1
-                elif time_to_coll_y < time_to_coll_x and time_to_coll_y < 1.0:
-                    original_dy = self.ball_dy
-                    self.ball_dy = -self.ball_dy
-                    if original_dy > 0: # 向下移動，撞到頂部
-                        self.ball_y = brick['rect'].top - self.ball_radius - 0.1
-                    else: # 向上移動，撞到底部
-                        self.ball_y = brick['rect'].bottom + self.ball_radius + 0.1
-                else: # 角落碰撞或同時碰撞 - 簡單回退
-                    # 如果球卡住了，這個回退可能不夠完美
-                    overlap_x = (self.ball_radius + brick['rect'].width / 2) - abs(self.ball_x - brick['rect'].centerx)
-                    overlap_y = (self.ball_radius + brick['rect'].height / 2) - abs(self.ball_y - brick['rect'].centery)
-
-                    # 檢查球的先前位置是否已經在磚塊內，避免錯誤反彈
-                    was_inside_x = ball_prev_x > brick['rect'].left and ball_prev_x < brick['rect'].right
-                    was_inside_y = ball_prev_y > brick['rect'].top and ball_prev_y < brick['rect'].bottom
-
-                    if not (was_inside_x and was_inside_y): # 只有當球不是從內部開始時才進行簡單反彈
-                        if overlap_x < overlap_y :
-                            if (self.ball_y < brick['rect'].centery and self.ball_dy > 0) or \
-                               (self.ball_y > brick['rect'].centery and self.ball_dy < 0):
-                                self.ball_dy = -self.ball_dy
-                        else:
-                            if (self.ball_x < brick['rect'].centerx and self.ball_dx > 0) or \
-                               (self.ball_x > brick['rect'].centerx and self.ball_dx < 0):
-                                self.ball_dx = -self.ball_dx
-                break
 
-        # 移除非活動的磚塊
-        self.bricks = [b for b in self.bricks if b['active']]
+        # 移除非活動的磚塊 (只在這一幀有磚塊被摧毀時才重建清單)
+        if self.bricks_changed:
+            self.bricks = [b for b in self.bricks if b['active']]
+            self.bricks_changed = False
 
         # 更新和處理道具
         for p_idx in range(len(self.power_ups) -1, -1, -1):
             power_up = self.power_ups[p_idx]
-            power_up.move()
+            power_up.move(frames)
             if power_up.rect.colliderect(paddle_rect):
                 self.apply_power_up_effect(power_up)
                 power_up.active = False # 標記為非活動
@@ -612,9 +719,7 @@ class BrickBreakerGame:
             self.score += 100 * self.current_level # 過關獎勵隨關卡增加
             self.reset_game(new_level=True) # 進入下一關
             if self.buzzer:
-                for freq in [600, 750, 900, 1050]:
-                    self.buzzer.play_tone(frequency=freq, duration=0.06)
-                    time.sleep(0.04)
+                self.buzzer.play_tone("level_clear")
 
         return {"game_over": self.game_over, "score": self.score, "paused": self.paused, "level": self.current_level}
 
@@ -659,7 +764,7 @@ class BrickBreakerGame:
                     # 從 effect_type_full (e.g., PADDLE_GROW_1622...) 提取基礎類型 PADDLE_GROW
                     base_effect_type = "_".join(effect_type_full.split('_')[:2]) if len(effect_type_full.split('_')) > 1 else effect_type_full
 
-                    effect_text = f"{base_effect_type}: {data['timer'] // self.fps + 1}s"
+                    effect_text = f"{base_effect_type}: {int(data['timer'] // self.fps) + 1}s"
                     color_to_use = self.WHITE # 預設顏色
                     if base_effect_type in self.power_up_definitions:
                         color_to_use = self.power_up_definitions[base_effect_type]["color"]
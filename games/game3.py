@@ -8,6 +8,8 @@ import pygame
 import time
 from pygame.locals import *
 
+from object_pool import ObjectPool
+
 class SpaceInvadersGame:
     """Space Invaders Game Class (Enhanced)"""
     # 太空侵略者遊戲類別（增強版）
@@ -76,6 +78,10 @@ class SpaceInvadersGame:
         # 初始化遊戲狀態
         self.shot_delay_normal = 0.5  # 正常射擊間隔 (秒)
         self.shot_delay_rapid_fire = 0.15 # 快速射擊間隔
+
+        # 子彈物件池：預先建立固定數量的 Rect 重複使用，發射/消失不產生新物件，移除為 O(1)
+        self.bullets = ObjectPool(64, lambda: pygame.Rect(0, 0, self.bullet_width, self.bullet_height))
+        self.enemy_bullets = ObjectPool(64, lambda: pygame.Rect(0, 0, self.enemy_bullet_width, self.enemy_bullet_height))
         self.reset_game()
 
     def reset_game(self):
@@ -83,8 +89,8 @@ class SpaceInvadersGame:
         self.player_x = (self.width - self.player_width) // 2
         self.player_y = self.height - 60 # 調整玩家Y軸起始位置
 
-        self.bullets = []
-        self.enemy_bullets = []
+        self.bullets.clear()
+        self.enemy_bullets.clear()
         self.enemies = []
         self.enemy_direction = 1 # 敵人移動方向，1為右，-1為左
         self.enemy_speed_x = self.enemy_speed_x_initial
@@ -200,7 +206,9 @@ class SpaceInvadersGame:
             # 子彈從玩家飛船中央頂部射出
             bullet_x = self.player_x + (self.player_width // 2) - (self.bullet_width // 2)
             bullet_y = self.player_y
-            self.bullets.append(pygame.Rect(bullet_x, bullet_y, self.bullet_width, self.bullet_height))
+            handle = self.bullets.acquire() # 物件池已滿時不發射新子彈
+            if handle is not None:
+                self.bullets[handle].topleft = (bullet_x, bullet_y)
             self.last_shot_time = current_time # 更新上次射擊時間
             if self.buzzer:
                 self.buzzer.play_tone(frequency=1000, duration=0.05) # 玩家射擊音效
@@ -224,7 +232,9 @@ class SpaceInvadersGame:
                     # 子彈從選定敵人的中央底部射出
                     bullet_x = shooter['rect'].centerx - (self.enemy_bullet_width // 2)
                     bullet_y = shooter['rect'].bottom
-                    self.enemy_bullets.append(pygame.Rect(bullet_x, bullet_y, self.enemy_bullet_width, self.enemy_bullet_height))
+                    handle = self.enemy_bullets.acquire()
+                    if handle is not None:
+                        self.enemy_bullets[handle].topleft = (bullet_x, bullet_y)
                     # 可在此添加敵人射擊音效
                     if self.buzzer: self.buzzer.play_tone(frequency=300, duration=0.08) # 敵人射擊音效
 
@@ -232,16 +242,16 @@ class SpaceInvadersGame:
     def update_bullets(self):
         """更新所有子彈位置並移除螢幕外的子彈"""
         # 更新玩家子彈 (向上移動)
-        for bullet in self.bullets[:]: # 使用切片副本以安全移除
+        for handle, bullet in self.bullets.items(): # 物件池允許在迭代中釋放
             bullet.y -= self.bullet_speed
             if bullet.bottom < 0: # 如果子彈超出螢幕頂部
-                self.bullets.remove(bullet)
+                self.bullets.release(handle)
 
         # 更新敵人子彈 (向下移動)
-        for bullet in self.enemy_bullets[:]: # 使用切片副本以安全移除
+        for handle, bullet in self.enemy_bullets.items():
             bullet.y += self.enemy_bullet_speed
             if bullet.top > self.height: # 如果子彈超出螢幕底部
-                self.enemy_bullets.remove(bullet)
+                self.enemy_bullets.release(handle)
 
     def update_enemies(self):
         """更新敵人位置，處理邊界碰撞和觸底"""
@@ -323,10 +333,10 @@ class SpaceInvadersGame:
     def check_collisions(self):
         """檢查各種碰撞"""
         # 玩家子彈 vs 敵人
-        for bullet in self.bullets[:]:
-            for enemy in self.enemies[:]:
+        for handle, bullet in self.bullets.items():
+            for enemy in self.enemies: # 移除敵人後立即 break，不需要複製列表
                 if bullet.colliderect(enemy['rect']): # 如果子彈碰到敵人
-                    if bullet in self.bullets: self.bullets.remove(bullet) # 移除子彈
+                    self.bullets.release(handle) # 移除子彈
                     enemy['health'] -= 1 # 敵人生命值減少
                     if enemy['health'] <= 0: # 如果敵人生命值耗盡
                         self.enemies.remove(enemy) # 移除敵人
@@ -336,7 +346,7 @@ class SpaceInvadersGame:
 
             # 玩家子彈 vs UFO
             if self.ufo_active and self.ufo and bullet.colliderect(self.ufo['rect']): # 如果子彈碰到UFO
-                if bullet in self.bullets: self.bullets.remove(bullet) # 移除子彈
+                self.bullets.release(handle) # 移除子彈 (已釋放的 handle 不會重複釋放)
                 self.score += self.ufo['score'] # 增加UFO分數
                 if self.buzzer:
                     self.buzzer.play_tone(frequency=1200, duration=0.3) # UFO被擊中音效
@@ -356,22 +366,22 @@ class SpaceInvadersGame:
 
         # 敵人子彈 vs 玩家
         player_rect = pygame.Rect(self.player_x, self.player_y, self.player_width, self.player_height) # 玩家的矩形區域
-        for bullet in self.enemy_bullets[:]:
+        for handle, bullet in self.enemy_bullets.items():
             if bullet.colliderect(player_rect): # 如果敵人子彈碰到玩家
-                self.enemy_bullets.remove(bullet) # 移除子彈
+                self.enemy_bullets.release(handle) # 移除子彈
                 self.lives -= 1 # 玩家生命值減少
                 if self.buzzer: self.buzzer.play_tone(frequency=200, duration=0.2) # 玩家被擊中音效
                 if self.lives <= 0: # 如果生命值耗盡
                     self.game_over = True # 遊戲結束
-                    if self.buzzer: self.buzzer.play_tone(frequency=100, duration=0.5) # 遊戲結束音效
+                    if self.buzzer: self.buzzer.play_tone(frequency=100, duration=0.5, category="game_over") # 遊戲結束音效
                 return # 避免一幀內多次受傷判定
 
         # 子彈 (玩家和敵人) vs 掩體
-        for bullet_list in [self.bullets, self.enemy_bullets]: # 遍歷玩家子彈列表和敵人子彈列表
-            for bullet in bullet_list[:]:
-                for block in self.barrier_blocks[:]:
+        for bullet_pool in [self.bullets, self.enemy_bullets]: # 遍歷玩家子彈與敵人子彈物件池
+            for handle, bullet in bullet_pool.items():
+                for block in self.barrier_blocks: # 移除方塊後立即 break，不需要複製列表
                     if bullet.colliderect(block['rect']): # 如果子彈碰到掩體方塊
-                        if bullet in bullet_list: bullet_list.remove(bullet) # 移除子彈
+                        bullet_pool.release(handle) # 移除子彈
                         block['health'] -= 1 # 掩體方塊生命值減少
                         if block['health'] <= 0: # 如果掩體方塊生命值耗盡
                             self.barrier_blocks.remove(block) # 移除掩體方塊
@@ -410,7 +420,7 @@ class SpaceInvadersGame:
                  self.active_power_up_type = None
                  self.power_up_timer = 0
 
-            if self.buzzer: self.buzzer.play_tone(frequency=700, duration=0.4) # 過關音效
+            if self.buzzer: self.buzzer.play_tone(frequency=700, duration=0.4, category="level_up") # 過關音效
 
     def update(self, controller_input=None):
         """更新遊戲狀態"""
@@ -465,7 +475,7 @@ class SpaceInvadersGame:
                  if not hasattr(self, 'last_start_press_time') or time.time() - self.last_start_press_time > 0.5:
                     self.paused = not self.paused # 切換暫停狀態
                     self.last_start_press_time = time.time()
-                    if self.buzzer: self.buzzer.play_tone(frequency=400, duration=0.1) # 暫停音效
+                    if self.buzzer: self.buzzer.play_tone(frequency=400, duration=0.1, category="ui") # 暫停音效
                     return {"game_over": self.game_over, "score": self.score, "paused": self.paused, "wave": self.wave}
         
         # 遊戲邏輯更新
@@ -605,7 +615,7 @@ if __name__ == "__main__":
 
         # 簡易 Buzzer 模擬 (用於測試，實際應傳入真實的 Buzzer 物件)
         class MockBuzzer:
-            def play_tone(self, frequency=None, duration=None):
+            def play_tone(self, sound_name=None, frequency=None, duration=None, category=None):
                 # 模擬播放音效的行為，實際應用中會與硬體互動
                 if frequency and duration:
                     print(f"Buzzer 模擬: 播放音調 freq={frequency}, dur={duration}")
@@ -56,6 +56,10 @@ class TicTacToeGame:
         self.score_o = 0
         self.score_draw = 0
 
+        # 矩陣鍵盤 (由主程式透過 attach_keypad 提供，雙人模式下作為玩家2的控制器)
+        self.keypad = None
+        self.keypad_cells = [] # (按鍵 bit, row, col)
+
         # 初始化遊戲狀態
         self.reset_game()
 
@@ -86,6 +90,24 @@ class TicTacToeGame:
         self.computer_delay = 0.7  # 電腦思考延遲 (秒)
         self.computer_last_move_time = 0 # 電腦上次移動時間，用於控制電腦移動頻率
 
+    def attach_keypad(self, keypad):
+        """使用矩陣鍵盤的 1-9 對應棋盤九宮格 (與鍵盤上的排列相同)"""
+        self.keypad = keypad
+        self.keypad_cells = []
+        for i, key in enumerate("123456789"):
+            bit = keypad.key_bits.get(key)
+            if bit:
+                self.keypad_cells.append((bit, i // 3, i % 3))
+        keypad.poll() # 以目前狀態為基準，避免進入遊戲前就按住的鍵被當成新按下
+
+    def handle_keypad_move(self, pressed_mask):
+        """處理矩陣鍵盤新按下的按鍵，成功下棋時返回 True"""
+        for bit, row, col in self.keypad_cells:
+            if pressed_mask & bit:
+                self.cursor_row, self.cursor_col = row, col
+                return self.make_move(row, col)
+        return False
+
     def make_move(self, row, col):
         """玩家或電腦下棋"""
         if self.board[row][col] != 0: # 如果格子已被佔據
@@ -103,12 +125,12 @@ class TicTacToeGame:
             self.game_over = True
             self.winner = self.current_player
             self.update_score()
-            if self.buzzer: self.buzzer.play_tone(frequency=1000, duration=0.5) # 勝利音效
+            if self.buzzer: self.buzzer.play_tone(frequency=1000, duration=0.5, category="level_up") # 勝利音效
         elif self.check_draw():
             self.game_over = True
             self.winner = 0 # 0 代表平手
             self.update_score()
-            if self.buzzer: self.buzzer.play_tone(frequency=400, duration=0.8) # 平手音效
+            if self.buzzer: self.buzzer.play_tone(frequency=400, duration=0.8, category="level_up") # 平手音效
         else:
             # 切換玩家
             self.current_player = 2 if self.current_player == 1 else 1
@@ -242,6 +264,7 @@ class TicTacToeGame:
     def update(self, controller_input=None):
         """更新遊戲狀態"""
         current_time = time.time()
+        keypad_state = self.keypad.poll() if self.keypad else None # 每幀都 poll，讓按鍵邊緣保持同步
 
         if self.game_over: # 如果遊戲已結束
             if controller_input and controller_input.get("start_pressed"):
@@ -257,6 +280,12 @@ class TicTacToeGame:
         if self.vs_computer and self.current_player == 2 and not self.game_over:
             self.computer_move() # AI下棋
 
+        # 雙人模式輪到 O 時，矩陣鍵盤 1-9 直接下在對應的格子
+        if keypad_state and keypad_state.pressed and not self.vs_computer and self.current_player == 2:
+            if self.handle_keypad_move(keypad_state.pressed):
+                self.last_input_time = current_time
+                return {"game_over": self.game_over, "winner": self.winner, "scores": self.get_scores()}
+
         # 處理玩家輸入 (人機模式下只有玩家1可以輸入，雙人模式下兩個玩家都可以輸入)
         if not (self.vs_computer and self.current_player == 2):
             # Initialize left stick parameters if not exists
@@ -377,7 +406,7 @@ class TicTacToeGame:
                         
                         if moved_cursor:
                             self.last_input_time = current_time
-                            if self.buzzer: self.buzzer.play_tone(frequency=250, duration=0.05)
+                            if self.buzzer: self.buzzer.play_tone(frequency=250, duration=0.05, category="ui")
                     self.last_stick_direction = current_stick_direction # Update regardless of movement for continuous check
 
                     # D-pad input (takes priority if stick didn't move cursor, or if stick not used)
@@ -391,7 +420,7 @@ class TicTacToeGame:
                         if dpad_moved:
                             moved_cursor = True # Mark that cursor moved for this update cycle
                             self.last_input_time = current_time
-                            if self.buzzer: self.buzzer.play_tone(frequency=250, duration=0.05)
+                            if self.buzzer: self.buzzer.play_tone(frequency=250, duration=0.05, category="ui")
 
                     # Action button (A)
                     if controller_input.get("a_pressed"):
@@ -500,6 +529,8 @@ class TicTacToeGame:
             "PRESS Y: CHANGE MODE", # 修改點: PREE -> PRESS, 移除多餘空格
             "PRESS START: RESET GAME",
         ]
+        if self.keypad and not self.vs_computer:
+            hint_text_lines.insert(2, "KEYPAD 1-9: PLAYER2 (O) MOVE")
         hint_y_start = self.height - 30 - (len(hint_text_lines) * (self.font_small.get_height() + 2))
 
         for i, line in enumerate(hint_text_lines):
@@ -554,7 +585,7 @@ if __name__ == "__main__":
 
         # 簡易 Buzzer 模擬
         class MockBuzzer:
-            def play_tone(self, frequency=None, duration=None, sound_name=None):
+            def play_tone(self, frequency=None, duration=None, sound_name=None, category=None):
                 if sound_name:
                     print(f"Buzzer 模擬: 播放 '{sound_name}'")
                 elif frequency and duration:
@@ -7,6 +7,8 @@ import time
 import math
 from pygame.locals import *
 
+from particles import ParticleSystem
+
 class MemoryMatchGame:
     """Memory Match Game Class (Enhanced)"""
 
@@ -78,7 +80,7 @@ class MemoryMatchGame:
         self.input_delay = 0.2 # Slightly reduced delay for responsiveness
         self.flip_animation_duration = 0.4 # Duration for card flip animation
 
-        self.particles = []
+        self.particles = ParticleSystem(capacity=128, min_radius=2)
         self.match_effect_timer = 0
         self.flip_back_timer_start = 0 # Renamed for clarity
         self.flip_back_active = False
@@ -217,7 +219,7 @@ class MemoryMatchGame:
 
         self.last_input_time = time.time() # Prevent immediate input processing after reset
 
-        self.particles = []
+        self.particles.clear()
         self.match_effect_timer = 0
         self.flip_back_active = False
         self.flip_back_timer_start = 0
@@ -331,24 +333,10 @@ class MemoryMatchGame:
 
     def create_match_particles(self, card):
         rect = self.get_card_rect(card)
-        center_x, center_y = rect.centerx, rect.centery
-        for _ in range(15): # More particles
-            particle = {
-                'x': center_x, 'y': center_y,
-                'vx': random.uniform(-150, 150), 'vy': random.uniform(-200, -50), # More upward burst
-                'life': random.uniform(0.5, 1.2), 'color': card['color'],
-                'size': random.uniform(4, 10)
-            }
-            self.particles.append(particle)
+        self.particles.emit('memory_match', rect.centerx, rect.centery, card['color'])
 
     def update_particles(self, delta_time):
-        for p in self.particles[:]:
-            p['x'] += p['vx'] * delta_time
-            p['y'] += p['vy'] * delta_time
-            p['vy'] += 300 * delta_time  # Stronger gravity
-            p['life'] -= delta_time
-            if p['life'] <= 0:
-                self.particles.remove(p)
+        self.particles.update(delta_time)
 
     def _process_menu_selection(self):
         selected = self.menu_options[self.menu_selected_option]
@@ -548,35 +536,8 @@ class MemoryMatchGame:
             self.draw_game_over_screen(screen)
 
     def draw_particles(self, screen):
-        for particle in self.particles:
-            if particle['life'] > 0:
-                # 計算 alpha 值 (0-255)
-                alpha = int(particle['life'] * 255)
-                alpha = max(0, min(255, alpha))  # 確保在有效範圍內
-                
-                # 計算粒子大小
-                size = max(2, int(6 * particle['life']))
-                
-                # 確保顏色是有效的 RGB 格式
-                color = particle['color']
-                if len(color) == 3:  # RGB 格式
-                    r, g, b = color
-                elif len(color) == 4:  # RGBA 格式，取前三個值
-                    r, g, b = color[:3]
-                else:
-                    r, g, b = 255, 255, 255  # 預設白色
-                
-                # 創建帶有 alpha 的表面
-                particle_surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                
-                # 使用 RGB 顏色繪製圓形
-                pygame.draw.circle(particle_surf, (r, g, b), (size, size), size)
-                
-                # 設置整個表面的 alpha
-                particle_surf.set_alpha(alpha)
-                
-                # 繪製到螢幕上
-                screen.blit(particle_surf, (int(particle['x'] - size), int(particle['y'] - size)))
+        # 粒子由共用的粒子引擎以一次批次繪製
+        self.particles.draw(screen)
 
     def draw_hud(self, screen, is_showing_all, current_time):
         score_text = self.font_medium.render(f"Score: {self.score}", True, self.WHITE)
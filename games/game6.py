@@ -192,11 +192,8 @@ class SimpleMazeGame:
                         
                         # Play victory sound effect
                         if self.buzzer:
-                            # Enhanced victory sound sequence
-                            victory_notes = [523, 659, 784, 1047, 1319]  # C major scale ascending
-                            for note in victory_notes:
-                                self.buzzer.play_tone(frequency=note, duration=0.2)
-                                time.sleep(0.1)
+                            # Enhanced victory sound sequence (C major scale ascending)
+                            self.buzzer.play_tone("maze_exit")
                         
                         # Generate new, more complex maze
                         self.generate_maze()
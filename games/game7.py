@@ -206,7 +206,7 @@ class WhacAMoleGame:
             
             # Play game over sound
             if self.buzzer:
-                self.buzzer.play_tone(frequency=200, duration=0.5)
+                self.buzzer.play_tone(frequency=200, duration=0.5, category="game_over")
             
             return {"game_over": True, "score": self.score}
         
@@ -305,7 +305,7 @@ class WhacAMoleGame:
                 if input_detected:
                     self.last_input_time = current_time
                     if self.buzzer:
-                        self.buzzer.play_tone(frequency=300, duration=0.05)
+                        self.buzzer.play_tone(frequency=300, duration=0.05, category="ui")
             
             # 攻擊輸入處理（立即響應，無延遲）
             if controller_input.get("a_pressed") and not self.hammer_active:
@@ -461,7 +461,7 @@ if __name__ == "__main__":
         
         # Simple Buzzer simulation (for testing, actual should pass in real Buzzer object)
         class MockBuzzer:
-            def play_tone(self, frequency=None, duration=None):
+            def play_tone(self, frequency=None, duration=None, category=None):
                 print(f"Buzzer: freq={frequency}, dur={duration}")
         
         # Create game instance
@@ -316,11 +316,8 @@ class TetrisLikeGame:
         
         # Enhanced audio system
         if self.buzzer:
-            # Play level up sound effect sequence
-            frequencies = [523, 659, 784, 1047]  # C5, E5, G5, C6
-            for freq in frequencies:
-                self.buzzer.play_tone(frequency=freq, duration=0.15)
-                time.sleep(0.05)
+            # Play level up sound effect sequence (C5, E5, G5, C6)
+            self.buzzer.play_tone("level_up")
     
     def clear_lines(self, lines_to_clear):
         """Clear full lines with enhanced visual and audio effects"""
@@ -8,6 +8,14 @@ import time
 import math
 from pygame.locals import *
 
+from particles import ParticleSystem
+
+try:
+    # Available when run from the console (repository root on sys.path)
+    from gamepad_input import JoystickDeviceSampler, XboxController
+except ImportError:
+    JoystickDeviceSampler = None
+
 class ReactionTestGame:
     """Enhanced Reaction Test Game Class"""
     
@@ -75,9 +83,72 @@ class ReactionTestGame:
             }
         ]
         
+        # High-resolution timing: presses are stamped by sampling threads (joystick
+        # device / matrix keypad) and the signal onset at display flip, all with perf_counter_ns
+        self.high_resolution = False
+        self.joystick_sampler = None
+        self.joystick_id = 0  # Joystick device to sample; set by attach_controller
+        self.keypad = None
+        self.start_high_resolution()
+        
         # Initialize game state
         self.reset_game()
     
+    def start_high_resolution(self):
+        """Enable high-resolution reaction timing"""
+        self.high_resolution = True
+        if JoystickDeviceSampler and not self.joystick_sampler:
+            sampler = JoystickDeviceSampler(joystick_id=self.joystick_id, buttons=[XboxController.BUTTON_A])
+            if sampler.start():
+                self.joystick_sampler = sampler
+        if self.keypad:
+            self.keypad.set_high_resolution(True)
+    
+    def stop_high_resolution(self):
+        """Fall back to frame-sampled reaction timing"""
+        self.high_resolution = False
+        if self.joystick_sampler:
+            self.joystick_sampler.stop()
+            self.joystick_sampler = None
+        if self.keypad:
+            self.keypad.set_high_resolution(False)
+    
+    def attach_controller(self, controller):
+        """Sample the joystick device of the controller the console actually uses"""
+        if controller.joystick_id == self.joystick_id:
+            return
+        self.joystick_id = controller.joystick_id
+        if self.joystick_sampler:
+            self.joystick_sampler.stop()
+            self.joystick_sampler = None
+        if self.high_resolution:
+            self.start_high_resolution()
+    
+    def attach_keypad(self, keypad):
+        """Any matrix keypad key also works as a (timestamped) reaction button"""
+        self.keypad = keypad
+        keypad.poll()  # Ignore keys already held when the game starts
+        if self.high_resolution:
+            keypad.set_high_resolution(True)
+    
+    def on_frame_presented(self, timestamp_ns):
+        """Called right after pygame.display.flip(); stamps the actual signal onset"""
+        if self.state == 'signal' and self.signal_onset_ns is None:
+            self.signal_onset_ns = timestamp_ns
+            self.display_latencies.append((timestamp_ns - self.signal_request_ns) / 1e6)
+    
+    def poll_timed_presses(self):
+        """Capture timestamps (perf_counter_ns) of reaction presses since the last frame"""
+        presses = []
+        if self.joystick_sampler:
+            presses.extend(timestamp for _, timestamp in self.joystick_sampler.get_presses())
+        if self.keypad:
+            keypad_state = self.keypad.poll()
+            if keypad_state.pressed:
+                presses.append(keypad_state.timestamp)
+        presses.sort()
+        return presses
+    
     def reset_game(self):
         """Reset game state"""
         # Game status
@@ -88,6 +159,8 @@ class ReactionTestGame:
         
         # Test data
         self.reaction_times = []
+        self.display_latencies = []  # Signal trigger -> display flip (ms)
+        self.input_latencies = []    # Press capture -> processed by the game (ms)
         self.false_starts = 0     # False start count
         self.missed_signals = 0   # Missed signals count
         self.correct_responses = 0 # Correct response count
@@ -95,6 +168,8 @@ class ReactionTestGame:
         # State control
         self.state = 'menu'  # menu, instructions, waiting, signal, result, game_over
         self.signal_start_time = 0
+        self.signal_request_ns = 0     # perf_counter_ns when the signal was triggered
+        self.signal_onset_ns = None    # perf_counter_ns of the flip that first showed it
         self.wait_start_time = 0
         self.signal_position = (self.width // 2, self.height // 2)
         self.current_signal_color = self.GREEN
@@ -107,7 +182,7 @@ class ReactionTestGame:
         # Animation effects
         self.signal_pulse = 0
         self.background_flash = 0
-        self.particles = []
+        self.particles = ParticleSystem(capacity=128)
         
         # Statistical analysis
         self.session_start_time = time.time()
@@ -164,6 +239,8 @@ class ReactionTestGame:
         """Display signal"""
         self.state = 'signal'
         self.signal_start_time = time.time()
+        self.signal_request_ns = time.perf_counter_ns()
+        self.signal_onset_ns = None
         self.signal_pulse = 0
         
         # Play audio (audio-visual reaction mode)
@@ -176,23 +253,16 @@ class ReactionTestGame:
     
     def create_signal_particles(self):
         """Create signal particle effects"""
-        for _ in range(8):
-            particle = {
-                'x': self.signal_position[0],
-                'y': self.signal_position[1],
-                'vx': random.uniform(-100, 100),
-                'vy': random.uniform(-100, 100),
-                'life': 1.0,
-                'color': self.current_signal_color,
-                'size': random.uniform(3, 8)
-            }
-            self.particles.append(particle)
+        self.particles.emit('reaction_signal', self.signal_position[0], self.signal_position[1],
+                            self.current_signal_color)
     
-    def handle_response(self):
-        """Handle player response"""
+    def handle_response(self, press_ns=None):
+        """Handle player response (press_ns: capture timestamp from a high-resolution source)"""
         current_time = time.time()
+        onset_ns = self.signal_onset_ns or self.signal_request_ns
         
-        if self.state == 'waiting':
+        if self.state == 'waiting' or (self.state == 'signal' and press_ns is not None and press_ns < onset_ns):
+            # Pressed before the signal was actually on screen
             # False start
             self.false_starts += 1
             self.background_flash = 10
@@ -211,7 +281,11 @@ class ReactionTestGame:
                     self.buzzer.play_tone(frequency=300, duration=0.5)
             else:
                 # Correct response
-                reaction_time = (current_time - self.signal_start_time) * 1000  # Convert to milliseconds
+                if press_ns is not None:
+                    reaction_time = (press_ns - onset_ns) / 1e6  # Convert to milliseconds
+                    self.input_latencies.append((time.perf_counter_ns() - press_ns) / 1e6)
+                else:
+                    reaction_time = (current_time - self.signal_start_time) * 1000  # Convert to milliseconds
                 self.reaction_times.append(reaction_time)
                 self.correct_responses += 1
                 
@@ -233,19 +307,7 @@ class ReactionTestGame:
     
     def create_success_particles(self):
         """Create success reaction particle effects"""
-        for _ in range(15):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(50, 150)
-            particle = {
-                'x': self.signal_position[0],
-                'y': self.signal_position[1],
-                'vx': math.cos(angle) * speed,
-                'vy': math.sin(angle) * speed,
-                'life': 1.5,
-                'color': self.YELLOW,
-                'size': random.uniform(2, 6)
-            }
-            self.particles.append(particle)
+        self.particles.emit('reaction_success', self.signal_position[0], self.signal_position[1], self.YELLOW)
     
     def finish_mode(self):
         """Complete current mode"""
@@ -269,7 +331,7 @@ class ReactionTestGame:
             return {}
         
         times = self.reaction_times
-        return {
+        stats = {
             'count': len(times),
             'average': sum(times) / len(times),
             'fastest': min(times),
@@ -277,6 +339,11 @@ class ReactionTestGame:
             'median': sorted(times)[len(times) // 2],
             'consistency': max(times) - min(times) if len(times) > 1 else 0
         }
+        if self.display_latencies:
+            stats['display_latency'] = sum(self.display_latencies) / len(self.display_latencies)
+        if self.input_latencies:
+            stats['input_latency'] = sum(self.input_latencies) / len(self.input_latencies)
+        return stats
     
     def get_performance_rating(self, avg_time):
         """Rate performance based on average reaction time"""
@@ -293,17 +360,13 @@ class ReactionTestGame:
     
     def update_particles(self, delta_time):
         """Update particle effects"""
-        for particle in self.particles[:]:
-            particle['x'] += particle['vx'] * delta_time
-            particle['y'] += particle['vy'] * delta_time
-            particle['life'] -= delta_time
-            particle['vy'] += 200 * delta_time  # Gravity effect
-            
-            if particle['life'] <= 0:
-                self.particles.remove(particle)
+        self.particles.update(delta_time)
     
     def update(self, controller_input=None):
         """Update game state"""
+        # Drain timestamped presses every frame so stale ones never count later
+        timed_presses = self.poll_timed_presses()
+        
         if self.game_over or self.paused:
             if controller_input and controller_input.get("start_pressed"):
                 if self.game_over:
@@ -336,7 +399,8 @@ class ReactionTestGame:
             # A button - Reaction button
             if controller_input.get("a_pressed"):
                 if self.state in ['waiting', 'signal']:
-                    self.handle_response()
+                    if not self.joystick_sampler:  # Otherwise the sampler reports this press
+                        self.handle_response()
                 elif self.state == 'menu':
                     self.start_test()
                 elif self.state == 'instructions':
@@ -386,11 +450,21 @@ class ReactionTestGame:
                     if self.buzzer:
                         self.buzzer.play_tone(frequency=400, duration=0.05)
             
+            # X button - Toggle high-resolution timing
+            if controller_input.get("x_pressed") and self.state == 'menu':
+                if self.high_resolution:
+                    self.stop_high_resolution()
+                else:
+                    self.start_high_resolution()
+            
             # Pause control
             if controller_input.get("start_pressed"):
                 self.paused = not self.paused
                 return {"game_over": self.game_over, "paused": self.paused}
         
+        if timed_presses and self.state in ['waiting', 'signal']:
+            self.handle_response(timed_presses[0])
+        
         # State machine logic
         if self.state == 'waiting':
             if current_time - self.wait_start_time >= self.wait_time:
@@ -468,6 +542,19 @@ class ReactionTestGame:
         # Control hints
         hint_text = font_small.render("Use arrow keys to select mode, A to start, B to exit", True, self.WHITE)
         screen.blit(hint_text, (self.width // 2 - hint_text.get_width() // 2, self.height - 80))
+        
+        # Timing mode
+        if self.high_resolution and (self.joystick_sampler or self.keypad):
+            sources = [self.joystick_sampler.device_path] if self.joystick_sampler else []
+            if self.keypad:
+                sources.append("keypad")
+            timing_text, timing_color = f"X: Hi-Res timing ON ({', '.join(sources)})", self.GREEN
+        elif self.high_resolution:
+            timing_text, timing_color = "X: Hi-Res timing (no sampler)", self.ORANGE
+        else:
+            timing_text, timing_color = "X: Hi-Res timing OFF", self.GRAY
+        timing_surf = font_small.render(timing_text, True, timing_color)
+        screen.blit(timing_surf, (self.width // 2 - timing_surf.get_width() // 2, self.height - 45))
     
     def render_instructions(self, screen):
         """Render instructions"""
@@ -581,6 +668,8 @@ class ReactionTestGame:
                 "",
                 f"Performance Rating: {rating}"
             ]
+            if 'display_latency' in stats or 'input_latency' in stats:
+                results.append(f"Display / Input Latency: {stats.get('display_latency', 0):.2f} / {stats.get('input_latency', 0):.2f} ms")
             
             for i, result in enumerate(results):
                 if result == "":
@@ -590,6 +679,9 @@ class ReactionTestGame:
                 if result.startswith("Performance Rating"):
                     color = rating_color
                     font = font_medium
+                elif result.startswith("Display / Input"):
+                    color = self.GRAY
+                    font = font_small
                 else:
                     color = self.WHITE
                     font = font_medium
@@ -663,21 +755,7 @@ class ReactionTestGame:
     
     def render_particles(self, screen):
         """Render particle effects"""
-        for particle in self.particles:
-            if particle['life'] > 0:
-                alpha = max(0, min(255, int(particle['life'] * 255)))
-                size = max(1, int(particle['size'] * particle['life']))
-                
-                # Ensure color is valid RGB tuple
-                color = particle['color']
-                if isinstance(color, tuple) and len(color) >= 3:
-                    # Create semi-transparent surface
-                    particle_surf = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                    # Ensure color values are integers between 0-255
-                    safe_color = tuple(max(0, min(255, int(c))) for c in color[:3])
-                    color_with_alpha = (*safe_color, alpha)
-                    pygame.draw.circle(particle_surf, color_with_alpha, (size, size), size)
-                    screen.blit(particle_surf, (int(particle['x'] - size), int(particle['y'] - size)))
+        self.particles.draw(screen)
     
     def render_pause_overlay(self, screen):
         """Render pause overlay"""
@@ -696,7 +774,11 @@ class ReactionTestGame:
     
     def cleanup(self):
         """Clean up game resources"""
-        pass
+        if self.joystick_sampler:
+            self.joystick_sampler.stop()
+            self.joystick_sampler = None
+        if self.keypad:
+            self.keypad.set_high_resolution(False)
 
 
 # For standalone execution of this script, for testing
@@ -758,6 +840,7 @@ if __name__ == "__main__":
             # Render
             game.render(screen)
             pygame.display.flip()
+            game.on_frame_presented(time.perf_counter_ns())
             
             # Control frame rate
             clock.tick(60)
@@ -769,5 +852,7 @@ if __name__ == "__main__":
     except Exception as e:
         print(f"Error occurred during game execution: {e}")
     finally:
+        if 'game' in locals():
+            game.cleanup()
         pygame.quit()
         print("Reaction Test Game Ended")
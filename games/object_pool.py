@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# object_pool.py - Fixed-capacity object pool with stable handles and O(1) swap-remove
+
+SLOT_BITS = 16
+SLOT_MASK = (1 << SLOT_BITS) - 1
+
+
+class ObjectPool:
+    """
+    Fixed-capacity pool of reusable objects.
+
+    All objects are created up front by `factory` and recycled, so spawning
+    and killing entities every frame produces no garbage. acquire() hands out
+    an integer handle (slot index plus a generation counter) that stays valid
+    until the object is released; a stale handle simply stops resolving.
+
+    Active slots are kept densely packed for iteration and release() swap-
+    removes in O(1). Releasing while iterating is safe: the object is dead
+    immediately but its slot is only recycled once the iteration finishes.
+    """
+
+    def __init__(self, capacity, factory):
+        if capacity > SLOT_MASK + 1:
+            raise ValueError(f"capacity must be at most {SLOT_MASK + 1}")
+        self.capacity = capacity
+        self._objects = [factory() for _ in range(capacity)]
+        self._generations = [0] * capacity
+        self._free = list(range(capacity - 1, -1, -1)) # Stack of free slots, lowest slot on top
+        self._active = [] # Dense list of active slots
+        self._positions = [-1] * capacity # slot -> index in _active (-1 when free)
+        self._iterating = 0
+        self._pending = set() # Slots released during iteration, recycled afterwards
+
+    def __len__(self):
+        return len(self._active) - len(self._pending)
+
+    def __bool__(self):
+        return len(self) > 0
+
+    @property
+    def full(self):
+        return not self._free
+
+    def acquire(self):
+        """Take a free object; returns its handle, or None when the pool is exhausted"""
+        if not self._free:
+            return None
+        slot = self._free.pop()
+        self._positions[slot] = len(self._active)
+        self._active.append(slot)
+        return (self._generations[slot] << SLOT_BITS) | slot
+
+    def get(self, handle):
+        """Object for a live handle, or None if it has been released"""
+        slot = handle & SLOT_MASK
+        if self._generations[slot] != handle >> SLOT_BITS or self._positions[slot] < 0:
+            return None
+        return self._objects[slot]
+
+    def __getitem__(self, handle):
+        obj = self.get(handle)
+        if obj is None:
+            raise KeyError(handle)
+        return obj
+
+    def is_alive(self, handle):
+        return self.get(handle) is not None
+
+    def release(self, handle):
+        """Return the object to the pool; releasing a stale handle is a no-op"""
+        slot = handle & SLOT_MASK
+        if self._generations[slot] != handle >> SLOT_BITS or self._positions[slot] < 0:
+            return False
+        # Bumping the generation invalidates every outstanding handle to this slot
+        self._generations[slot] += 1
+        if self._iterating:
+            self._pending.add(slot)
+        else:
+            self._remove_slot(slot)
+        return True
+
+    def _remove_slot(self, slot):
+        index = self._positions[slot]
+        last = self._active.pop()
+        if last != slot:
+            self._active[index] = last
+            self._positions[last] = index
+        self._positions[slot] = -1
+        self._free.append(slot)
+
+    def items(self):
+        """Yield (handle, object) for every live object; release() may be called while iterating"""
+        self._iterating += 1
+        try:
+            active = self._active
+            generations = self._generations
+            objects = self._objects
+            # Objects acquired during iteration are appended and not visited this pass
+            for index in range(len(active)):
+                slot = active[index]
+                handle = (generations[slot] << SLOT_BITS) | slot
+                # Skip objects released earlier in this pass
+                if slot in self._pending:
+                    continue
+                yield handle, objects[slot]
+        finally:
+            self._iterating -= 1
+            if not self._iterating and self._pending:
+                for slot in self._pending:
+                    self._remove_slot(slot)
+                self._pending.clear()
+
+    def __iter__(self):
+        for _, obj in self.items():
+            yield obj
+
+    def clear(self):
+        """Release every object"""
+        if self._iterating:
+            for slot in self._active:
+                if slot not in self._pending:
+                    self._generations[slot] += 1
+                    self._pending.add(slot)
+            return
+        for slot in self._active:
+            self._generations[slot] += 1
+            self._positions[slot] = -1
+            self._free.append(slot)
+        self._active.clear()
+        self._pending.clear()
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# particles.py - Shared particle engine (fixed-capacity ring pool, vectorized update, batched drawing)
+
+import math
+from collections import namedtuple
+
+import numpy as np
+
+from sprite_cache import SPRITE_CACHE
+
+# Emitter preset:
+# count    - particles per burst
+# vx / vy  - uniform velocity ranges (px/s), used when speed is None
+# speed    - uniform speed range for a radial burst in a random direction
+# lifetime - uniform lifetime range; alpha and radius scale with remaining lifetime
+# size     - uniform radius range at full lifetime
+# gravity  - downward acceleration (px/s^2)
+# drain    - lifetime lost per second
+ParticlePreset = namedtuple("ParticlePreset", ["count", "vx", "vy", "speed", "lifetime", "size", "gravity", "drain"])
+ParticlePreset.__new__.__defaults__ = (8, (-50, 50), (-50, 50), None, (1.0, 1.0), (2, 6), 100, 1.0)
+
+PARTICLE_PRESETS = {
+    # Snake
+    "snake_eat": ParticlePreset(count=5, drain=2.0),
+    "snake_boost": ParticlePreset(count=5, vx=(-20, 20), vy=(-100, -50), lifetime=(0.5, 0.5), drain=2.0),
+    # Memory Match
+    "memory_match": ParticlePreset(count=15, vx=(-150, 150), vy=(-200, -50), lifetime=(0.5, 1.2),
+                                   size=(6, 6), gravity=300),
+    # Reaction Test
+    "reaction_signal": ParticlePreset(count=8, vx=(-100, 100), vy=(-100, 100), size=(3, 8), gravity=200),
+    "reaction_success": ParticlePreset(count=15, speed=(50, 150), lifetime=(1.5, 1.5), size=(2, 6), gravity=200),
+    # Vampire Survivors
+    "survivor_hit": ParticlePreset(count=5, lifetime=(0.5, 0.5), size=(2, 4), gravity=150),
+    "survivor_death": ParticlePreset(count=10, vx=(-100, 100), vy=(-100, 100), size=(3, 6), gravity=150),
+    "survivor_damage": ParticlePreset(count=8, vx=(-80, 80), vy=(-80, 80), lifetime=(0.8, 0.8), size=(2, 5),
+                                      gravity=150),
+    "survivor_explosion": ParticlePreset(count=20, speed=(50, 150), size=(4, 8), gravity=150),
+}
+
+
+class ParticleSystem:
+    """
+    Fixed-capacity particle pool shared by the games.
+
+    Particles live in preallocated NumPy arrays used as a ring: a burst writes
+    the slots after the previous one and, once the pool is full, overwrites the
+    oldest particles. update() integrates every live particle in one vectorized
+    pass and draw() renders them with a single Surface.blits() call, so the
+    per-frame cost never exceeds what `capacity` particles take.
+    """
+
+    def __init__(self, capacity=256, min_radius=1):
+        self.capacity = capacity
+        self.min_radius = min_radius
+        self.x = np.zeros(capacity, dtype=np.float32)
+        self.y = np.zeros(capacity, dtype=np.float32)
+        self.vx = np.zeros(capacity, dtype=np.float32)
+        self.vy = np.zeros(capacity, dtype=np.float32)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.size = np.zeros(capacity, dtype=np.float32)
+        self.gravity = np.zeros(capacity, dtype=np.float32)
+        self.drain = np.zeros(capacity, dtype=np.float32)
+        self.color = np.zeros((capacity, 3), dtype=np.uint8)
+        self._head = 0
+
+    def __len__(self):
+        return int(np.count_nonzero(self.life > 0))
+
+    def emit(self, preset, x, y, color, count=None):
+        """Emit a burst at (x, y); preset is a PARTICLE_PRESETS name or a ParticlePreset"""
+        if isinstance(preset, str):
+            preset = PARTICLE_PRESETS[preset]
+        count = min(preset.count if count is None else count, self.capacity)
+        if count <= 0:
+            return
+        slots = (self._head + np.arange(count)) % self.capacity
+        self._head = (self._head + count) % self.capacity
+
+        if preset.speed is not None:
+            angle = np.random.uniform(0, 2 * math.pi, count)
+            speed = np.random.uniform(preset.speed[0], preset.speed[1], count)
+            self.vx[slots] = np.cos(angle) * speed
+            self.vy[slots] = np.sin(angle) * speed
+        else:
+            self.vx[slots] = np.random.uniform(preset.vx[0], preset.vx[1], count)
+            self.vy[slots] = np.random.uniform(preset.vy[0], preset.vy[1], count)
+        self.x[slots] = x
+        self.y[slots] = y
+        self.life[slots] = np.random.uniform(preset.lifetime[0], preset.lifetime[1], count)
+        self.size[slots] = np.random.uniform(preset.size[0], preset.size[1], count)
+        self.gravity[slots] = preset.gravity
+        self.drain[slots] = preset.drain
+        self.color[slots] = [max(0, min(255, int(c))) for c in color[:3]]
+
+    def update(self, delta_time):
+        live = np.flatnonzero(self.life > 0)
+        if not len(live):
+            return
+        vy = self.vy[live]
+        self.x[live] += self.vx[live] * delta_time
+        self.y[live] += vy * delta_time
+        self.vy[live] = vy + self.gravity[live] * delta_time
+        self.life[live] -= self.drain[live] * delta_time
+
+    def draw(self, screen, offset=(0, 0)):
+        """
+        Draw live particles; offset is subtracted from positions (camera scroll).
+        Returns the screen Rect they cover, or None when nothing was drawn.
+        """
+        live = np.flatnonzero(self.life > 0)
+        if not len(live):
+            return None
+        life = self.life[live]
+        alphas = np.minimum(255, life * 255).astype(np.int32)
+        sizes = np.maximum(self.min_radius, self.size[live] * life).astype(np.int32)
+        rects = screen.blits(SPRITE_CACHE.circle_blits(zip(
+            (self.x[live] - offset[0]).tolist(), (self.y[live] - offset[1]).tolist(), self.color[live].tolist(),
+            sizes.tolist(), alphas.tolist())))
+        return rects[0].unionall(rects[1:])
+
+    def clear(self):
+        self.life[:] = 0
+        self._head = 0
@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# spatial_grid.py - Uniform grid spatial index for game entities
+
+import math
+
+
+class SpatialGrid:
+    """Uniform-grid spatial hash over circular entities
+
+    The grid is rebuilt from entity positions once per tick; every query
+    returns indices into the sequences passed to rebuild(). Cell size should
+    be around the typical query radius so a query only touches a handful of
+    cells instead of every entity.
+    """
+
+    def __init__(self, cell_size=64):
+        self.cell_size = cell_size
+        self.inv_cell = 1.0 / cell_size
+        self.cells = {}
+        self.xs = ()
+        self.ys = ()
+        self.radii = None
+        self.max_radius = 0
+
+    def __len__(self):
+        return len(self.xs)
+
+    def cell_of(self, x, y):
+        return math.floor(x * self.inv_cell), math.floor(y * self.inv_cell)
+
+    def rebuild(self, xs, ys, radii=None):
+        """Re-bucket all entities (xs/ys/radii are parallel sequences or NumPy arrays)"""
+        if hasattr(xs, 'tolist'):
+            # Per-element access on NumPy arrays is slow; queries work on plain floats
+            xs, ys = xs.tolist(), ys.tolist()
+            radii = radii.tolist() if radii is not None else None
+        cells = {}
+        inv = self.inv_cell
+        floor = math.floor
+        for i in range(len(xs)):
+            key = (floor(xs[i] * inv), floor(ys[i] * inv))
+            bucket = cells.get(key)
+            if bucket is None:
+                cells[key] = [i]
+            else:
+                bucket.append(i)
+        self.cells = cells
+        self.xs = xs
+        self.ys = ys
+        self.radii = radii
+        self.max_radius = max(radii) if radii else 0
+
+    def _cells_in_box(self, min_x, min_y, max_x, max_y):
+        inv = self.inv_cell
+        cells = self.cells
+        cx0, cx1 = math.floor(min_x * inv), math.floor(max_x * inv)
+        cy0, cy1 = math.floor(min_y * inv), math.floor(max_y * inv)
+        if (cx1 - cx0 + 1) * (cy1 - cy0 + 1) > len(cells):
+            # Query box covers more cells than are occupied: walk the occupied ones
+            for (cx, cy), bucket in cells.items():
+                if cx0 <= cx <= cx1 and cy0 <= cy <= cy1:
+                    yield bucket
+            return
+        for cx in range(cx0, cx1 + 1):
+            for cy in range(cy0, cy1 + 1):
+                bucket = cells.get((cx, cy))
+                if bucket:
+                    yield bucket
+
+    def query_radius(self, x, y, radius, include_radius=False):
+        """Indices of entities whose center (or edge, with include_radius) is within radius of (x, y)"""
+        xs, ys, radii = self.xs, self.ys, self.radii
+        reach = radius + (self.max_radius if include_radius else 0)
+        result = []
+        for bucket in self._cells_in_box(x - reach, y - reach, x + reach, y + reach):
+            for i in bucket:
+                dx = xs[i] - x
+                dy = ys[i] - y
+                limit = radius + radii[i] if include_radius and radii else radius
+                if dx * dx + dy * dy <= limit * limit:
+                    result.append(i)
+        return result
+
+    def nearest(self, x, y, k=1, max_distance=float('inf'), skip=None):
+        """Up to k (distance, index) pairs closest to (x, y), nearest first
+
+        Searches outward ring by ring and stops as soon as no unvisited cell
+        can hold anything closer than the current k-th best. skip(index) may
+        reject entities (e.g. dead ones).
+        """
+        cells = self.cells
+        if not cells:
+            return []
+        xs, ys = self.xs, self.ys
+        cell_size = self.cell_size
+        cx, cy = self.cell_of(x, y)
+        best = []  # sorted (distance, index)
+        ring = 0
+        remaining = len(cells)
+        while remaining > 0:
+            # Closest any point in this ring can be to (x, y)
+            ring_distance = (ring - 1) * cell_size if ring > 0 else 0
+            if ring_distance > max_distance or (len(best) >= k and ring_distance > best[-1][0]):
+                break
+            if ring == 0:
+                ring_cells = ((cx, cy),)
+            else:
+                ring_cells = [(cx + dx, cy - ring) for dx in range(-ring, ring + 1)]
+                ring_cells += [(cx + dx, cy + ring) for dx in range(-ring, ring + 1)]
+                ring_cells += [(cx - ring, cy + dy) for dy in range(-ring + 1, ring)]
+                ring_cells += [(cx + ring, cy + dy) for dy in range(-ring + 1, ring)]
+            for key in ring_cells:
+                bucket = cells.get(key)
+                if not bucket:
+                    continue
+                remaining -= 1
+                for i in bucket:
+                    if skip is not None and skip(i):
+                        continue
+                    distance = math.hypot(xs[i] - x, ys[i] - y)
+                    if distance > max_distance:
+                        continue
+                    if len(best) < k or distance < best[-1][0]:
+                        best.append((distance, i))
+                        best.sort()
+                        del best[k:]
+            ring += 1
+        return best
+
+    def query_segment(self, x0, y0, x1, y1, radius, include_radius=False):
+        """Indices of entities touched by a circle of `radius` swept from (x0, y0) to (x1, y1)
+
+        Results are ordered by first contact along the segment, so the first
+        live entry is the one a fast projectile hits first.
+        """
+        xs, ys, radii = self.xs, self.ys, self.radii
+        reach = radius + (self.max_radius if include_radius else 0)
+        seg_x = x1 - x0
+        seg_y = y1 - y0
+        seg_len_sq = seg_x * seg_x + seg_y * seg_y
+        hits = []
+        for bucket in self._cells_in_box(min(x0, x1) - reach, min(y0, y1) - reach,
+                                         max(x0, x1) + reach, max(y0, y1) + reach):
+            for i in bucket:
+                px = xs[i] - x0
+                py = ys[i] - y0
+                t = (px * seg_x + py * seg_y) / seg_len_sq if seg_len_sq > 0 else 0.0
+                t = 0.0 if t < 0.0 else 1.0 if t > 1.0 else t
+                dx = px - seg_x * t
+                dy = py - seg_y * t
+                limit = radius + radii[i] if include_radius and radii else radius
+                if dx * dx + dy * dy <= limit * limit:
+                    hits.append((t, i))
+        hits.sort()
+        return [i for _, i in hits]
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# sprite_atlas.py - Pre-rendered sprite set for batched Surface.blits() drawing
+
+import pygame
+
+
+class SpriteAtlas:
+    """Sprite set built once from a dict of {key: Surface}
+
+    blit() returns a (surface, dest) tuple centered on a point so any number
+    of sprites can be submitted together with one Surface.blits() call.
+
+    Sprites are stored opaque with a colorkey for the transparent pixels:
+    hard-edged shapes need no per-pixel alpha, and RLE colorkey blits are
+    several times cheaper than alpha blending on a software renderer. Each
+    sprite keeps its own surface because RLE blits from a sub-area of a shared
+    sheet have to skip over the rest of the sheet and lose most of that gain.
+    """
+
+    COLORKEY = (255, 0, 255)
+
+    def __init__(self, sprites):
+        self.sprites = {}
+        self.centers = {}
+        converted = pygame.display.get_surface() is not None
+        for key, sprite in sprites.items():
+            surface = pygame.Surface(sprite.get_size())
+            surface.fill(self.COLORKEY)
+            surface.blit(sprite, (0, 0))
+            if converted:
+                # Match the display format so blits skip the pixel format conversion
+                surface = surface.convert()
+            surface.set_colorkey(self.COLORKEY, pygame.RLEACCEL)
+            self.sprites[key] = surface
+            self.centers[key] = (surface.get_width() // 2, surface.get_height() // 2)
+
+    def __contains__(self, key):
+        return key in self.sprites
+
+    def __getitem__(self, key):
+        return self.sprites[key]
+
+    def blit(self, key, x, y):
+        """Blit tuple drawing sprite `key` centered on (x, y)"""
+        center_x, center_y = self.centers[key]
+        return self.sprites[key], (x - center_x, y - center_y)
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# sprite_cache.py - Shared cache of pre-rendered alpha sprites for particle effects
+
+from collections import OrderedDict
+
+import pygame
+
+
+class SpriteCache:
+    """LRU cache of pre-rendered translucent circle sprites
+
+    Sprites are keyed by (color, radius, alpha bucket). Alpha is quantized into
+    a fixed number of buckets so fading particles reuse a handful of surfaces
+    instead of allocating a new one per particle per frame. When the cache is
+    full the least recently used sprite is dropped.
+    """
+
+    def __init__(self, max_sprites=1024, alpha_buckets=16):
+        self.max_sprites = max_sprites
+        self.alpha_buckets = alpha_buckets
+        self._sprites = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._sprites)
+
+    def alpha_bucket(self, alpha):
+        """Quantize alpha (0-255) to its bucket index"""
+        alpha = max(0, min(255, alpha))
+        return (alpha * (self.alpha_buckets - 1) + 127) // 255
+
+    def circle(self, color, radius, alpha=255):
+        """Circle sprite of the given RGB color; the surface is (2*radius, 2*radius)"""
+        key = (color[0], color[1], color[2], radius, self.alpha_bucket(alpha))
+        sprite = self._sprites.get(key)
+        if sprite is not None:
+            self._sprites.move_to_end(key)
+            self.hits += 1
+            return sprite
+
+        self.misses += 1
+        bucket_alpha = key[4] * 255 // (self.alpha_buckets - 1)
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (color[0], color[1], color[2], bucket_alpha), (radius, radius), radius)
+        self._sprites[key] = sprite
+        if len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def circle_blits(self, circles):
+        """Turn (x, y, color, radius, alpha) tuples into a sequence for Surface.blits()"""
+        sprite = self.circle
+        return [(sprite(color, radius, alpha), (int(x) - radius, int(y) - radius))
+                for x, y, color, radius, alpha in circles]
+
+    def clear(self):
+        self._sprites.clear()
+
+
+# Shared by the particle effects of every game
+SPRITE_CACHE = SpriteCache()
@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# input_bus.py - 統一輸入事件匯流排 (矩陣鍵盤、Xbox 控制器、遊戲控制按鈕、鍵盤)
+
+import time
+import logging
+from collections import deque, namedtuple
+
+import pygame
+
+from gamepad_input import BUTTON_NAMES
+
+logger = logging.getLogger(__name__)
+
+# 每個來源的輸入規則 (秒)：
+# debounce - 同一按鍵兩次按下的最短間隔，間隔內的按下 (以及對應的放開) 會被丟棄
+# repeat_delay / repeat_interval - 按住多久後開始連發，以及連發間隔；repeat_delay 為 None 表示不連發
+InputPolicy = namedtuple("InputPolicy", ["debounce", "repeat_delay", "repeat_interval"])
+InputPolicy.__new__.__defaults__ = (0.0, None, None)
+
+JOYSTICK_EVENTS = (pygame.JOYBUTTONDOWN, pygame.JOYBUTTONUP, pygame.JOYAXISMOTION, pygame.JOYHATMOTION,
+                   pygame.JOYDEVICEADDED, pygame.JOYDEVICEREMOVED)
+
+
+class InputBus:
+    """
+    將所有輸入來源合併成一個依時間排序的事件串流，主迴圈每幀只需呼叫一次 pump()。
+    事件格式: {"source", "type", "key", "timestamp"}
+      source    - "keypad" / "controller" / "power_button" / "keyboard" / "system"
+      type      - "press" / "release" / "repeat" (按鍵類)，"action" (遊戲控制按鈕)，"quit" (視窗關閉)
+      key       - 鍵盤按鍵值、控制器按鈕名稱 ("a", "up"...)、pygame 按鍵碼或按鈕動作名稱
+      timestamp - time.perf_counter_ns()；矩陣鍵盤與遊戲控制按鈕在背景執行緒擷取時蓋上，
+                  pygame 事件在 pump 取出時蓋上
+    不同的消費端 (例如選單與遊戲中) 可用 set_policy 設定各來源的去抖動與連發規則。
+    """
+    SOURCES = ("keypad", "controller", "power_button", "keyboard")
+    EVENT_QUEUE_SIZE = 256 # 事件佇列上限，超過時丟棄最舊的事件
+
+    def __init__(self, keypad=None, controller=None, power_button=None):
+        self.keypad = keypad
+        self.controller = controller
+        self.power_button = power_button
+
+        self._queue = deque(maxlen=self.EVENT_QUEUE_SIZE) # post 可在任何執行緒呼叫
+        self._policies = {} # consumer -> {source: InputPolicy}
+        self._consumer = None
+        self._last_press = {} # (source, key) -> 最近一次被接受的按下時間 (ns)
+        self._suppressed = set() # 按下被去抖動丟棄的 (source, key)，對應的放開也一併丟棄
+        self._held = {} # (source, key) -> 下一次連發的時間 (ns)
+        self.stats = {"events": 0, "debounced": 0, "repeats": 0}
+
+    def set_policy(self, consumer, source, debounce=0.0, repeat_delay=None, repeat_interval=None):
+        if source not in self.SOURCES:
+            raise ValueError(f"未知的輸入來源: {source}")
+        self._policies.setdefault(consumer, {})[source] = InputPolicy(debounce, repeat_delay, repeat_interval)
+
+    def get_policy(self, consumer, source):
+        return self._policies.get(consumer, {}).get(source, InputPolicy())
+
+    def post(self, source, event_type, key, timestamp=None):
+        """加入一個事件 (deque.append 為原子操作，背景執行緒可直接呼叫)"""
+        if timestamp is None:
+            timestamp = time.perf_counter_ns()
+        self._queue.append({"source": source, "type": event_type, "key": key, "timestamp": timestamp})
+
+    def _capture_pygame_events(self):
+        for event in pygame.event.get():
+            now = time.perf_counter_ns()
+            if event.type in JOYSTICK_EVENTS:
+                if self.controller:
+                    before = self.controller.buttons
+                    if self.controller.handle_event(event):
+                        self._post_controller_changes(before, self.controller.buttons, now)
+            elif event.type == pygame.KEYDOWN:
+                self.post("keyboard", "press", event.key, now)
+            elif event.type == pygame.KEYUP:
+                self.post("keyboard", "release", event.key, now)
+            elif event.type == pygame.QUIT:
+                self.post("system", "quit", None, now)
+
+    def _post_controller_changes(self, before, after, timestamp):
+        changed = before ^ after
+        if not changed:
+            return
+        for name, bit in BUTTON_NAMES:
+            if changed & bit:
+                self.post("controller", "press" if after & bit else "release", name, timestamp)
+
+    def _capture_devices(self):
+        if self.keypad:
+            for event in self.keypad.get_events():
+                self.post("keypad", event["type"], event["key"], event["timestamp"])
+        if self.power_button:
+            for event in self.power_button.get_pending_events():
+                self.post("power_button", "action", event.get("action"), event.get("timestamp"))
+
+    def reset(self):
+        """丟棄待處理事件與按住/連發狀態 (例如切換消費端時)"""
+        self._queue.clear()
+        self._held.clear()
+        self._suppressed.clear()
+
+    def pump(self, consumer=None):
+        """
+        收集所有來源的事件，依時間排序並套用 consumer 的去抖動/連發規則，回傳本幀的事件列表。
+        """
+        if consumer != self._consumer:
+            # 換了消費端時，舊規則下的按住狀態不再適用
+            self._held.clear()
+            self._suppressed.clear()
+            self._consumer = consumer
+
+        self._capture_pygame_events()
+        self._capture_devices()
+
+        raw = []
+        while True:
+            try: raw.append(self._queue.popleft())
+            except IndexError: break
+        raw.sort(key=lambda e: e["timestamp"])
+
+        events = []
+        policies = self._policies.get(consumer, {})
+        default_policy = InputPolicy()
+        for event in raw:
+            policy = policies.get(event["source"], default_policy)
+            if self._accept(event, policy):
+                events.append(event)
+        self._add_repeats(events, policies, default_policy)
+        self.stats["events"] += len(events)
+        return events
+
+    def _accept(self, event, policy):
+        if event["type"] not in ("press", "release"):
+            return True
+        ident = (event["source"], event["key"])
+        if event["type"] == "release":
+            self._held.pop(ident, None)
+            if ident in self._suppressed:
+                self._suppressed.discard(ident)
+                return False
+            return True
+
+        timestamp = event["timestamp"]
+        last = self._last_press.get(ident)
+        if policy.debounce and last is not None and timestamp - last < policy.debounce * 1e9:
+            self._suppressed.add(ident)
+            self.stats["debounced"] += 1
+            return False
+        self._last_press[ident] = timestamp
+        if policy.repeat_delay is not None:
+            self._held[ident] = timestamp + int(policy.repeat_delay * 1e9)
+        return True
+
+    def _add_repeats(self, events, policies, default_policy):
+        if not self._held:
+            return
+        now = time.perf_counter_ns()
+        for ident, due in self._held.items():
+            if now < due:
+                continue
+            policy = policies.get(ident[0], default_policy)
+            interval = policy.repeat_interval or policy.repeat_delay
+            # 從現在起算下一次連發，主迴圈卡頓時不會一次補發多個
+            self._held[ident] = now + int(interval * 1e9)
+            events.append({"source": ident[0], "type": "repeat", "key": ident[1], "timestamp": now})
+            self.stats["repeats"] += 1
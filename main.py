@@ -26,6 +26,7 @@ from gamepad_input import XboxController
 from buzzer import BuzzerControl # 從 buzzer.py 導入
 from traffic_light import TrafficLight
 from power_button import GameControlButton, GAME_CONTROL_BUTTON_PIN # 從 power_button.py 導入
+from input_bus import InputBus
 
 # 遊戲模組導入
 sys.path.append(os.path.join(os.path.dirname(__file__), 'games'))
@@ -52,6 +53,22 @@ TRAFFIC_LIGHT_RED_PIN = 4
 TRAFFIC_LIGHT_YELLOW_PIN = 3
 TRAFFIC_LIGHT_GREEN_PIN = 2
 
+# 輸入匯流排各消費端的規則 (秒)：選單中方向鍵按住會連發、數字鍵避免連按誤觸；遊戲中使用原始事件
+INPUT_POLICIES = {
+    "menu": {
+        "keypad": {"debounce": 0.2},
+        "controller": {"repeat_delay": 0.4, "repeat_interval": 0.15},
+        "keyboard": {"repeat_delay": 0.4, "repeat_interval": 0.15},
+    },
+    "game": {},
+}
+
+# 選單操作對應：控制器按鈕名稱 / 鍵盤按鍵碼 -> 選單動作
+MENU_ACTIONS = {
+    "up": "up", "down": "down", "a": "select", "b": "back",
+    pygame.K_UP: "up", pygame.K_DOWN: "down", pygame.K_RETURN: "select", pygame.K_SPACE: "select", pygame.K_BACKSPACE: "back",
+}
+
 # 中文字型路徑設定 (請根據您的系統修改)
 CHINESE_FONT_PATH = "/usr/share/fonts/truetype/wqy/wqy-microhei.ttc"
 
@@ -87,7 +104,7 @@ class SystemConfig:
         self.config_file = os.path.join(os.path.dirname(__file__), 'config.json')
         self.default_config = {
             "display": {"hdmi_width": HDMI_SCREEN_WIDTH, "hdmi_height": HDMI_SCREEN_HEIGHT, "fps": FPS, "fullscreen": False},
-            "audio": {"enable_buzzer": True, "volume": 80, "startup_sound": True},
+            "audio": {"enable_buzzer": True, "volume": 80, "startup_sound": True, "backend": "buzzer", "synth_waveform": "square", "sdl_audio_driver": ""},
             "hardware": {"spi_screen_enabled": True, "xbox_controller_enabled": True, "matrix_keypad_enabled": True, "traffic_light_enabled": True, "power_button_enabled": True},
             "debug": {"log_level": "INFO", "show_fps": False, "hardware_monitor": False}
         }
@@ -156,8 +173,8 @@ class EnhancedGameConsole:
         self.hdmi_screen = None; self.clock = None; self.spi_screen = None; self.keypad = None
         self.controller = None; self.buzzer = None; self.traffic_light = None
         self.power_button = None # 遊戲內控制按鈕的實例
+        self.input_bus = None; self.frame_events = [] # 本幀從輸入匯流排取出的事件
         self.performance_monitor = PerformanceMonitor(); self.event_queue = queue.Queue()
-        self.last_input_time = 0; self.input_cooldown = 0.2
         self.session_stats = {"start_time": datetime.now(), "games_played": 0, "total_score": 0, "best_scores": {}}
         self.monitor_thread = None; self.monitor_running = False
         self.font_large = None; self.font_medium = None; self.font_small = None; self.font_tiny = None
@@ -184,6 +201,7 @@ class EnhancedGameConsole:
             if self.config.config["audio"]["enable_buzzer"]: hardware_results["buzzer"] = self._init_buzzer()
             if self.config.config["hardware"]["traffic_light_enabled"]: hardware_results["traffic_light"] = self._init_traffic_light()
             if self.config.config["hardware"]["power_button_enabled"]: hardware_results["power_button"] = self._init_power_button() # 初始化遊戲內控制按鈕
+            self._init_input_bus()
             failed_components = [k for k, v in hardware_results.items() if not v]
             if failed_components:
                 logging.warning(f"以下硬體組件初始化失敗: {failed_components}")
@@ -269,7 +287,8 @@ class EnhancedGameConsole:
                 except Exception as e: logging.error(f"  控制器 {i}: 無法讀取 ({e})")
         except Exception as e: logging.error(f"控制器診斷記錄失敗: {e}")
 
-    def _init_buzzer(self): # 使用 buzzer.py 中的 BuzzerControl
+    def _init_buzzer(self): # 使用 buzzer.py 中的 BuzzerControl，或依設定改用 synth_audio.py 的軟體合成音效
+        if self.config.config["audio"]["backend"] == "synth": return self._init_synth_audio()
         try:
             logging.info("正在初始化蜂鳴器 (GPIO 18)...")
             # BuzzerControl 的 __init__ 會處理 GPIO.setup
@@ -281,6 +300,16 @@ class EnhancedGameConsole:
                 return True
             else: logging.error("蜂鳴器物件創建失敗"); return False
         except Exception as e: logging.error(f"蜂鳴器初始化錯誤: {e}\n{traceback.format_exc()}"); return False
+    def _init_synth_audio(self): # 透過 pygame.mixer 從 HDMI 輸出，介面與 BuzzerControl 相同
+        try:
+            logging.info("正在初始化合成音效 (pygame.mixer)...")
+            from synth_audio import SynthAudioControl # numpy 為選用套件，只在選用此後端時導入
+            audio_config = self.config.config["audio"]
+            self.buzzer = SynthAudioControl(initial_volume=audio_config["volume"], waveform=audio_config["synth_waveform"],
+                                            audio_driver=audio_config["sdl_audio_driver"] or None)
+            logging.info("合成音效初始化成功"); return True
+        except ImportError as e: logging.error(f"合成音效套件導入失敗: {e}. 請安裝 numpy"); return False
+        except Exception as e: logging.error(f"合成音效初始化錯誤: {e}\n{traceback.format_exc()}"); return False
 
     def _init_traffic_light(self):
         try:
@@ -296,6 +325,12 @@ class EnhancedGameConsole:
             logging.info(f"遊戲內控制按鈕 (GPIO {GAME_CONTROL_BUTTON_PIN}) 初始化並開始監控"); return True
         except Exception as e: logging.error(f"遊戲內控制按鈕初始化失敗: {e}\n{traceback.format_exc()}"); return False
 
+    def _init_input_bus(self): # 合併所有輸入來源，主迴圈每幀只取一次事件
+        self.input_bus = InputBus(keypad=self.keypad, controller=self.controller, power_button=self.power_button)
+        for consumer, sources in INPUT_POLICIES.items():
+            for source, policy in sources.items(): self.input_bus.set_policy(consumer, source, **policy)
+        logging.info("輸入匯流排初始化完成")
+
     def _start_system_monitor(self):
         try:
             self.monitor_running = True
@@ -337,10 +372,9 @@ class EnhancedGameConsole:
                 break
 
             try:
-                self._handle_power_button_events() # 處理遊戲內按鈕事件
                 if self.config.config["debug"]["hardware_monitor"]: self.performance_monitor.update()
+                self._handle_input_events() # 先處理事件，控制器狀態才會是本幀最新的
                 self._handle_current_state()
-                self._handle_pygame_events()
                 self.clock.tick(self.config.config["display"]["fps"])
             except Exception as e:
                 logging.error(f"主循環錯誤: {e}\n{traceback.format_exc()}"); self.state = GameState.ERROR
@@ -348,14 +382,25 @@ class EnhancedGameConsole:
         logging.info("主循環已結束，執行清理...")
         self.cleanup() # 主循環結束後執行清理
 
-    def _handle_power_button_events(self): # 處理來自 GameControlButton 的事件
-        if not self.power_button: return
-        events = self.power_button.get_pending_events()
-        for event in events:
-            action = event.get("action")
-            logging.debug(f"處理遊戲控制按鈕事件: {action}")
-            if action == 'toggle_pause': self._handle_pause_toggle()
-            elif action == 'return_to_menu': self._handle_return_to_menu()
+    def _handle_input_events(self): # 從輸入匯流排取出本幀所有來源的事件，並處理系統層級的按鍵
+        consumer = "game" if self.state in (GameState.GAME, GameState.GAME_PAUSED) else "menu"
+        self.frame_events = self.input_bus.pump(consumer)
+        for event in self.frame_events:
+            source, key = event["source"], event["key"]
+            if source == "system" and event["type"] == "quit": self.running = False
+            elif source == "power_button": # 來自 GameControlButton 的事件
+                logging.debug(f"處理遊戲控制按鈕事件: {key}")
+                if key == 'toggle_pause': self._handle_pause_toggle()
+                elif key == 'return_to_menu': self._handle_return_to_menu()
+            elif event["type"] != "press": continue
+            elif source == "keyboard":
+                if key == pygame.K_ESCAPE:
+                    if self.state == GameState.GAME or self.state == GameState.GAME_PAUSED: self._handle_return_to_menu()
+                    else: self.running = False
+                elif key == pygame.K_F1: self.config.config["debug"]["show_fps"] = not self.config.config["debug"]["show_fps"]
+            elif source == "controller" and key == "back" and self.state == GameState.GAME:
+                logging.info("偵測到 Xbox 控制器 BACK 鍵按下，返回主選單。")
+                self._handle_return_to_menu()
 
     def _handle_pause_toggle(self):
         if self.state == GameState.GAME:
@@ -365,6 +410,9 @@ class EnhancedGameConsole:
             logging.info("遊戲已暫停")
         elif self.state == GameState.GAME_PAUSED:
             self.state = GameState.GAME
+            if self.current_game and hasattr(self.current_game, "invalidate_screen"): self.current_game.invalidate_screen() # 暫停畫面蓋掉了遊戲畫面，需整個重畫
+            if self.current_game and hasattr(self.current_game, "on_resume"): self.current_game.on_resume() # 以真實時間驅動的遊戲不應補算暫停的時間
+            if self.controller: self.controller.clear() # 暫停畫面期間 (含恢復用的那一下) 累積的按下邊緣不應帶進遊戲
             if self.traffic_light: self.traffic_light.green_on()
             if self.buzzer: self.buzzer.play_tone("navigate")
             logging.info("遊戲已繼續")
@@ -373,6 +421,8 @@ class EnhancedGameConsole:
         if self.state in [GameState.GAME, GameState.GAME_PAUSED, GameState.INSTRUCTION, GameState.GAME_OVER]:
             if self.current_game: self.end_current_game()
             self.state = GameState.MENU
+            if self.keypad: self.keypad.clear() # 遊戲中累積的按鍵不應觸發選單
+            if self.controller: self.controller.clear()
             if self.traffic_light: self.traffic_light.all_off()
             if self.buzzer: self.buzzer.play_tone("back")
             logging.info("已返回主選單")
@@ -389,17 +439,23 @@ class EnhancedGameConsole:
 
     def _handle_menu(self):
         if self.spi_screen and self.spi_screen.device: self.spi_screen.display_menu(self.games, self.current_selection)
-        if self._can_process_input(): self._process_menu_input()
+        self._process_menu_input()
         if self.hdmi_screen:
             self.hdmi_screen.fill((0,0,0)); self._render_menu_on_hdmi()
             if self.config.config["debug"]["show_fps"]: self._render_debug_info()
             pygame.display.flip()
-    def _can_process_input(self): return (time.time() - self.last_input_time) >= self.input_cooldown
+    def _menu_action(self, event):
+        """將控制器/鍵盤事件轉換為選單動作；按住連發只用於上下移動"""
+        if event["source"] not in ("controller", "keyboard") or event["type"] == "release": return None
+        action = MENU_ACTIONS.get(event["key"])
+        if event["type"] == "repeat" and action not in ("up", "down"): return None
+        return action
     def _process_menu_input(self):
-        if self.keypad:
-            key = self.keypad.get_key()
-            if key is not None:
-                self.last_input_time = time.time()
+        for event in self.frame_events:
+            if self.state != GameState.MENU: break # 已選擇遊戲，其餘事件不再處理
+            if event["source"] == "keypad":
+                if event["type"] != "press": continue
+                key = event["key"]
                 try:
                     val = int(key)
                     if 1 <= val <= 9 and val <= len(self.games):
@@ -408,30 +464,27 @@ class EnhancedGameConsole:
                         if self.traffic_light: self.traffic_light.yellow_on()
                 except ValueError:
                     if key == 'D' and self.traffic_light: self.traffic_light.all_off()
-        if self.controller:
-            ctrl_in = self.controller.get_input()
-            if ctrl_in:
-                detected = False
-                if ctrl_in["up_pressed"]: self.current_selection = (self.current_selection - 1 + len(self.games)) % len(self.games); detected = True
-                elif ctrl_in["down_pressed"]: self.current_selection = (self.current_selection + 1) % len(self.games); detected = True
-                elif ctrl_in["a_pressed"]:
-                    if self.buzzer: self.buzzer.play_tone("select")
-                    self.state = GameState.INSTRUCTION
-                    if self.traffic_light: self.traffic_light.yellow_on(); detected = True
-                if detected:
-                    self.last_input_time = time.time()
-                    if self.buzzer and (ctrl_in["up_pressed"] or ctrl_in["down_pressed"]): self.buzzer.play_tone("navigate")
+                continue
+            action = self._menu_action(event)
+            if action == "up" or action == "down":
+                step = -1 if action == "up" else 1
+                self.current_selection = (self.current_selection + step) % len(self.games)
+                if self.buzzer: self.buzzer.play_tone("navigate")
+            elif action == "select":
+                if self.buzzer: self.buzzer.play_tone("select")
+                self.state = GameState.INSTRUCTION
+                if self.traffic_light: self.traffic_light.yellow_on()
 
     def _handle_instruction(self):
         game_data = self.games[self.current_selection]
         if self.spi_screen and self.spi_screen.device: self.spi_screen.display_game_instructions(game_data)
-        if self._can_process_input():
-            if self.keypad and self.keypad.get_key() == "A": self._start_game_sequence(game_data)
-            elif self.keypad and self.keypad.get_key() == "D": self._return_to_menu()
-            if self.controller:
-                ctrl_in = self.controller.get_input()
-                if ctrl_in and ctrl_in["a_pressed"]: self._start_game_sequence(game_data)
-                elif ctrl_in and ctrl_in["b_pressed"]: self._return_to_menu()
+        for event in self.frame_events:
+            if self.state != GameState.INSTRUCTION: break
+            if event["source"] == "keypad":
+                action = {"A": "select", "D": "back"}.get(event["key"]) if event["type"] == "press" else None
+            else: action = self._menu_action(event)
+            if action == "select": self._start_game_sequence(game_data)
+            elif action == "back": self._return_to_menu()
         if self.hdmi_screen: self.hdmi_screen.fill((0,0,0)); self._render_instructions_on_hdmi(game_data); pygame.display.flip()
     def _start_game_sequence(self, game_data):
         if self.buzzer: self.buzzer.play_tone("game_start")
@@ -451,11 +504,17 @@ class EnhancedGameConsole:
                     elif countdown == 2: self.traffic_light.yellow_on()
                     elif countdown == 1: self.traffic_light.green_on()
                 if self.buzzer and int(elapsed * 2) != getattr(self, '_last_beep', -1):
-                    self.buzzer.play_tone(frequency=300 + countdown * 200, duration=0.2); self._last_beep = int(elapsed * 2)
+                    self.buzzer.play_tone(frequency=300 + countdown * 200, duration=0.2, category="ui"); self._last_beep = int(elapsed * 2)
         else: self._actually_start_game(self.selected_game_data)
     def _actually_start_game(self, game_data):
         try:
             self.current_game = game_data["game_class"](width=self.config.config["display"]["hdmi_width"], height=self.config.config["display"]["hdmi_height"], buzzer=self.buzzer)
+            if self.controller:
+                self.controller.clear() # 選單中累積的按下邊緣不應帶進遊戲
+                if hasattr(self.current_game, "attach_controller"): self.current_game.attach_controller(self.controller) # 支援的遊戲可直接讀取該控制器的裝置
+            if self.keypad:
+                self.keypad.clear()
+                if hasattr(self.current_game, "attach_keypad"): self.current_game.attach_keypad(self.keypad) # 支援的遊戲可把矩陣鍵盤當第二控制器
             self.state = GameState.GAME; self.session_stats["games_played"] += 1
             if self.spi_screen and self.spi_screen.device: self.spi_screen.clear_screen()
             logging.info(f"遊戲 '{game_data['name']}' 已啟動")
@@ -465,24 +524,18 @@ class EnhancedGameConsole:
 
     def _handle_game(self):
         if self.current_game:
-            ctrl_in = self.controller.get_input() if self.controller else {}
-
-            # --- MODIFICATION START: Handle Xbox BACK button ---
-            if ctrl_in and ctrl_in.get("back_pressed"):
-                if self._can_process_input(): # Use existing input cooldown
-                    logging.info("偵測到 Xbox 控制器 BACK 鍵按下，返回主選單。")
-                    self._handle_return_to_menu() # Call existing return to menu method
-                    self.last_input_time = time.time() # Update last input time
-                    return # Return immediately, skip further game logic for this frame
-            # --- MODIFICATION END ---
-
+            ctrl_in = self.controller.get_input() if self.controller else {} # Xbox BACK 鍵由 _handle_input_events 處理
             status = self.current_game.update(ctrl_in)
             if status.get("game_over", False):
                 self.state = GameState.GAME_OVER; self.game_over_data = status
                 score = status.get("score", 0); self.session_stats["total_score"] += score
                 name = self.games[self.current_selection]["name"]
                 self.session_stats["best_scores"][name] = max(self.session_stats["best_scores"].get(name, 0), score)
-            elif self.hdmi_screen: self.current_game.render(self.hdmi_screen); pygame.display.flip()
+            elif self.hdmi_screen:
+                dirty_rects = self.current_game.render(self.hdmi_screen) # 支援增量繪製的遊戲回傳有變動的區域
+                if dirty_rects is None: pygame.display.flip()
+                else: pygame.display.update(dirty_rects)
+                if hasattr(self.current_game, "on_frame_presented"): self.current_game.on_frame_presented(time.perf_counter_ns()) # 畫面實際送出的時間
 
     def _handle_game_paused(self):
         if self.hdmi_screen and self.font_large and self.font_small:
@@ -512,15 +565,6 @@ class EnhancedGameConsole:
             self.hdmi_screen.blit(txt_s, rect); pygame.display.flip()
         time.sleep(0.1)
 
-    def _handle_pygame_events(self):
-        for event in pygame.event.get():
-            if event.type == pygame.QUIT: self.running = False
-            elif event.type == pygame.KEYDOWN:
-                if event.key == pygame.K_ESCAPE:
-                    if self.state == GameState.GAME or self.state == GameState.GAME_PAUSED: self._handle_return_to_menu()
-                    else: self.running = False
-                elif event.key == pygame.K_F1: self.config.config["debug"]["show_fps"] = not self.config.config["debug"]["show_fps"]
-
     def _render_debug_info(self):
         if not self.hdmi_screen or not self.font_tiny: return
         y = 10; fps = self.font_tiny.render(f"FPS: {self.performance_monitor.get_average_fps():.1f}", True, (255,255,255))
@@ -5,9 +5,15 @@
 import RPi.GPIO as GPIO
 import time
 import logging
+import threading
+from collections import deque, namedtuple
 
 logger = logging.getLogger(__name__)
 
+# 鍵盤狀態快照：mask 為目前按住的按鍵 (bit = 行 * 列數 + 列)，
+# pressed/released 為自上次 poll 以來新按下/新放開的按鍵，timestamp 為 perf_counter_ns
+KeypadState = namedtuple("KeypadState", ["mask", "pressed", "released", "timestamp"])
+
 class MatrixKeypad:
     # 按鍵對應 (可根據實際鍵盤修改)
     KEYPAD_LAYOUT = [
@@ -22,20 +28,50 @@ class MatrixKeypad:
     ROW_PINS = [6, 13, 19, 26]  # Rows: R1, R2, R3, R4
     COL_PINS = [12, 16, 20, 21] # Columns: C1, C2, C3, C4
 
+    # 背景掃描參數
+    SCAN_INTERVAL = 0.005 # 有按鍵按下時的掃描間隔 (秒)
+    IDLE_POLL_INTERVAL = 0.01 # 無法使用邊緣偵測時，閒置狀態的輪詢間隔 (秒)
+    IDLE_RESCAN_TIMEOUT = 0.5 # 使用邊緣偵測時，閒置狀態下的保險重新掃描間隔 (秒)
+    EVENT_QUEUE_SIZE = 64 # 事件佇列上限，消費端太慢時丟棄最舊的事件
+    HIGH_RES_SCAN_INTERVAL = 0.001 # 高精度模式 (例如反應測試) 的掃描/輪詢間隔 (秒)
+
     def __init__(self, row_pins=None, col_pins=None, layout=None, debounce_delay=0.05):
         """
-        初始化矩陣鍵盤。
+        初始化矩陣鍵盤，並啟動背景掃描執行緒。
         :param row_pins: 行 GPIO pins 列表 (BCM)
         :param col_pins: 列 GPIO pins 列表 (BCM)
         :param layout: 按鍵佈局列表
-        :param debounce_delay: 按鍵去抖動延遲 (秒)
+        :param debounce_delay: 按鍵去抖動時間 (秒)，狀態需穩定這麼久才會發出事件
         """
         self.row_pins = row_pins if row_pins else self.ROW_PINS
         self.col_pins = col_pins if col_pins else self.COL_PINS
         self.layout = layout if layout else self.KEYPAD_LAYOUT
         self.debounce_delay = debounce_delay
-        self.last_key_press_time = 0
-        self.last_key = None
+        self._debounce_ns = int(debounce_delay * 1e9)
+        self.scan_interval = self.SCAN_INTERVAL
+        self.idle_poll_interval = self.IDLE_POLL_INTERVAL
+        self.num_cols = len(self.col_pins)
+        self._col_mask = (1 << self.num_cols) - 1
+
+        # 按鍵 <-> 位元對應，每個按鍵佔 1 bit (4x4 鍵盤共 16 bit)
+        self.key_bits = {}
+        self._bit_keys = []
+        for r_idx, row in enumerate(self.layout):
+            for c_idx, key in enumerate(row):
+                self.key_bits[key] = 1 << (r_idx * self.num_cols + c_idx)
+                self._bit_keys.append(key)
+
+        # 去抖動後的穩定狀態 (mask, timestamp)，以單一 tuple 整體替換，讀取端不會看到不一致的組合
+        self._state = (0, time.perf_counter_ns())
+        self._polled_mask = 0 # poll() 上次回傳的 mask，用來計算按下/放開邊緣
+        self.ghost_count = 0 # 因鬼鍵 (ghosting) 而略過的掃描次數
+
+        # deque 的 append/popleft 在 CPython 中是原子操作，掃描執行緒與主迴圈之間不需加鎖
+        self._events = deque(maxlen=self.EVENT_QUEUE_SIZE) # 按下/放開事件，get_events 與 get_key 共用這一個佇列
+        self._scan_thread = None
+        self._stop_scanning = threading.Event()
+        self._wake = threading.Event() # 列 GPIO 下降緣時由中斷回呼設定
+        self.edge_detection = False
 
         if len(self.row_pins) != len(self.layout) or len(self.col_pins) != len(self.layout[0]):
             msg = "行/列 GPIO pins 數量與按鍵佈局不匹配。"
@@ -46,10 +82,10 @@ class MatrixKeypad:
             # GPIO.setmode(GPIO.BCM) # 通常由主程式設定
             # GPIO.setwarnings(False)
 
-            # 設定行 GPIO 為輸出，預設高電平
+            # 設定行 GPIO 為輸出，閒置時全部拉低，任一按鍵按下都會讓對應的列變為低電平
             for pin in self.row_pins:
                 GPIO.setup(pin, GPIO.OUT)
-                GPIO.output(pin, GPIO.HIGH)
+                GPIO.output(pin, GPIO.LOW)
 
             # 設定列 GPIO 為輸入，啟用上拉電阻
             for pin in self.col_pins:
@@ -63,52 +99,213 @@ class MatrixKeypad:
         except Exception as e:
             logger.error(f"矩陣鍵盤初始化時發生未知錯誤: {e}", exc_info=True)
 
+        self._setup_edge_detection()
+        self.start_scanning()
 
-    def get_key(self):
+    def _setup_edge_detection(self):
+        try:
+            for pin in self.col_pins:
+                GPIO.add_event_detect(pin, GPIO.FALLING, callback=self._on_column_edge)
+            self.edge_detection = True
+            logger.info("矩陣鍵盤使用 GPIO 邊緣偵測喚醒掃描")
+        except (RuntimeError, AttributeError) as e:
+            # 部分核心/函式庫版本無法加入邊緣偵測，改用背景輪詢
+            logger.warning(f"矩陣鍵盤無法啟用邊緣偵測: {e}. 改用 {self.IDLE_POLL_INTERVAL * 1000:.0f}ms 背景輪詢。")
+            self._remove_edge_detection()
+            self.edge_detection = False
+
+    def _remove_edge_detection(self):
+        for pin in self.col_pins:
+            try: GPIO.remove_event_detect(pin)
+            except Exception: pass
+
+    def _on_column_edge(self, channel):
+        self._wake.set()
+
+    def set_high_resolution(self, enabled):
         """
-        掃描鍵盤並返回按下的按鍵值。
-        如果沒有按鍵按下，返回 None。
+        高精度模式：按鍵按住時的掃描與 (無邊緣偵測時的) 閒置輪詢都改為 1ms，按鍵時間戳的誤差約 1ms。
+        會增加 CPU 使用量，只應在需要精確時間的場合開啟。
         """
-        current_time = time.time()
-        
-        # 基本的去抖動：如果距離上次有效按鍵時間太短，則忽略
-        if self.last_key and (current_time - self.last_key_press_time < self.debounce_delay * 2): # 給予更長的冷卻時間
-             # 如果是同一個按鍵持續按下，則不返回 (避免重複觸發)
-             # 若要實現長按，需要更複雜的邏輯
-            return None 
-
-        pressed_key = None
-        for r_idx, row_pin in enumerate(self.row_pins):
+        if enabled:
+            self.scan_interval = self.HIGH_RES_SCAN_INTERVAL
+            self.idle_poll_interval = self.HIGH_RES_SCAN_INTERVAL
+        else:
+            self.scan_interval = self.SCAN_INTERVAL
+            self.idle_poll_interval = self.IDLE_POLL_INTERVAL
+        self._wake.set() # 讓正在閒置等待的掃描執行緒立即套用新的間隔
+        logger.info(f"矩陣鍵盤高精度模式: {'開啟' if enabled else '關閉'}")
+
+    def start_scanning(self):
+        if self._scan_thread is None or not self._scan_thread.is_alive():
+            self._stop_scanning.clear()
+            self._scan_thread = threading.Thread(target=self._scan_loop, daemon=True)
+            self._scan_thread.start()
+            logger.info("矩陣鍵盤背景掃描已啟動")
+
+    def _set_rows(self, level):
+        for pin in self.row_pins:
+            GPIO.output(pin, level)
+
+    def _any_column_low(self):
+        return any(GPIO.input(pin) == GPIO.LOW for pin in self.col_pins)
+
+    def _scan_matrix(self):
+        """逐行拉低並讀取各列，回傳目前按下的所有按鍵 (bitmask)"""
+        self._set_rows(GPIO.HIGH)
+        mask = 0
+        bit = 1
+        for row_pin in self.row_pins:
             # 將當前行拉低
             GPIO.output(row_pin, GPIO.LOW)
-            
-            for c_idx, col_pin in enumerate(self.col_pins):
+            for col_pin in self.col_pins:
                 # 如果列為低電平，表示有按鍵按下
                 if GPIO.input(col_pin) == GPIO.LOW:
-                    # 等待一小段時間去抖動
-                    time.sleep(self.debounce_delay)
-                    # 再次確認按鍵是否仍然按下
-                    if GPIO.input(col_pin) == GPIO.LOW:
-                        pressed_key = self.layout[r_idx][c_idx]
-                        self.last_key_press_time = current_time
-                        self.last_key = pressed_key
-                        logger.debug(f"偵測到按鍵: {pressed_key}")
-                        break # 找到按鍵，跳出內層循環
-            
+                    mask |= bit
+                bit <<= 1
             # 將當前行恢復為高電平
             GPIO.output(row_pin, GPIO.HIGH)
-            
-            if pressed_key:
-                break # 找到按鍵，跳出外層循環
-        
-        if not pressed_key: # 如果這次掃描沒有按鍵，清除上次按鍵記錄
-            self.last_key = None
+        return mask
+
+    def _is_ghosted(self, mask):
+        """
+        沒有二極體的矩陣中，同時按下矩形的三個角會讓第四個角也被讀成按下。
+        任兩行共有兩個以上相同的列被按下時，無法分辨哪個是鬼鍵，整次掃描視為不可信。
+        """
+        rows = []
+        for r_idx in range(len(self.row_pins)):
+            row_bits = (mask >> (r_idx * self.num_cols)) & self._col_mask
+            if not row_bits: continue
+            for other in rows:
+                common = row_bits & other
+                if common & (common - 1): # 共有 2 個以上的位元
+                    return True
+            rows.append(row_bits)
+        return False
+
+    def _wait_while_idle(self):
+        """所有行拉低後等待任一列出現下降緣 (或輪詢逾時)"""
+        self._set_rows(GPIO.LOW)
+        self._wake.clear()
+        if self._any_column_low(): # 拉低前就已按下的按鍵不會產生下降緣
+            return
+        # 有邊緣偵測時由中斷立即喚醒，逾時只是保險；否則以 idle_poll_interval 輪詢
+        timeout = self.IDLE_RESCAN_TIMEOUT if self.edge_detection else self.idle_poll_interval
+        self._wake.wait(timeout)
+
+    def _scan_loop(self):
+        stable_mask = 0 # 去抖動後確認的按鍵狀態
+        raw_mask = 0 # 最近一次掃描的原始狀態
+        raw_since = 0 # 原始狀態開始保持不變的時間 (ns)
+        while not self._stop_scanning.is_set():
+            try:
+                if not stable_mask and not raw_mask:
+                    self._wait_while_idle()
+                    if self._stop_scanning.is_set(): break
+
+                current_mask = self._scan_matrix()
+                now = time.perf_counter_ns()
+                if current_mask != raw_mask and self._is_ghosted(current_mask):
+                    # 出現鬼鍵時沿用上一次的原始狀態，等按鍵組合改變後再判斷
+                    self.ghost_count += 1
+                    current_mask = raw_mask
+                if current_mask != raw_mask:
+                    raw_mask = current_mask
+                    raw_since = now
+                if raw_mask != stable_mask and now - raw_since >= self._debounce_ns:
+                    # 事件時間為狀態第一次被掃描到的時間，而不是去抖動完成的時間
+                    self._publish(stable_mask, raw_mask, raw_since)
+                    stable_mask = raw_mask
+
+                if stable_mask or raw_mask:
+                    self._stop_scanning.wait(self.scan_interval)
+            except RuntimeError as e:
+                logger.error(f"矩陣鍵盤掃描時發生 RuntimeError: {e}")
+                break
+            except Exception as e:
+                logger.error(f"矩陣鍵盤掃描時發生未知錯誤: {e}", exc_info=True)
+                time.sleep(0.1)
+
+    def _publish(self, old_mask, new_mask, timestamp):
+        self._state = (new_mask, timestamp)
+        changed = old_mask ^ new_mask
+        for key in self.keys_in(changed & new_mask):
+            logger.debug(f"偵測到按鍵: {key}")
+            self._events.append({"type": "press", "key": key, "timestamp": timestamp})
+        for key in self.keys_in(changed & old_mask):
+            self._events.append({"type": "release", "key": key, "timestamp": timestamp})
+
+    def keys_in(self, mask):
+        """將 bitmask 轉換為按鍵值列表 (依佈局順序)"""
+        keys = []
+        idx = 0
+        while mask:
+            if mask & 1:
+                keys.append(self._bit_keys[idx])
+            mask >>= 1
+            idx += 1
+        return keys
+
+    def get_mask(self):
+        """目前按住的所有按鍵 (bitmask)，可搭配 key_bits 判斷組合鍵"""
+        return self._state[0]
+
+    def is_pressed(self, key):
+        return bool(self._state[0] & self.key_bits.get(key, 0))
+
+    def poll(self):
+        """
+        取得鍵盤狀態快照 (KeypadState)，適合在遊戲主迴圈每幀呼叫一次。
+        按下/放開邊緣由目前 mask 與上次 poll 的 mask 做 XOR 求得；
+        狀態沒變時只需一次整數比較。去抖動後的狀態至少維持 debounce_delay，
+        只要 poll 的間隔比它短就不會漏掉按鍵。
+        """
+        mask, timestamp = self._state
+        previous = self._polled_mask
+        if mask == previous:
+            return KeypadState(mask, 0, 0, timestamp)
+        self._polled_mask = mask
+        changed = mask ^ previous
+        return KeypadState(mask, changed & mask, changed & previous, timestamp)
+
+    def clear(self):
+        """丟棄尚未取出的事件佇列，並以目前狀態作為 poll 的基準"""
+        self._events.clear()
+        self._polled_mask = self._state[0]
+
+    def get_key(self):
+        """
+        取出下一個按下的按鍵值 (非阻塞)，途中的放開事件一併丟棄。
+        掃描與去抖動都在背景執行緒完成，這裡只是 deque 取出。
+        如果沒有新的按鍵按下，返回 None。
+        """
+        while True:
+            try: event = self._events.popleft()
+            except IndexError: return None
+            if event["type"] == "press":
+                return event["key"]
+
+    def get_events(self):
+        """取出所有待處理的按下/放開事件 ({"type", "key", "timestamp"(perf_counter_ns，按鍵狀態開始改變的時間)})"""
+        events = []
+        while True:
+            try: events.append(self._events.popleft())
+            except IndexError: break
+        return events
 
-        return pressed_key
+    def stop_scanning(self):
+        logger.info("矩陣鍵盤背景掃描停止")
+        self._stop_scanning.set()
+        self._wake.set()
+        if self._scan_thread and self._scan_thread.is_alive():
+            self._scan_thread.join(timeout=1.0)
+        self._scan_thread = None
 
     def cleanup(self):
-        """清理 GPIO 資源 (可選)"""
-        # 通常由主程式統一清理 GPIO
+        """停止背景掃描並移除邊緣偵測 (GPIO 清理通常由主程式完成)"""
+        self.stop_scanning()
+        if self.edge_detection:
+            self._remove_edge_detection()
         logger.info("矩陣鍵盤清理 (通常由主程序 GPIO.cleanup() 完成)")
         # for pin in self.row_pins:
         #     GPIO.cleanup(pin)
@@ -121,6 +318,7 @@ if __name__ == '__main__':
     logging.basicConfig(level=logging.DEBUG)
     logger.info("測試 MatrixKeypad...")
 
+    keypad = None
     try:
         GPIO.setmode(GPIO.BCM)
         GPIO.setwarnings(False)
@@ -129,15 +327,10 @@ if __name__ == '__main__':
         keypad = MatrixKeypad()
         print("請按下矩陣鍵盤上的按鍵 (Ctrl+C 結束測試):")
         
-        active_key = None
         while True:
-            key = keypad.get_key()
-            if key:
-                if key != active_key : # 只有在新按鍵按下時才打印
-                    print(f"按鍵按下: {key}")
-                    active_key = key
-            else:
-                active_key = None # 按鍵已釋放
+            for event in keypad.get_events():
+                print(f"按鍵{'按下' if event['type'] == 'press' else '放開'}: {event['key']}")
+                print(f"目前按住: {keypad.keys_in(keypad.get_mask())} (鬼鍵略過次數: {keypad.ghost_count})")
 
             time.sleep(0.05) # 短暫延遲，避免 CPU 過度使用
 
@@ -148,4 +341,6 @@ if __name__ == '__main__':
         logger.error(f"測試錯誤: {e}", exc_info=True)
     finally:
         print("執行 GPIO 清理...")
+        if keypad:
+            keypad.cleanup()
         GPIO.cleanup()
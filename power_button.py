@@ -106,11 +106,11 @@ class GameControlButton:
 
                         if press_count == 1 and (current_time - short_press_detected_time) < 1.0 : # 1秒內的第一次有效按下後釋放
                             logger.info(f"GameControl 按鈕 (GPIO {self.button_pin}) 短按1次事件")
-                            self.event_queue.put({"action": "toggle_pause", "timestamp": current_time})
+                            self.event_queue.put({"action": "toggle_pause", "timestamp": time.perf_counter_ns()})
                             # press_count = 0 # 單擊後重置或等待超時重置
                         elif press_count >= 2 and (current_time - short_press_detected_time) < 1.0: # 1秒內的第二次或更多次按下後釋放
                             logger.info(f"GameControl 按鈕 (GPIO {self.button_pin}) 短按2+次事件 -> 返回選單")
-                            self.event_queue.put({"action": "return_to_menu", "timestamp": current_time})
+                            self.event_queue.put({"action": "return_to_menu", "timestamp": time.perf_counter_ns()})
                             press_count = 0 # 雙擊後重置
                 
                 # 超時重置 press_count
@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# synth_audio.py - 軟體合成音效模組 (透過 pygame.mixer 從 HDMI/耳機輸出)
+
+import os
+import logging
+import threading
+from collections import OrderedDict
+import numpy as np
+import pygame
+
+from tone_mixer import ToneMixer
+
+logger = logging.getLogger(__name__)
+
+class SynthAudioControl(ToneMixer):
+    """
+    與 BuzzerControl 相容的音效後端: 以 NumPy 合成方波或正弦波，交給 pygame.mixer 播放。
+    合成好的 Sound 依 (音符排程, 音量) 放入 LRU 快取，單音的鍵即為 (頻率, 持續時間, 音量)，
+    重複的音效只需第一次合成。多個聲道由 SDL 混音，播放不會阻塞呼叫端。
+    預定義音效與登錄表中的旋律在初始化 (及改變音量) 時預先合成，遊戲中第一次播放不需等待合成。
+    """
+    WAVEFORMS = ("square", "sine")
+    SAMPLE_RATE = 22050
+    NUM_VOICES = 8 # 同時發聲的聲道數
+    CACHE_SIZE = 64 # 快取的 Sound 數量上限
+    FADE_TIME = 0.004 # 每個音符頭尾的淡入淡出 (秒)，避免爆音
+    HEADROOM = 0.5 # 振幅上限，預留多聲道混音的空間
+    EXCLUSIVE_OUTPUT = False # 多聲道可同時發聲，不依優先權丟棄請求
+
+    def __init__(self, initial_volume=50, waveform="square", melody_library=None,
+                 num_voices=NUM_VOICES, cache_size=CACHE_SIZE, audio_driver=None):
+        """
+        :param initial_volume: 音量 (0-100)
+        :param waveform: "square" 或 "sine"
+        :param melody_library: 旋律登錄表，預設使用共用的 MELODY_LIBRARY
+        :param num_voices: pygame.mixer 聲道數
+        :param cache_size: LRU 快取大小
+        :param audio_driver: SDL 音訊驅動 (例如 "dummy" 用於無音效裝置的測試環境)，需在 mixer 初始化前設定
+        """
+        super().__init__(initial_volume, melody_library)
+        if waveform not in self.WAVEFORMS:
+            msg = f"不支援的波形: {waveform}. 可用: {self.WAVEFORMS}"
+            logger.error(msg)
+            raise ValueError(msg)
+        self.waveform = waveform
+        self.cache_size = cache_size
+        self._sound_cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self.cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+        if audio_driver and os.environ.get("SDL_AUDIODRIVER") != audio_driver:
+            os.environ["SDL_AUDIODRIVER"] = audio_driver
+            if pygame.mixer.get_init(): pygame.mixer.quit() # 以新的驅動重新初始化
+        if not pygame.mixer.get_init():
+            pygame.mixer.init(frequency=self.SAMPLE_RATE, size=-16, channels=1, buffer=512)
+        self.sample_rate, self.sample_size, self.channels = pygame.mixer.get_init()
+        if self.sample_size != -16:
+            msg = f"pygame.mixer 取樣格式 {self.sample_size} 不支援，需要 16-bit signed"
+            logger.error(msg)
+            raise RuntimeError(msg)
+        pygame.mixer.set_num_channels(num_voices)
+        logger.info(f"SynthAudioControl 初始化 ({waveform}, {self.sample_rate}Hz, {self.channels} 聲道輸出, {num_voices} 個聲部)")
+        self.prewarm_cache()
+
+    @property
+    def is_playing(self):
+        return pygame.mixer.get_init() is not None and pygame.mixer.get_busy()
+
+    def _synthesize(self, notes):
+        """把音符排程合成為單一 pygame.mixer.Sound"""
+        amplitude = 32767 * self.HEADROOM * self.volume / 100.0
+        fade_samples = int(self.sample_rate * self.FADE_TIME)
+        parts = []
+        for frequency, duration, gap in notes:
+            n = max(1, int(self.sample_rate * duration))
+            phase = 2 * np.pi * frequency * np.arange(n) / self.sample_rate
+            wave = np.sin(phase)
+            if self.waveform == "square":
+                wave = np.sign(wave)
+            fade = min(fade_samples, n // 2)
+            if fade > 0:
+                ramp = np.linspace(0.0, 1.0, fade)
+                wave[:fade] *= ramp
+                wave[-fade:] *= ramp[::-1]
+            parts.append((wave * amplitude).astype(np.int16))
+            if gap > 0:
+                parts.append(np.zeros(int(self.sample_rate * gap), dtype=np.int16))
+        samples = np.concatenate(parts) if parts else np.zeros(1, dtype=np.int16)
+        if self.channels > 1:
+            samples = np.ascontiguousarray(np.repeat(samples[:, np.newaxis], self.channels, axis=1))
+        return pygame.sndarray.make_sound(samples)
+
+    def _get_sound(self, notes):
+        key = (notes, self.volume)
+        with self._cache_lock:
+            sound = self._sound_cache.get(key)
+            if sound is not None:
+                self._sound_cache.move_to_end(key)
+                self.cache_stats["hits"] += 1
+                return sound
+        sound = self._synthesize(notes)
+        with self._cache_lock:
+            self.cache_stats["misses"] += 1
+            self._sound_cache[key] = sound
+            while len(self._sound_cache) > self.cache_size:
+                self._sound_cache.popitem(last=False)
+                self.cache_stats["evictions"] += 1
+        return sound
+
+    def prewarm_cache(self):
+        """以目前音量預先合成所有預定義音效與登錄表中的旋律，避免遊戲執行緒在第一次播放時合成"""
+        jobs = [((frequency, duration, 0.0),) for frequency, duration in self.sounds.values()]
+        jobs += [self.melodies.get(name)[0] for name in self.melodies.names()]
+        for notes in jobs[:self.cache_size]:
+            self._get_sound(notes)
+        logger.debug(f"合成音效快取已預熱 ({min(len(jobs), self.cache_size)} 個 Sound, 音量 {self.volume}%)")
+
+    def _enqueue(self, notes):
+        """取得 (或合成) Sound 並在空閒聲道播放；沒有空閒聲道時搶佔最舊的聲道"""
+        if not notes:
+            return
+        try:
+            sound = self._get_sound(notes)
+            channel = pygame.mixer.find_channel(True)
+            if channel:
+                channel.play(sound)
+        except pygame.error as e:
+            logger.error(f"合成音效播放失敗: {e}")
+
+    def set_volume(self, volume_percent):
+        """
+        設定音量。已快取的 Sound 以音量為鍵，新音量會重新預熱快取。
+        :param volume_percent: 0 到 100 之間的整數。
+        """
+        if 0 <= volume_percent <= 100:
+            self.volume = volume_percent
+            logger.info(f"合成音效音量設定為: {self.volume}%")
+            self.prewarm_cache()
+        else:
+            logger.warning(f"無效的音量值: {volume_percent}. 請輸入 0-100 之間的值。")
+
+    def stop(self):
+        """停止所有聲道"""
+        self._clear_active_job()
+        if pygame.mixer.get_init():
+            pygame.mixer.stop()
+
+    def clear_cache(self):
+        with self._cache_lock:
+            self._sound_cache.clear()
+
+    def cleanup(self):
+        logger.info(f"清理合成音效 (混音統計: {self.get_mixer_stats()}, 快取統計: {self.cache_stats})")
+        self.stop()
+        self.clear_cache()
+        # pygame.mixer 由主程式的 pygame.quit() 統一關閉
+
+
+if __name__ == '__main__':
+    # 簡單測試程式碼，沒有音效裝置時可用 SDL_AUDIODRIVER=dummy 執行
+    import time
+    logging.basicConfig(level=logging.DEBUG)
+    pygame.init()
+    audio = None
+    try:
+        audio = SynthAudioControl(initial_volume=60, audio_driver=os.environ.get("SDL_AUDIODRIVER"))
+        print("播放啟動音效...")
+        audio.play_startup_melody()
+        time.sleep(1)
+
+        print("同時播放多個音效...")
+        audio.play_tone(frequency=440, duration=0.5)
+        audio.play_tone(frequency=660, duration=0.5, category="level_up")
+        time.sleep(0.6)
+
+        print("重複播放相同音效 (應命中快取)...")
+        for _ in range(5):
+            audio.play_tone("select")
+            time.sleep(0.1)
+        print(f"快取統計: {audio.cache_stats}")
+        print("測試完成。")
+    except KeyboardInterrupt:
+        print("測試被中斷")
+    except Exception as e:
+        print(f"測試過程中發生錯誤: {e}")
+        logger.error(f"測試錯誤: {e}", exc_info=True)
+    finally:
+        if audio:
+            audio.cleanup()
+        pygame.quit()
@@ -0,0 +1,76 @@
+import numpy as np
+
+from crowd import separation
+
+
+def brute_force(xs, ys, radii, strength=0.5):
+    dx = xs[:, None] - xs[None, :]
+    dy = ys[:, None] - ys[None, :]
+    distance = np.hypot(dx, dy)
+    overlap = np.maximum(radii[:, None] + radii[None, :] - distance, 0.0)
+    np.fill_diagonal(overlap, 0.0)
+    scale = overlap * (strength * 0.5) / np.where(distance > 0, distance, 1.0)
+    return (dx * scale).sum(axis=1), (dy * scale).sum(axis=1)
+
+
+def test_matches_all_pairs_when_cells_are_not_crowded():
+    rng = np.random.default_rng(3)
+    xs = rng.uniform(0, 400, 300)
+    ys = rng.uniform(0, 300, 300)
+    radii = rng.uniform(3, 9, 300)
+    push_x, push_y = separation(xs, ys, radii, max_per_cell=1000)
+    expected_x, expected_y = brute_force(xs, ys, radii)
+    assert np.allclose(push_x, expected_x) and np.allclose(push_y, expected_y)
+
+
+def test_pairs_are_pushed_apart_symmetrically():
+    push_x, push_y = separation(np.array([0.0, 6.0, 100.0]), np.array([0.0, 8.0, 0.0]), np.array([10.0, 10.0, 10.0]))
+    # Overlap is 20 - 10 = 10, half of strength 0.5 each along the 0.6/0.8 direction
+    assert np.allclose(push_x, [-1.5, 1.5, 0.0]) and np.allclose(push_y, [-2.0, 2.0, 0.0])
+
+
+def test_touching_but_not_overlapping_agents_do_not_move():
+    push_x, push_y = separation(np.array([0.0, 20.0]), np.array([0.0, 0.0]), np.array([10.0, 10.0]))
+    assert not push_x.any() and not push_y.any()
+
+
+def test_coincident_agents_are_split_sideways():
+    push_x, push_y = separation(np.array([5.0, 5.0]), np.array([5.0, 5.0]), np.array([4.0, 4.0]))
+    assert push_x[0] < 0 < push_x[1]
+    assert np.isclose(push_x[0], -push_x[1]) and not push_y.any()
+
+
+def test_crowded_cells_are_capped_but_still_push():
+    # 50 agents piled into one spot: each sees at most max_per_cell of them per cell
+    rng = np.random.default_rng(4)
+    xs = 10 + rng.uniform(-1, 1, 50)
+    ys = 10 + rng.uniform(-1, 1, 50)
+    radii = np.full(50, 5.0)
+    capped_x, capped_y = separation(xs, ys, radii, max_per_cell=4)
+    full_x, full_y = separation(xs, ys, radii, max_per_cell=1000)
+    assert np.isfinite(capped_x).all() and np.isfinite(capped_y).all()
+    assert np.hypot(capped_x, capped_y).sum() < np.hypot(full_x, full_y).sum()
+    assert (np.hypot(capped_x, capped_y) > 0).mean() > 0.5
+
+
+def test_repeated_passes_spread_a_pile():
+    rng = np.random.default_rng(5)
+    xs = 500 + rng.normal(0, 1, 100)
+    ys = 500 + rng.normal(0, 1, 100)
+    radii = np.full(100, 6.0)
+    for _ in range(300):
+        push_x, push_y = separation(xs, ys, radii)
+        xs += push_x
+        ys += push_y
+    distance = np.hypot(xs[:, None] - xs, ys[:, None] - ys)
+    np.fill_diagonal(distance, np.inf)
+    assert distance.min() > 0.9 * 12
+
+
+def test_degenerate_inputs():
+    for count in (0, 1):
+        push_x, push_y = separation(np.zeros(count), np.zeros(count), np.ones(count))
+        assert push_x.shape == (count,) and push_y.shape == (count,)
+    # Integer radii and float32 positions, as the enemy store provides them
+    push_x, _ = separation(np.array([0, 3], dtype=np.float32), np.zeros(2, dtype=np.float32), np.array([2, 2], dtype=np.int16))
+    assert np.allclose(push_x, [-0.25, 0.25])
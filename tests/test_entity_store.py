@@ -0,0 +1,82 @@
+import numpy as np
+
+from entity_store import EntityStore
+
+
+def make_store(capacity=8):
+    return EntityStore(capacity, x=np.float64, tag=np.int32, velocity=(np.float32, 2))
+
+
+def test_add_fills_components_and_reports_full():
+    store = make_store(2)
+    assert store.add(x=1.5, tag=7, velocity=(1, 2)) == 0
+    assert store.add(x=2.5) == 1
+    assert store.full
+    assert store.add(x=3.5) == -1
+    assert len(store) == 2
+    assert store.view('x').tolist() == [1.5, 2.5]
+    assert store.view('tag').tolist() == [7, 0]
+    assert store.view('velocity').tolist() == [[1, 2], [0, 0]]
+
+
+def test_add_many_broadcasts_scalars_and_truncates_at_capacity():
+    store = make_store(5)
+    store.add(x=0.0)
+    added = store.add_many(10, x=np.arange(10, dtype=np.float64), tag=3, velocity=(1, -1))
+    assert added == slice(1, 5)
+    assert store.view('x').tolist() == [0, 0, 1, 2, 3]
+    assert store.view('tag').tolist() == [0, 3, 3, 3, 3]
+    assert store.view('velocity')[1:].tolist() == [[1, -1]] * 4
+    assert store.alive[:5].all()
+    assert store.add_many(3, x=1.0) == slice(5, 5)
+
+
+def test_kill_keeps_indices_valid_until_compact():
+    store = make_store()
+    store.add_many(4, x=np.array([10.0, 11.0, 12.0, 13.0]))
+    store.kill(1)
+    store.kill_mask(np.array([False, False, False, True]))
+    assert len(store) == 4
+    assert store.view('x').tolist() == [10, 11, 12, 13]
+    assert [store.is_alive(i) for i in range(4)] == [True, False, True, False]
+
+
+def test_compact_keeps_every_live_row_intact():
+    rng = np.random.default_rng(5)
+    store = make_store(200)
+    ids = np.arange(200)
+    store.add_many(200, x=ids.astype(np.float64), tag=ids, velocity=np.stack([ids, -ids], axis=1))
+    for _ in range(5):
+        dead = rng.random(len(store)) < 0.3
+        expected = set(store.view('tag')[~dead].tolist())
+        store.kill_mask(dead)
+        store.compact()
+        tags = store.view('tag')
+        assert len(store) == len(expected)
+        assert set(tags.tolist()) == expected
+        assert store.alive[:len(store)].all() and not store.alive[len(store):].any()
+        # Every component of a row still belongs to the same entity
+        assert (store.view('x') == tags).all()
+        assert (store.view('velocity')[:, 0] == tags).all()
+        assert (store.view('velocity')[:, 1] == -tags).all()
+
+
+def test_compact_moves_only_tail_entities_into_holes():
+    store = make_store()
+    store.add_many(5, tag=np.array([0, 1, 2, 3, 4]))
+    store.kill(1)
+    store.kill(4)
+    store.compact()
+    # Slot 1 is filled from the tail; 0 and 2 never move
+    assert store.view('tag').tolist() == [0, 3, 2]
+
+
+def test_compact_without_deaths_and_after_clear():
+    store = make_store()
+    store.add_many(3, tag=np.array([1, 2, 3]))
+    store.compact()
+    assert store.view('tag').tolist() == [1, 2, 3]
+    store.clear()
+    assert len(store) == 0 and not store.alive.any()
+    store.compact()
+    assert len(store) == 0
@@ -0,0 +1,96 @@
+import numpy as np
+
+from flow_field import UNREACHABLE, FlowField
+
+
+def make_field(rows, cols, blocked_cells=()):
+    field = FlowField(cols * 10, rows * 10, cell_size=10)
+    blocked = np.zeros((rows, cols), dtype=bool)
+    for col, row in blocked_cells:
+        blocked[row, col] = True
+    field.set_blocked(blocked)
+    return field
+
+
+def center(col, row):
+    return col * 10 + 5, row * 10 + 5
+
+
+def walk(field, col, row, limit=100):
+    """Follow the field from a cell; returns the visited cells"""
+    path = [(col, row)]
+    for _ in range(limit):
+        step_x = int(np.sign(field.dir_x[row, col]))
+        step_y = int(np.sign(field.dir_y[row, col]))
+        if not step_x and not step_y:
+            break
+        col, row = col + step_x, row + step_y
+        path.append((col, row))
+    return path
+
+
+def test_distances_are_4_connected_bfs_around_walls():
+    # Wall across column 2 with a gap at the bottom row
+    field = make_field(4, 5, [(2, 0), (2, 1), (2, 2)])
+    field.update(*center(0, 0))
+    assert field.distance[0, 0] == 0
+    assert field.distance[0, 1] == 1
+    assert field.distance[3, 2] == 5
+    assert field.distance[0, 3] == 9
+    assert (field.distance[field.blocked] == UNREACHABLE).all()
+
+
+def test_every_reachable_cell_flows_to_the_target():
+    rng = np.random.default_rng(7)
+    field = make_field(12, 16)
+    blocked = rng.random((12, 16)) < 0.25
+    blocked[6, 8] = False
+    field.set_blocked(blocked)
+    field.update(*center(8, 6))
+    for row in range(12):
+        for col in range(16):
+            if field.distance[row, col] == UNREACHABLE:
+                continue
+            path = walk(field, col, row)
+            assert path[-1] == (8, 6)
+            assert not any(field.blocked[r, c] for c, r in path)
+            # Each step strictly lowers the BFS distance
+            distances = [field.distance[r, c] for c, r in path]
+            assert distances == sorted(distances, reverse=True) and len(set(distances)) == len(distances)
+
+
+def test_diagonal_steps_never_cut_a_blocked_corner():
+    # Target up-right of the start with one orthogonal neighbour blocked
+    field = make_field(3, 3, [(1, 1)])
+    field.update(*center(2, 0))
+    # From (1, 2): a diagonal to (2, 1) would squeeze past the block at (1, 1)
+    assert (field.dir_x[2, 1], field.dir_y[2, 1]) == (1.0, 0.0)
+    # In open space a diagonal is taken and normalised
+    open_field = make_field(3, 3)
+    open_field.update(*center(2, 0))
+    assert np.isclose(open_field.dir_x[2, 0], np.sqrt(0.5)) and np.isclose(open_field.dir_y[2, 0], -np.sqrt(0.5))
+
+
+def test_lookup_has_no_flow_in_target_cell_or_when_cut_off():
+    # Cell (0, 0) is walled in
+    field = make_field(3, 3, [(1, 0), (0, 1), (1, 1)])
+    field.update(*center(2, 2))
+    dir_x, dir_y, has_flow = field.lookup(np.array([5.0, 25.0, 25.0]), np.array([5.0, 25.0, 5.0]))
+    assert has_flow.tolist() == [False, False, True]
+    assert (dir_x[2], dir_y[2]) == (0.0, 1.0)
+
+
+def test_update_recomputes_only_when_target_changes_cell():
+    field = make_field(3, 3)
+    assert field.update(1, 1)
+    assert not field.update(8, 8)
+    assert field.update(15, 1)
+    field.set_blocked(np.zeros((3, 3), dtype=bool))
+    assert field.update(15, 1)
+
+
+def test_positions_outside_the_grid_clamp_to_edge_cells():
+    field = make_field(2, 2, [(1, 1)])
+    assert field.cell_of(-50, 500) == (0, 1)
+    assert field.blocked_at(500, 500)
+    assert field.blocked_mask(np.array([-5.0, 25.0]), np.array([-5.0, 25.0])).tolist() == [False, True]
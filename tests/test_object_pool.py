@@ -0,0 +1,99 @@
+import pytest
+
+from object_pool import SLOT_MASK, ObjectPool
+
+
+class Thing:
+    def __init__(self):
+        self.value = 0
+
+
+def test_acquire_until_exhausted():
+    pool = ObjectPool(3, Thing)
+    handles = [pool.acquire() for _ in range(3)]
+    assert None not in handles and len(set(handles)) == 3
+    assert pool.full and len(pool) == 3
+    assert pool.acquire() is None
+
+
+def test_capacity_limited_by_slot_bits():
+    with pytest.raises(ValueError):
+        ObjectPool(SLOT_MASK + 2, Thing)
+
+
+def test_stale_handle_does_not_resolve_after_slot_reuse():
+    pool = ObjectPool(1, Thing)
+    old = pool.acquire()
+    obj = pool[old]
+    assert pool.release(old)
+    new = pool.acquire()
+    # Same slot and object, new generation
+    assert new & SLOT_MASK == old & SLOT_MASK and new != old
+    assert pool.get(new) is obj
+    assert pool.get(old) is None and not pool.is_alive(old)
+    with pytest.raises(KeyError):
+        pool[old]
+    # Releasing the stale handle must not free the new occupant
+    assert not pool.release(old)
+    assert pool.is_alive(new)
+
+
+def test_release_swap_removes_and_keeps_iteration_dense():
+    pool = ObjectPool(5, Thing)
+    handles = []
+    for value in range(5):
+        handle = pool.acquire()
+        pool[handle].value = value
+        handles.append(handle)
+    pool.release(handles[1])
+    pool.release(handles[3])
+    assert len(pool) == 3
+    assert sorted(obj.value for obj in pool) == [0, 2, 4]
+    assert {handle for handle, _ in pool.items()} == {handles[0], handles[2], handles[4]}
+
+
+def test_release_during_items_defers_slot_reuse():
+    pool = ObjectPool(4, Thing)
+    handles = [pool.acquire() for _ in range(4)]
+    for value, handle in enumerate(handles):
+        pool[handle].value = value
+    visited = []
+    for handle, obj in pool.items():
+        visited.append(obj.value)
+        if obj.value == 0:
+            # Release something not yet visited and the current object
+            assert pool.release(handles[2])
+            assert pool.release(handle)
+            assert len(pool) == 2
+            assert not pool.is_alive(handles[2])
+            # Released slots are not recycled while iterating
+            assert pool.acquire() is None
+    assert visited == [0, 1, 3]
+    assert len(pool) == 2
+    # After the pass the released slots are free again
+    assert pool.acquire() is not None and pool.acquire() is not None
+    assert pool.full
+
+
+def test_objects_acquired_during_items_are_not_visited():
+    pool = ObjectPool(4, Thing)
+    pool.acquire()
+    visited = 0
+    for _ in pool.items():
+        visited += 1
+        pool.acquire()
+    assert visited == 1 and len(pool) == 2
+
+
+def test_clear_invalidates_handles_inside_and_outside_iteration():
+    pool = ObjectPool(3, Thing)
+    handles = [pool.acquire() for _ in range(3)]
+    for _ in pool.items():
+        pool.clear()
+        assert len(pool) == 0
+    assert not any(pool.is_alive(handle) for handle in handles)
+    assert len(pool) == 0 and not pool.full
+    handles = [pool.acquire() for _ in range(2)]
+    pool.clear()
+    assert not any(pool.is_alive(handle) for handle in handles)
+    assert [pool.acquire() is not None for _ in range(3)] == [True] * 3
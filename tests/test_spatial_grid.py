@@ -0,0 +1,92 @@
+import math
+import random
+
+import numpy as np
+
+from spatial_grid import SpatialGrid
+
+
+def brute_radius(xs, ys, radii, x, y, radius, include_radius=False):
+    result = []
+    for i in range(len(xs)):
+        limit = radius + (radii[i] if include_radius else 0)
+        if math.hypot(xs[i] - x, ys[i] - y) <= limit:
+            result.append(i)
+    return result
+
+
+def random_points(count, seed, span=1000):
+    rng = random.Random(seed)
+    xs = [rng.uniform(-span, span) for _ in range(count)]
+    ys = [rng.uniform(-span, span) for _ in range(count)]
+    radii = [rng.uniform(2, 30) for _ in range(count)]
+    return xs, ys, radii
+
+
+def test_query_radius_matches_brute_force():
+    xs, ys, radii = random_points(500, seed=1)
+    grid = SpatialGrid(64)
+    grid.rebuild(xs, ys, radii)
+    rng = random.Random(2)
+    for _ in range(50):
+        x, y, radius = rng.uniform(-1000, 1000), rng.uniform(-1000, 1000), rng.uniform(0, 300)
+        for include_radius in (False, True):
+            expected = brute_radius(xs, ys, radii, x, y, radius, include_radius)
+            assert sorted(grid.query_radius(x, y, radius, include_radius)) == expected
+
+
+def test_query_radius_with_box_larger_than_occupied_cells():
+    grid = SpatialGrid(10)
+    grid.rebuild([0, 5000], [0, -5000], [1, 1])
+    assert sorted(grid.query_radius(0, 0, 10000)) == [0, 1]
+
+
+def test_rebuild_accepts_numpy_arrays():
+    grid = SpatialGrid(32)
+    grid.rebuild(np.array([0.0, 100.0]), np.array([0.0, 0.0]), np.array([5.0, 5.0]))
+    assert grid.query_radius(0, 0, 1) == [0]
+    assert grid.max_radius == 5.0
+
+
+def test_nearest_returns_k_closest_in_order():
+    xs, ys, radii = random_points(400, seed=3)
+    grid = SpatialGrid(50)
+    grid.rebuild(xs, ys, radii)
+    rng = random.Random(4)
+    for _ in range(30):
+        x, y = rng.uniform(-1200, 1200), rng.uniform(-1200, 1200)
+        expected = sorted((math.hypot(xs[i] - x, ys[i] - y), i) for i in range(len(xs)))[:5]
+        result = grid.nearest(x, y, k=5)
+        assert [i for _, i in result] == [i for _, i in expected]
+        assert [d for d, _ in result] == sorted(d for d, _ in result)
+
+
+def test_nearest_honours_skip_and_max_distance():
+    grid = SpatialGrid(10)
+    grid.rebuild([0, 3, 50], [0, 0, 0])
+    assert grid.nearest(0, 0, k=1, skip=lambda i: i == 0) == [(3.0, 1)]
+    assert grid.nearest(0, 0, k=3, max_distance=10) == [(0.0, 0), (3.0, 1)]
+    assert SpatialGrid(10).nearest(0, 0) == []
+
+
+def test_query_segment_finds_entity_hit_mid_sweep():
+    grid = SpatialGrid(16)
+    # Far from both endpoints, right on the path of a fast projectile
+    grid.rebuild([150, 400, 150], [0, 3, 40], [5, 5, 5])
+    hits = grid.query_segment(0, 0, 600, 0, 2, include_radius=True)
+    assert hits == [0, 1]
+    assert grid.query_radius(0, 0, 2, include_radius=True) == []
+    assert grid.query_radius(600, 0, 2, include_radius=True) == []
+
+
+def test_query_segment_orders_by_first_contact():
+    grid = SpatialGrid(16)
+    grid.rebuild([300, 100, 200], [0, 0, 0])
+    assert grid.query_segment(0, 0, 400, 0, 1) == [1, 2, 0]
+    assert grid.query_segment(400, 0, 0, 0, 1) == [0, 2, 1]
+
+
+def test_query_segment_of_zero_length_is_a_radius_query():
+    grid = SpatialGrid(16)
+    grid.rebuild([0, 10], [0, 0])
+    assert grid.query_segment(0, 0, 0, 0, 5) == [0]
@@ -0,0 +1,272 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+# tone_mixer.py - 音效 API、混音層與旋律登錄表 (不依賴 GPIO，BuzzerControl 與 SynthAudioControl 共用)
+
+import time
+import logging
+import threading
+from abc import ABC, abstractmethod
+
+logger = logging.getLogger(__name__)
+
+# --- 旋律定義 ---
+# 每段旋律: notes 為 (音名, 持續時間 秒) 列表，音名如 "C4"、"F#5"、"Bb3"，"R" 代表休止符
+# gap 為每個音符後的停頓，category 為混音類別 (見 BuzzerControl.CATEGORY_PRIORITY)
+MELODY_DEFINITIONS = {
+    "startup": {"notes": [("C4", 0.15), ("E4", 0.15), ("G4", 0.15), ("C5", 0.3)], "gap": 0.05, "category": "level_up"},
+    "shutdown": {"notes": [("C5", 0.3), ("G4", 0.15), ("E4", 0.15), ("C4", 0.15)], "gap": 0.05, "category": "game_over"},
+    "game_over_melody": {"notes": [("G4", 0.2), ("E4", 0.2), ("C4", 0.2), ("G3", 0.5)], "gap": 0.05, "category": "game_over"},
+    "game_over_melody_invaders": {"notes": [("G3", 0.15), ("F#3", 0.15), ("F3", 0.15), ("E3", 0.5)], "gap": 0.03, "category": "game_over"},
+    "win_melody": {"notes": [("C5", 0.12), ("E5", 0.12), ("G5", 0.12), ("C6", 0.4)], "gap": 0.04, "category": "level_up"},
+    "level_up": {"notes": [("C5", 0.15), ("E5", 0.15), ("G5", 0.15), ("C6", 0.15)], "gap": 0.05, "category": "level_up"},
+    "level_clear": {"notes": [("D5", 0.06), ("F#5", 0.06), ("A5", 0.06), ("C6", 0.06)], "gap": 0.04, "category": "level_up"},
+    "maze_exit": {"notes": [("C5", 0.2), ("E5", 0.2), ("G5", 0.2), ("C6", 0.2), ("E6", 0.2)], "gap": 0.1, "category": "level_up"},
+    "special_food": {"notes": [("B5", 0.1), ("D6", 0.1)], "gap": 0.05, "category": "hit"},
+    "score": {"notes": [("C6", 0.05), ("G6", 0.08)], "gap": 0.02, "category": "hit"},
+    "single_line_clear": {"notes": [("E5", 0.08), ("A5", 0.12)], "gap": 0.03, "category": "hit"},
+    "multi_line_clear": {"notes": [("E5", 0.08), ("A5", 0.08), ("C#6", 0.08), ("E6", 0.15)], "gap": 0.03, "category": "level_up"},
+    "tetris_fanfare": {"notes": [("C5", 0.1), ("C5", 0.1), ("C5", 0.1), ("G5", 0.25), ("R", 0.05), ("E5", 0.1), ("G5", 0.1), ("C6", 0.4)], "gap": 0.03, "category": "level_up"},
+}
+
+NOTE_SEMITONES = {"C": 0, "D": 2, "E": 4, "F": 5, "G": 7, "A": 9, "B": 11}
+
+def note_to_frequency(note):
+    """音名轉頻率 (Hz, 取整數)，以 A4 = 440Hz 的十二平均律計算。休止符 "R" 回傳 0。"""
+    if note == "R":
+        return 0
+    try:
+        semitone = NOTE_SEMITONES[note[0].upper()]
+        accidental = note[1:-1]
+        octave = int(note[-1])
+    except (KeyError, ValueError, IndexError):
+        raise ValueError(f"無效的音名: {note}")
+    if accidental == "#": semitone += 1
+    elif accidental == "b": semitone -= 1
+    elif accidental: raise ValueError(f"無效的音名: {note}")
+    midi = (octave + 1) * 12 + semitone
+    return int(round(440.0 * 2 ** ((midi - 69) / 12.0)))
+
+def compile_melody(definition):
+    """
+    把旋律定義編譯成扁平的排程 ((頻率, 發聲時間, 靜音時間), ...)，可直接交給音序器。
+    休止符併入前一個音符的靜音時間。
+    """
+    gap = definition.get("gap", 0.0)
+    schedule = []
+    for note, duration in definition["notes"]:
+        if duration <= 0:
+            raise ValueError(f"無效的音符持續時間: {note} {duration}")
+        frequency = note_to_frequency(note)
+        if frequency == 0:
+            if schedule:
+                freq, on_time, off_time = schedule[-1]
+                schedule[-1] = (freq, on_time, off_time + duration)
+            continue
+        schedule.append((frequency, duration, gap))
+    return tuple(schedule)
+
+class MelodyLibrary:
+    """旋律登錄表: 定義在登錄時編譯一次，之後播放只需查表"""
+    def __init__(self, definitions=None):
+        self._schedules = {}
+        self._categories = {}
+        for name, definition in (definitions or {}).items():
+            self.register(name, definition)
+
+    def register(self, name, definition):
+        self._schedules[name] = compile_melody(definition)
+        self._categories[name] = definition.get("category", ToneMixer.DEFAULT_MELODY_CATEGORY)
+        logger.debug(f"登錄旋律: {name} ({len(self._schedules[name])} 個音符)")
+
+    def get(self, name):
+        """回傳 (排程, 類別)，找不到時回傳 (None, None)"""
+        return self._schedules.get(name), self._categories.get(name)
+
+    def names(self):
+        return list(self._schedules.keys())
+
+    def __contains__(self, name):
+        return name in self._schedules
+
+class ToneMixer(ABC):
+    """音效 API 與混音層，BuzzerControl 與其他相容的音效後端共用；子類別必須實作 _enqueue 負責實際輸出，否則無法建立"""
+    # 混音層: 音效類別的優先權 (數字越大越優先)，遊戲結束 > 升級 > 打擊 > 介面
+    CATEGORY_PRIORITY = {
+        "game_over": 3,
+        "level_up": 2,
+        "hit": 1,
+        "ui": 0,
+    }
+    # 各類別兩次播放之間的最小間隔 (秒)，間隔內的請求直接丟棄
+    CATEGORY_MIN_INTERVAL = {
+        "game_over": 0.0,
+        "level_up": 0.05,
+        "hit": 0.03,
+        "ui": 0.02,
+    }
+    # 預定義音效所屬的類別，未列出者視為 "ui"
+    SOUND_CATEGORIES = {
+        "game_over": "game_over",
+        "error": "ui",
+    }
+    DEFAULT_TONE_CATEGORY = "hit" # 自訂頻率音效的預設類別
+    DEFAULT_MELODY_CATEGORY = "level_up" # 旋律的預設類別
+    MERGE_WINDOW = 1.0 / 60 # 一個畫面時間內的相同音效合併為一次
+    EXCLUSIVE_OUTPUT = True # 輸出端一次只能發一個聲音時，才需要依優先權丟棄請求
+
+    def __init__(self, initial_volume=50, melody_library=None):
+        self.melodies = melody_library if melody_library is not None else MELODY_LIBRARY # 預設使用所有遊戲共用的登錄表
+        self.volume = initial_volume # 預設音量 (0-100)
+
+        # 混音層狀態 (在呼叫端執行緒中仲裁，只有通過的工作才會交給輸出端)
+        self._mixer_lock = threading.Lock()
+        self._active_priority = -1 # 目前播放中工作的優先權
+        self._active_until = 0 # 目前播放中工作的預計結束時間
+        self._category_last_time = {} # 以 time.monotonic() 計時，不受系統時鐘校正 (NTP) 影響
+        self._merge_window_start = float("-inf")
+        self._merge_window_jobs = set()
+        self.mixer_stats = {"queued": 0, "merged": 0, "dropped": 0}
+
+        # 預定義音效 (頻率 Hz, 持續時間 秒)
+        self.sounds = {
+            "select": (1000, 0.05),
+            "navigate": (800, 0.05),
+            "game_start": (1200, 0.1),
+            "game_over": (500, 0.3),
+            "back": (600, 0.05),
+            "error": (300, 0.5),
+        }
+
+    @abstractmethod
+    def _enqueue(self, notes):
+        """輸出一個已通過混音層的工作 ((頻率, 發聲時間, 靜音時間), ...)，由子類別實作，必須立即返回"""
+
+    def _submit(self, notes, category):
+        """
+        混音層: 決定工作是否送進音序器。
+        1. 同一個畫面時間內的相同工作只播放一次 (合併)
+        2. 同類別在最小間隔內的重複請求丟棄 (限流)
+        3. 播放中的工作優先權較高時，丟棄較低優先權的請求；否則新工作中斷舊工作
+        """
+        notes = tuple(notes)
+        if category not in self.CATEGORY_PRIORITY:
+            logger.warning(f"未知的音效類別: {category}，改用 {self.DEFAULT_TONE_CATEGORY}")
+            category = self.DEFAULT_TONE_CATEGORY
+        priority = self.CATEGORY_PRIORITY[category]
+        with self._mixer_lock:
+            current_time = time.monotonic()
+            if current_time - self._merge_window_start >= self.MERGE_WINDOW:
+                self._merge_window_start = current_time
+                self._merge_window_jobs.clear()
+            if notes in self._merge_window_jobs:
+                self.mixer_stats["merged"] += 1
+                return False
+            if current_time - self._category_last_time.get(category, float("-inf")) < self.CATEGORY_MIN_INTERVAL[category]:
+                self.mixer_stats["dropped"] += 1
+                return False
+            if self.EXCLUSIVE_OUTPUT and priority < self._active_priority and current_time < self._active_until:
+                self.mixer_stats["dropped"] += 1
+                return False
+
+            self._merge_window_jobs.add(notes) # 只有真正送出的工作才會合併之後的相同請求
+            self._category_last_time[category] = current_time
+            self._active_priority = priority
+            self._active_until = current_time + sum(duration + gap for _, duration, gap in notes)
+            self.mixer_stats["queued"] += 1
+        self._enqueue(notes)
+        return True
+
+    def _clear_active_job(self):
+        with self._mixer_lock:
+            self._active_priority = -1
+            self._active_until = 0
+
+    def get_mixer_stats(self):
+        """回傳混音層計數 (queued: 送進音序器, merged: 合併, dropped: 限流或優先權不足而丟棄)"""
+        with self._mixer_lock:
+            return dict(self.mixer_stats)
+
+    def _play(self, frequency, duration, category=DEFAULT_TONE_CATEGORY):
+        if frequency <= 0 or duration <= 0:
+            logger.warning(f"無效的頻率 ({frequency}) 或持續時間 ({duration})")
+            return
+        self._submit(((frequency, duration, 0.0),), category)
+
+    def play_tone(self, sound_name=None, frequency=None, duration=None, category=None):
+        """
+        播放預定義音效或指定頻率和持續時間的音效 (非阻塞)。
+        :param sound_name: 預定義音效的名稱 (如 "select", "game_over")
+        :param frequency: 自訂頻率 (Hz)
+        :param duration: 自訂持續時間 (秒)
+        :param category: 混音類別 ("game_over", "level_up", "hit", "ui")，未指定時依音效自動判斷
+        """
+        if sound_name and sound_name in self.sounds:
+            freq, dur = self.sounds[sound_name]
+            logger.debug(f"播放預定義音效: {sound_name} (Freq: {freq}Hz, Dur: {dur}s)")
+            self._play(freq, dur, category or self.SOUND_CATEGORIES.get(sound_name, "ui"))
+        elif sound_name and sound_name in self.melodies:
+            self.play_named_melody(sound_name, category)
+        elif frequency and duration:
+            logger.debug(f"播放自訂音效 (Freq: {frequency}Hz, Dur: {duration}s)")
+            self._play(frequency, duration, category or self.DEFAULT_TONE_CATEGORY)
+        else:
+            logger.warning("未指定有效的音效名稱或頻率/持續時間")
+
+    def play_melody(self, notes, gap=0.0, category=DEFAULT_MELODY_CATEGORY):
+        """
+        播放一段旋律 (非阻塞)，整段旋律作為單一工作交給音序器。
+        :param notes: (頻率, 持續時間) 或 (頻率, 持續時間, 音符後停頓) 的列表
+        :param gap: 未指定停頓時使用的音符間停頓 (秒)
+        :param category: 混音類別，預設為 "level_up"
+        """
+        schedule = []
+        for note in notes:
+            frequency, duration = note[0], note[1]
+            note_gap = note[2] if len(note) > 2 else gap
+            if frequency <= 0 or duration <= 0:
+                logger.warning(f"旋律中略過無效音符 ({frequency}Hz, {duration}s)")
+                continue
+            schedule.append((frequency, duration, note_gap))
+        if schedule:
+            self._submit(schedule, category)
+
+    def play_named_melody(self, name, category=None):
+        """
+        播放登錄表中的旋律 (非阻塞)，排程已預先編譯，只需一次佇列推送。
+        :param name: 旋律名稱 (見 MELODY_DEFINITIONS)
+        :param category: 覆寫旋律定義中的混音類別
+        """
+        schedule, default_category = self.melodies.get(name)
+        if schedule is None:
+            logger.warning(f"未登錄的旋律: {name}")
+            return
+        logger.debug(f"播放旋律: {name}")
+        self._submit(schedule, category or default_category)
+
+    def play_startup_melody(self):
+        """播放開機音效"""
+        logger.info("播放開機音效")
+        self.play_named_melody("startup")
+
+    def play_shutdown_melody(self):
+        """播放關機音效 (如果需要)"""
+        logger.info("播放關機音效")
+        self.play_named_melody("shutdown") # 關機音效為 game_over 類別，不會被其他音效打斷
+
+    def play_game_over_melody(self):
+        self.play_named_melody("game_over_melody")
+
+    def play_win_melody(self):
+        self.play_named_melody("win_melody")
+
+    def play_tetris_fanfare(self):
+        self.play_named_melody("tetris_fanfare")
+
+    def play_multi_line_clear(self):
+        self.play_named_melody("multi_line_clear")
+
+    def play_single_line_clear(self):
+        self.play_named_melody("single_line_clear")
+
+# 所有遊戲共用的旋律登錄表，在模組載入時編譯
+MELODY_LIBRARY = MelodyLibrary(MELODY_DEFINITIONS)